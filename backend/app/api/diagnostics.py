@@ -0,0 +1,73 @@
+import asyncio
+
+from fastapi import APIRouter, Request
+from app.api.routes import job_manager, response_cache
+from app.services.disconnect import disconnect_stats
+from app.services.file_io import get_file_io
+from app.services.memory import build_memory_report, start_tracing
+from app.services.organize import active_pipelines
+
+router = APIRouter()
+
+
+@router.get("/loop")
+async def get_loop_stats(request: Request):
+    """Event-loop lag percentiles and recent slow callbacks with stacks"""
+    return request.app.state.loop_monitor.get_stats()
+
+
+@router.get("/memory")
+async def get_memory_report(request: Request, top: int = 10, trace: bool = False):
+    """Retained memory by cache tier and endpoint class, plus tracemalloc data
+
+    Pass trace=true to start tracemalloc if it is not already running; the
+    first report after that establishes the baseline for growth figures.
+    """
+    if trace:
+        start_tracing()
+    return build_memory_report(request.app.state.inflight, top_n=top)
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Hit rates and sizes for the encoded response cache"""
+    return {"encoded_responses": response_cache.get_stats()}
+
+
+@router.get("/cancellations")
+async def get_cancellation_stats():
+    """Requests abandoned by their client and upstream fetches cancelled as a result"""
+    from app.services.tmdb import TMDBService
+
+    return {
+        "client_disconnects": disconnect_stats.get_stats(),
+        "upstream": {
+            "cancelled_fetches": TMDBService.total_cancelled_requests,
+            "coalesced_requests": TMDBService.total_coalesced_requests,
+        },
+    }
+
+
+@router.get("/organize")
+async def get_organize_stats():
+    """Per-stage throughput and queue depth of the organize runs in progress"""
+    return {
+        "pipelines": [
+            {"root": pipeline.root, "dry_run": pipeline.dry_run, "stages": pipeline.metrics()}
+            for pipeline in list(active_pipelines)
+        ]
+    }
+
+
+@router.get("/jobs")
+async def get_job_stats():
+    """Background jobs running and queued per type, against each type's limit"""
+    # The first call opens the jobs database
+    manager = await asyncio.to_thread(job_manager)
+    return manager.stats()
+
+
+@router.get("/file-io")
+async def get_file_io_stats():
+    """File system calls per mount: in flight, completed, timed out and rejected"""
+    return get_file_io().get_stats()
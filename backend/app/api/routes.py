@@ -1,23 +1,189 @@
-from fastapi import APIRouter, HTTPException, Header
-from app.services.tmdb import TMDBService
+import asyncio
+import json
+import os
+import time
+
+from fastapi import APIRouter, HTTPException, Header, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from app.services.file_service import FileService
 from app.models.file_models import (
     RenameFileRequest,
     RenameFileResponse,
     ValidateFilenameRequest,
-    ValidateFilenameResponse
+    ValidateFilenameResponse,
+    BatchRenameRequest,
+    BatchRenameResponse,
+    RenamePlanResponse,
+    RenameHistoryResponse,
+)
+from app.models.batch_models import BatchRequest, BatchResponse
+from app.models.match_models import AutoMatchRequest, AutoMatchResponse
+from app.models.organize_models import OrganizeRequest, OrganizeSummary
+from app.models.job_models import Job, JobListResponse, JobStatus, JobSubmitRequest, JobType
+from app.models.library_models import (
+    LibraryFilesResponse,
+    LibraryScanRequest,
+    LibraryScanSummary,
+    ParseNamesRequest,
+    ParseNamesResponse,
+)
+from app.services.auto_match import AutoMatcher
+from app.services.batch import execute_batch
+from app.services.batch_rename import BatchRenamer
+from app.services.file_io import FileIOTimeout, get_file_io
+from app.services.library_scanner import (
+    LibraryScanner,
+    ScanCancelled,
+    claim_root,
+    get_library_index,
+    release_root,
+)
+from app.services.jobs import (
+    FINAL_STATUSES,
+    JobContext,
+    JobManager,
+    JobNotFound,
+    get_job_manager,
+)
+from app.services.organize import OrganizeCancelled, OrganizePipeline
+from app.services.rename_journal import RenameJournal, get_rename_journal
+from app.services.rename_plan import compile_plan
+from app.services.release_parser import parse_many
+from app.services.filmography import (
+    FilmographyFilters,
+    FilmographyIndex,
+    InvalidCursorError,
 )
+from app.services.search_session import SearchSession
+from app.services.response_cache import (
+    ResponseCache,
+    collect_dependencies,
+    encode_json,
+    make_etag,
+)
+from pydantic import ValidationError
 from app.core.config import get_settings, has_server_api_key
-from typing import Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
+
+if TYPE_CHECKING:
+    from app.services.tmdb import TMDBService
+    from app.services.utils import RateLimiter
 
 router = APIRouter()
 settings = get_settings()
 
-# Initialize TMDBService only if server has API key
-tmdb_service = (
-    TMDBService(api_key=settings.TMDB_API_KEY) if has_server_api_key() else None
+# Upper bound for the pages option on search and discover
+MAX_RESULT_PAGES = 20
+
+# Seconds between SSE comments that keep idle job event streams open
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
+
+# Browser cache lifetimes (seconds) by route prefix; longest prefix wins
+CACHE_MAX_AGE = {
+    "/genres": 86400,
+    "/details": 3600,
+    "/seasons": 3600,
+    "/episodes": 3600,
+    "/tv/episode-map": 3600,
+    "/person/filmography": 3600,
+    "/search": 300,
+    "/discover": 300,
+}
+
+response_cache = ResponseCache(
+    ttl_minutes=settings.RESPONSE_CACHE_TTL_MINUTES,
+    max_size=settings.RESPONSE_CACHE_MAX_SIZE,
 )
 
+# Built on first use so importing the API (and httpx) stays off the startup path
+_server_tmdb_service: Optional["TMDBService"] = None
+
+
+def get_server_tmdb_service(create: bool = True) -> Optional["TMDBService"]:
+    """The shared service for the server's own key, or None without one"""
+    global _server_tmdb_service
+    if _server_tmdb_service is None and create and has_server_api_key():
+        from app.services.tmdb import TMDBService
+
+        _server_tmdb_service = TMDBService(
+            api_key=settings.TMDB_API_KEY, base_url=settings.TMDB_BASE_URL
+        )
+    return _server_tmdb_service
+
+
+def get_tmdb_service(api_key: str, x_api_key: Optional[str]) -> "TMDBService":
+    """Return the shared server service, or a per-request one for client keys"""
+    if x_api_key or not has_server_api_key():
+        from app.services.tmdb import TMDBService
+
+        return TMDBService(api_key=api_key, base_url=settings.TMDB_BASE_URL)
+    return get_server_tmdb_service()
+
+
+# Background jobs share one slower request budget, apart from interactive calls
+_job_rate_limiter: Optional["RateLimiter"] = None
+
+
+def get_job_tmdb_service(api_key: str) -> "TMDBService":
+    """A service for background jobs, throttled by the shared job rate limit"""
+    global _job_rate_limiter
+    from app.services.tmdb import TMDBService
+    from app.services.utils import RateLimiter
+
+    if _job_rate_limiter is None:
+        _job_rate_limiter = RateLimiter(
+            settings.JOB_TMDB_REQUESTS_PER_SECOND,
+            burst_limit=max(1, int(settings.JOB_TMDB_REQUESTS_PER_SECOND)),
+        )
+    return TMDBService(
+        api_key=api_key, base_url=settings.TMDB_BASE_URL, rate_limiter=_job_rate_limiter
+    )
+
+
+async def cached_json_response(
+    route: str,
+    params: Dict[str, Any],
+    api_key: str,
+    compute: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Serve encoded JSON from the response cache, computing it on a miss.
+
+    Responses carry a strong ETag and a route-specific Cache-Control so the
+    client can revalidate with If-None-Match (answered with 304 in main.py).
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        body = encode_json(await compute())
+        return Response(
+            body,
+            media_type="application/json",
+            headers=_validator_headers(route, make_etag(body), None),
+        )
+
+    key = response_cache.make_key(route, params, api_key)
+    entry = response_cache.get(key)
+    status = "HIT"
+    if entry is None:
+        with collect_dependencies() as dependencies:
+            data = await compute()
+        entry = response_cache.set(key, encode_json(data), dependencies)
+        status = "MISS"
+
+    headers = _validator_headers(route, entry.etag, entry.expires_at)
+    headers["X-Cache"] = status
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def _validator_headers(
+    route: str, etag: str, expires_at: Optional[float]
+) -> Dict[str, str]:
+    """ETag plus Cache-Control, never promising freshness past the server copy"""
+    prefix = max((p for p in CACHE_MAX_AGE if route.startswith(p)), key=len, default=None)
+    max_age = CACHE_MAX_AGE[prefix] if prefix else 0
+    if expires_at is not None:
+        max_age = min(max_age, max(0, int(expires_at - time.time())))
+    # Responses depend on the caller's API key, so shared caches must not store them
+    return {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
 
 @router.get("/server-key-status")
 async def check_server_api_key():
@@ -25,12 +191,21 @@ async def check_server_api_key():
     return {"has_key": has_server_api_key()}
 
 
+@router.get("/ready")
+async def check_ready(request: Request):
+    """Readiness: 503 until startup warm-up has finished, then 200"""
+    warmup = request.app.state.warmup
+    return JSONResponse(warmup.to_dict(), status_code=200 if warmup.ready else 503)
+
+
 @router.get("/validate-key")
 async def validate_api_key(api_key: str):
     """Validates if an API key is valid by making a test request to TMDb"""
+    from app.services.tmdb import TMDBService
+
     try:
         # Create a temporary TMDBService with the provided key
-        temp_service = TMDBService(api_key=api_key)
+        temp_service = TMDBService(api_key=api_key, base_url=settings.TMDB_BASE_URL)
         # Try to make a simple request with the key
         await temp_service.test_api_key()
         return {"valid": True}
@@ -39,7 +214,14 @@ async def validate_api_key(api_key: str):
 
 
 @router.get("/search")
-async def search_media(query: str, x_api_key: Optional[str] = Header(None)):
+async def search_media(
+    query: str,
+    x_api_key: Optional[str] = Header(None),
+    pages: int = Query(1, ge=1, le=MAX_RESULT_PAGES),
+    limit: Optional[int] = Query(None, ge=1),
+    stream: bool = False,
+):
+    """Search TMDB; pages > 1 fetches later pages concurrently, stream=true emits NDJSON"""
     try:
         # Use the provided API key if available, otherwise use the server's key
         api_key = x_api_key or settings.TMDB_API_KEY
@@ -50,19 +232,59 @@ async def search_media(query: str, x_api_key: Optional[str] = Header(None)):
                 detail="API key required. Please provide API key in X-API-Key header.",
             )
 
-        service = TMDBService(api_key=api_key) if x_api_key else tmdb_service
-        if not service:
-            service = TMDBService(api_key=api_key)
+        service = get_tmdb_service(api_key, x_api_key)
 
         print(f"Searching for query: {query}")
-        results = await service.search_multi(query)
-        print(f"Got results: {results}")
-        return results
+        if stream:
+            return StreamingResponse(
+                _stream_pages(service.iter_search_multi(query, pages, limit)),
+                media_type="application/x-ndjson",
+            )
+        return await cached_json_response(
+            "/search",
+            {"query": query, "pages": pages, "limit": limit},
+            api_key,
+            lambda: service.search_multi(query, pages, limit),
+        )
     except Exception as e:
         print(f"Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.websocket("/ws/search")
+async def search_as_you_type(websocket: WebSocket, api_key: Optional[str] = None):
+    """Search-as-you-type channel
+
+    Send {"id": ..., "query": "...", "pages": 1, "limit": 20} per keystroke.
+    Each query cancels the previous one and is answered with a "local"
+    message (titles already seen), "results" per TMDB page, then "done".
+    Browsers cannot set headers on WebSockets, so the key is a query param.
+    """
+    key = api_key or settings.TMDB_API_KEY
+    if not key:
+        await websocket.close(code=1008, reason="API key required")
+        return
+
+    await websocket.accept()
+    session = SearchSession(get_tmdb_service(key, api_key), websocket.send_json)
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+                query = str(message.get("query", ""))
+                pages = max(1, min(int(message.get("pages", 1)), MAX_RESULT_PAGES))
+                limit = message.get("limit")
+                limit = int(limit) if limit is not None else None
+            except (ValueError, TypeError, AttributeError):
+                await websocket.send_json({"type": "error", "detail": "Invalid message"})
+                continue
+            await session.submit(message.get("id"), query, pages, limit)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.cancel()
+
+
 @router.get("/details")
 async def get_media_details(
     id: int, type: str, x_api_key: Optional[str] = Header(None)
@@ -81,12 +303,12 @@ async def get_media_details(
                 detail="API key required. Please provide API key in X-API-Key header.",
             )
 
-        service = TMDBService(api_key=api_key) if x_api_key else tmdb_service
-        if not service:
-            service = TMDBService(api_key=api_key)
+        service = get_tmdb_service(api_key, x_api_key)
 
-        details = await service.get_details(id, type)
-        return details
+        return await cached_json_response(
+            "/details", {"id": id, "type": type}, api_key,
+            lambda: service.get_details(id, type),
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -103,12 +325,11 @@ async def get_tv_seasons(id: int, x_api_key: Optional[str] = Header(None)):
                 detail="API key required. Please provide API key in X-API-Key header.",
             )
 
-        service = TMDBService(api_key=api_key) if x_api_key else tmdb_service
-        if not service:
-            service = TMDBService(api_key=api_key)
+        service = get_tmdb_service(api_key, x_api_key)
 
-        seasons = await service.get_tv_seasons(id)
-        return seasons
+        return await cached_json_response(
+            "/seasons", {"id": id}, api_key, lambda: service.get_tv_seasons(id)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -127,21 +348,70 @@ async def get_tv_episodes(
                 detail="API key required. Please provide API key in X-API-Key header.",
             )
 
-        service = TMDBService(api_key=api_key) if x_api_key else tmdb_service
-        if not service:
-            service = TMDBService(api_key=api_key)
+        service = get_tmdb_service(api_key, x_api_key)
+
+        return await cached_json_response(
+            "/episodes",
+            {"id": id, "season_number": season_number},
+            api_key,
+            lambda: service.get_tv_episodes(id, season_number),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/tv/{id}/episode-map")
+async def get_tv_episode_map(
+    id: int, include_specials: bool = True, x_api_key: Optional[str] = Header(None)
+):
+    """Get every season's episodes in one call as {season: {episode: {title, air_date}}}"""
+    try:
+        # Use the provided API key if available, otherwise use the server's key
+        api_key = x_api_key or settings.TMDB_API_KEY
+
+        if not api_key:
+            raise HTTPException(
+                status_code=400,
+                detail="API key required. Please provide API key in X-API-Key header.",
+            )
+
+        service = get_tmdb_service(api_key, x_api_key)
+
+        async def compute():
+            episode_map = await service.get_episode_map(id, include_specials)
+            return episode_map.to_dict()
 
-        episodes = await service.get_tv_episodes(id, season_number)
-        return episodes
+        return await cached_json_response(
+            "/tv/episode-map",
+            {"id": id, "include_specials": include_specials},
+            api_key,
+            compute,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/person/{person_id}/filmography")
 async def get_person_filmography(
-    person_id: int, x_api_key: Optional[str] = Header(None)
+    person_id: int,
+    x_api_key: Optional[str] = Header(None),
+    role_type: Optional[str] = None,
+    department: Optional[str] = None,
+    job: Optional[str] = None,
+    media_type: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    stream: bool = False,
 ):
-    """Get a person's filmography including movies and TV shows"""
+    """Get a person's filmography including movies and TV shows
+
+    Without paging options this returns the full {person, cast, crew} lists,
+    filtered if filters are given. With limit or cursor it returns one page
+    of merged credits, newest first, plus next_cursor. With stream=true it
+    streams NDJSON: a person line, then credit pages, then an end line.
+    """
     try:
         # Use the provided API key if available, otherwise use the server's key
         api_key = x_api_key or settings.TMDB_API_KEY
@@ -152,16 +422,76 @@ async def get_person_filmography(
                 detail="API key required. Please provide API key in X-API-Key header.",
             )
 
-        service = TMDBService(api_key=api_key) if x_api_key else tmdb_service
-        if not service:
-            service = TMDBService(api_key=api_key)
+        service = get_tmdb_service(api_key, x_api_key)
+        filters = FilmographyFilters(
+            role_type=role_type,
+            department=department,
+            job=job,
+            media_type=media_type,
+            year_from=year_from,
+            year_to=year_to,
+        )
+
+        if stream:
+            index = await service.get_filmography_index(person_id)
+            return StreamingResponse(
+                _stream_filmography(index, filters, limit or 50),
+                media_type="application/x-ndjson",
+            )
+
+        if limit is None and cursor is None:
+            return await cached_json_response(
+                "/person/filmography",
+                {"person_id": person_id, **vars(filters)},
+                api_key,
+                lambda: service.get_person_filmography(person_id, filters),
+            )
 
-        filmography = await service.get_person_filmography(person_id)
-        return filmography
+        index = await service.get_filmography_index(person_id)
+        credits, next_cursor = index.page(filters, cursor, limit or 50)
+        return {"person": index.person, "credits": credits, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stream_filmography(index: FilmographyIndex, filters: FilmographyFilters, page_size: int):
+    """Yield NDJSON lines so the client can render the first page immediately"""
+    yield json.dumps({"type": "person", "person": index.person}) + "\n"
+    count = 0
+    for credits in index.iter_pages(filters, page_size):
+        count += len(credits)
+        yield json.dumps({"type": "credits", "credits": credits}) + "\n"
+    yield json.dumps({"type": "end", "count": count}) + "\n"
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(request: BatchRequest, x_api_key: Optional[str] = Header(None)):
+    """Run many search/details/seasons/episodes/filmography lookups in one round trip"""
+    if len(request.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many operations (maximum {settings.BATCH_MAX_OPERATIONS})",
+        )
+
+    # Use the provided API key if available, otherwise use the server's key
+    api_key = x_api_key or settings.TMDB_API_KEY
+
+    if not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="API key required. Please provide API key in X-API-Key header.",
+        )
+
+    service = get_tmdb_service(api_key, x_api_key)
+    return await execute_batch(
+        service, request.operations, concurrency=settings.BATCH_CONCURRENCY
+    )
+
+
 @router.post("/files/rename", response_model=RenameFileResponse)
 async def rename_file(request: RenameFileRequest):
     """Rename a file on the file system"""
@@ -175,8 +505,14 @@ async def rename_file(request: RenameFileRequest):
                 error="INVALID_FILENAME"
             )
 
-        # Attempt to rename the file
-        result = FileService.rename_file(request.original_path, request.new_name)
+        # Attempt to rename the file; it is journaled from the worker, so a
+        # rename that finishes after the timeout is still recorded
+        journal = await _rename_journal()
+        result = await FileService.rename_file_async(
+            request.original_path,
+            request.new_name,
+            on_renamed=journal.record if journal is not None else None,
+        )
 
         return RenameFileResponse(
             success=result["success"],
@@ -193,6 +529,636 @@ async def rename_file(request: RenameFileRequest):
         )
 
 
+@router.post("/files/rename-plan", response_model=RenamePlanResponse)
+async def plan_rename_batch(request: BatchRenameRequest):
+    """Dry run of a batch rename: what would happen to each file, touching nothing
+
+    Duplicate targets, missing files and occupied names are reported per file;
+    swaps and cycles are shown as renames via a temporary name.
+    """
+    if len(request.items) > settings.FILE_RENAME_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (maximum {settings.FILE_RENAME_MAX_ITEMS})",
+        )
+    try:
+        items = [item.model_dump() for item in request.items]
+        if not items:
+            return compile_plan(items).diff()
+        plan = await get_file_io().run(items[0]["original_path"], compile_plan, items)
+        return plan.diff()
+    except FileIOTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error while planning batch rename: {str(e)}"
+        )
+
+
+@router.post("/files/rename-batch", response_model=BatchRenameResponse)
+async def rename_files_batch(request: BatchRenameRequest, stream: bool = False):
+    """Rename many files concurrently on the worker pool
+
+    The plan is validated up front. With stream=true, NDJSON progress events
+    are sent as each file completes, ending with a "done" line carrying the
+    summary. The batch runs to completion even if the client goes away, so a
+    transaction is never abandoned half-applied.
+    """
+    if len(request.items) > settings.FILE_RENAME_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (maximum {settings.FILE_RENAME_MAX_ITEMS})",
+        )
+
+    renamer = BatchRenamer(
+        [item.model_dump() for item in request.items],
+        mode=request.mode,
+        max_workers=settings.FILE_RENAME_WORKERS,
+        journal=await _rename_journal(),
+    )
+    try:
+        if stream:
+            return StreamingResponse(
+                _stream_rename(renamer), media_type="application/x-ndjson"
+            )
+        return await asyncio.shield(asyncio.ensure_future(renamer.run()))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error during batch rename: {str(e)}"
+        )
+
+
+async def _stream_rename(renamer: BatchRenamer):
+    """Relay a batch's progress events as NDJSON while it runs in its own task"""
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        try:
+            summary = await renamer.run(events.put_nowait)
+            events.put_nowait({"type": "done", **summary})
+        except Exception as e:
+            events.put_nowait({"type": "error", "detail": str(e)})
+        finally:
+            events.put_nowait(None)
+
+    task = asyncio.ensure_future(run())
+    while (event := await events.get()) is not None:
+        yield json.dumps(event) + "\n"
+    await task
+
+
+async def _rename_journal() -> Optional[RenameJournal]:
+    """The shared rename journal, or None when history is disabled"""
+    if not settings.RENAME_JOURNAL_ENABLED:
+        return None
+    return await asyncio.to_thread(get_rename_journal, settings.RENAME_JOURNAL_DIR)
+
+
+@router.get("/files/history", response_model=RenameHistoryResponse)
+async def get_rename_history(
+    directory: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[str] = None,
+):
+    """Journaled rename batches, newest first
+
+    With directory, only batches that renamed files in that folder, and only
+    those files. Page with before=<batch_id> of the last batch received.
+    """
+    journal = await _rename_journal()
+    if journal is None:
+        raise HTTPException(status_code=404, detail="Rename history is disabled")
+    try:
+        batches = await asyncio.to_thread(journal.history, directory, limit, before)
+        return {"batches": batches}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error reading rename history: {str(e)}"
+        )
+
+
+async def _revert_batch(kind: str) -> Dict[str, Any]:
+    """Undo the newest batch, or redo the newest undo, as an all_or_nothing batch"""
+    journal = await _rename_journal()
+    if journal is None:
+        raise HTTPException(status_code=404, detail="Rename history is disabled")
+    candidate = journal.undo_candidate if kind == "undo" else journal.redo_candidate
+    batch_id = await asyncio.to_thread(candidate)
+    if batch_id is None:
+        raise HTTPException(status_code=404, detail=f"Nothing to {kind}")
+
+    try:
+        items = await asyncio.to_thread(journal.inverse_items, batch_id)
+        renamer = BatchRenamer(
+            items,
+            mode="all_or_nothing",
+            max_workers=settings.FILE_RENAME_WORKERS,
+            journal=journal,
+            kind=kind,
+            reverts=batch_id,
+        )
+        return await asyncio.shield(asyncio.ensure_future(renamer.run()))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error during {kind}: {str(e)}"
+        )
+
+
+@router.post("/files/undo", response_model=BatchRenameResponse)
+async def undo_last_rename():
+    """Put back every file of the newest rename batch that has not been undone"""
+    return await _revert_batch("undo")
+
+
+@router.post("/files/redo", response_model=BatchRenameResponse)
+async def redo_last_rename():
+    """Re-apply the newest undo, as long as nothing was renamed since"""
+    return await _revert_batch("redo")
+
+
+@router.post("/library/scan", response_model=LibraryScanSummary)
+async def scan_library(request: LibraryScanRequest, stream: bool = False):
+    """Scan a folder for media and sidecar files into the library index
+
+    Folders whose modification time is unchanged since the last scan are not
+    listed again (unless full=true). With stream=true, NDJSON progress events
+    are sent while the scan runs, ending with a "done" line carrying the
+    summary; disconnecting stops the scan.
+    """
+    try:
+        is_directory = await get_file_io().run(request.root, os.path.isdir, request.root)
+    except FileIOTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    if not is_directory:
+        raise HTTPException(status_code=400, detail=f"Not a directory: {request.root}")
+    if not claim_root(request.root):
+        raise HTTPException(status_code=409, detail="A scan of this folder is already running")
+
+    try:
+        index = await asyncio.to_thread(get_library_index, settings.LIBRARY_INDEX_FILE)
+        scanner = LibraryScanner(
+            index, request.root, full=request.full, workers=settings.LIBRARY_SCAN_WORKERS
+        )
+    except Exception as e:
+        release_root(request.root)
+        raise HTTPException(status_code=500, detail=f"Error opening library index: {str(e)}")
+
+    if stream:
+        return StreamingResponse(_stream_scan(scanner), media_type="application/x-ndjson")
+    try:
+        return await asyncio.to_thread(scanner.run)
+    except asyncio.CancelledError:
+        scanner.cancel()
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error during library scan: {str(e)}"
+        )
+    finally:
+        release_root(request.root)
+
+
+async def _stream_scan(scanner: LibraryScanner):
+    """Relay a scan's progress events as NDJSON while it runs in a worker thread"""
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    scanner.emit = lambda event: loop.call_soon_threadsafe(events.put_nowait, event)
+
+    async def run():
+        try:
+            summary = await asyncio.to_thread(scanner.run)
+            events.put_nowait({"type": "done", **summary})
+        except ScanCancelled:
+            pass
+        except Exception as e:
+            events.put_nowait({"type": "error", "detail": str(e)})
+        finally:
+            release_root(scanner.root)
+            events.put_nowait(None)
+
+    task = asyncio.ensure_future(run())
+    try:
+        while (event := await events.get()) is not None:
+            yield json.dumps(event) + "\n"
+    finally:
+        scanner.cancel()
+    await task
+
+
+@router.get("/library/files", response_model=LibraryFilesResponse)
+async def get_library_files(
+    root: Optional[str] = None,
+    kind: Optional[Literal["media", "sidecar"]] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+):
+    """Files from the library index, optionally under one folder and of one kind"""
+    try:
+        index = await asyncio.to_thread(get_library_index, settings.LIBRARY_INDEX_FILE)
+        files = await asyncio.to_thread(index.files, root, kind, limit, offset)
+        return {"files": files}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error reading library index: {str(e)}"
+        )
+
+
+@router.post("/parse/names", response_model=ParseNamesResponse)
+async def parse_names(request: ParseNamesRequest):
+    """Parse title, numbering and quality out of release or file names
+
+    Parsing runs in a worker thread at roughly 60,000-120,000 names per
+    second, so a full batch of PARSE_MAX_NAMES names takes up to about a
+    second; duration_ms reports the actual time.
+    """
+    if len(request.names) > settings.PARSE_MAX_NAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many names (maximum {settings.PARSE_MAX_NAMES})",
+        )
+    try:
+        started = time.perf_counter()
+        results = await asyncio.to_thread(parse_many, request.names)
+        return {
+            "results": results,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error parsing names: {str(e)}"
+        )
+
+
+@router.post("/match", response_model=AutoMatchResponse)
+async def auto_match(request: AutoMatchRequest, x_api_key: Optional[str] = Header(None)):
+    """Match files to TMDB movies and episodes with one search per show or movie
+
+    Names are grouped by parsed title and year; each group is searched once
+    and each matched series has its episode list loaded once, so upstream
+    calls scale with the number of shows rather than files. Pass ``root`` to
+    match the media files already in the library index under that folder.
+    """
+    api_key = x_api_key or settings.TMDB_API_KEY
+    if not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="API key required. Please provide API key in X-API-Key header.",
+        )
+    if (request.names is None) == (request.root is None):
+        raise HTTPException(status_code=400, detail="Provide either names or root")
+
+    paths: Optional[List[str]] = None
+    names = request.names
+    if request.root is not None:
+        paths, names = await _indexed_media(request.root)
+    if len(names) > settings.PARSE_MAX_NAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (maximum {settings.PARSE_MAX_NAMES})",
+        )
+
+    try:
+        started = time.perf_counter()
+        matcher = AutoMatcher(
+            get_tmdb_service(api_key, x_api_key),
+            concurrency=settings.AUTO_MATCH_CONCURRENCY,
+            min_confidence=_min_confidence(request.min_confidence),
+        )
+        summary = await matcher.match(names)
+        if paths is not None:
+            for result, path in zip(summary["results"], paths):
+                result["path"] = path
+        summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return summary
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error matching files: {str(e)}"
+        )
+
+
+def _min_confidence(requested: Optional[float]) -> float:
+    return requested if requested is not None else settings.AUTO_MATCH_MIN_CONFIDENCE
+
+
+async def _indexed_media(root: str) -> Tuple[List[str], List[str]]:
+    """Paths and names of the media files indexed under a folder
+
+    Reads one more than PARSE_MAX_NAMES so callers can tell when it is exceeded.
+    """
+    index = await asyncio.to_thread(get_library_index, settings.LIBRARY_INDEX_FILE)
+    files = await asyncio.to_thread(index.files, root, "media", settings.PARSE_MAX_NAMES + 1, 0)
+    return [file["path"] for file in files], [file["name"] for file in files]
+
+
+@router.post("/organize", response_model=OrganizeSummary)
+async def organize_folder(
+    request: OrganizeRequest, stream: bool = False, x_api_key: Optional[str] = Header(None)
+):
+    """Match every media file under a folder to TMDB and rename it
+
+    Files flow through bounded scan, parse, match, render and rename stages,
+    so memory stays flat on large libraries and the slowest stage sets the
+    pace. dry_run (the default) only reports the new names. With
+    stream=true, NDJSON events are sent as each file is decided ("file"),
+    with per-stage metrics every second ("metrics") and a final "done" line
+    carrying the summary; disconnecting stops the run. Renames are journaled
+    in batches, so they can be undone.
+    """
+    api_key = x_api_key or settings.TMDB_API_KEY
+    if not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="API key required. Please provide API key in X-API-Key header.",
+        )
+    try:
+        is_directory = await get_file_io().run(request.root, os.path.isdir, request.root)
+    except FileIOTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    if not is_directory:
+        raise HTTPException(status_code=400, detail=f"Not a directory: {request.root}")
+
+    pipeline = OrganizePipeline(
+        get_tmdb_service(api_key, x_api_key),
+        request.root,
+        dry_run=request.dry_run,
+        match_concurrency=settings.AUTO_MATCH_CONCURRENCY,
+        min_confidence=_min_confidence(request.min_confidence),
+        queue_size=settings.ORGANIZE_QUEUE_SIZE,
+        rename_batch_size=settings.ORGANIZE_RENAME_BATCH_SIZE,
+        journal=None if request.dry_run else await _rename_journal(),
+    )
+    if stream:
+        return StreamingResponse(_stream_organize(pipeline), media_type="application/x-ndjson")
+    try:
+        return await pipeline.run()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Unexpected error while organizing: {str(e)}"
+        )
+
+
+async def _stream_organize(pipeline: OrganizePipeline):
+    """Relay an organize run's file and metrics events as NDJSON"""
+    # Bounded: a slow client holds up the pipeline instead of piling up events
+    events: asyncio.Queue = asyncio.Queue(settings.ORGANIZE_QUEUE_SIZE)
+    pipeline.emit = events.put
+
+    async def run():
+        try:
+            summary = await pipeline.run()
+            await events.put({"type": "done", **summary})
+        except OrganizeCancelled:
+            pass
+        except Exception as e:
+            await events.put({"type": "error", "detail": str(e)})
+        await events.put(None)
+
+    task = asyncio.ensure_future(run())
+    try:
+        while (event := await events.get()) is not None:
+            yield json.dumps(event) + "\n"
+    finally:
+        if not task.done():
+            # The client went away; nothing will drain the queue any more
+            pipeline.cancel()
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+# -- background jobs ------------------------------------------------------------
+
+
+async def _library_scan_job(context: JobContext) -> Dict[str, Any]:
+    request = LibraryScanRequest(**context.params)
+    if not claim_root(request.root):
+        raise RuntimeError("A scan of this folder is already running")
+    try:
+        loop = asyncio.get_running_loop()
+        index = await asyncio.to_thread(get_library_index, settings.LIBRARY_INDEX_FILE)
+        scanner = LibraryScanner(
+            index,
+            request.root,
+            full=request.full,
+            workers=settings.LIBRARY_SCAN_WORKERS,
+            emit=lambda event: loop.call_soon_threadsafe(context.report, event),
+        )
+        try:
+            return await asyncio.to_thread(scanner.run)
+        except asyncio.CancelledError:
+            scanner.cancel()
+            raise
+    finally:
+        release_root(request.root)
+
+
+async def _match_job(context: JobContext) -> Dict[str, Any]:
+    request = AutoMatchRequest(**context.params)
+    if (request.names is None) == (request.root is None):
+        raise ValueError("Provide either names or root")
+    paths: Optional[List[str]] = None
+    names = request.names
+    if request.root is not None:
+        paths, names = await _indexed_media(request.root)
+    if len(names) > settings.PARSE_MAX_NAMES:
+        raise ValueError(f"Too many files (maximum {settings.PARSE_MAX_NAMES})")
+
+    started = time.perf_counter()
+    matcher = AutoMatcher(
+        get_job_tmdb_service(context.api_key),
+        concurrency=settings.JOB_TMDB_CONCURRENCY,
+        min_confidence=_min_confidence(request.min_confidence),
+    )
+    summary = await matcher.match(
+        names,
+        progress=lambda completed, total: context.report(
+            {"completed": completed, "total": total, "searches": matcher.searches}
+        ),
+    )
+    if paths is not None:
+        for result, path in zip(summary["results"], paths):
+            result["path"] = path
+    summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return summary
+
+
+async def _organize_job(context: JobContext) -> Dict[str, Any]:
+    request = OrganizeRequest(**context.params)
+    if not await get_file_io().run(request.root, os.path.isdir, request.root):
+        raise NotADirectoryError(f"Not a directory: {request.root}")
+
+    def report(event: Dict[str, Any]) -> None:
+        # Per-file events would flood subscribers; the periodic metrics carry the totals
+        if event["type"] == "metrics":
+            context.report(
+                {"files": sum(pipeline.counts.values()), "counts": dict(pipeline.counts), **event}
+            )
+
+    journal = None if request.dry_run else await _rename_journal()
+    skip = None
+    if journal is not None and context.resumed:
+        # Renamed files no longer parse to a title, so matching them again would fail
+        skip = await asyncio.to_thread(journal.renamed_under, request.root, context.created_at)
+    pipeline = OrganizePipeline(
+        get_job_tmdb_service(context.api_key),
+        request.root,
+        dry_run=request.dry_run,
+        match_concurrency=settings.JOB_TMDB_CONCURRENCY,
+        min_confidence=_min_confidence(request.min_confidence),
+        queue_size=settings.ORGANIZE_QUEUE_SIZE,
+        rename_batch_size=settings.ORGANIZE_RENAME_BATCH_SIZE,
+        journal=journal,
+        emit=report,
+        skip=skip,
+    )
+    try:
+        return await pipeline.run(metrics_interval=settings.JOB_PROGRESS_INTERVAL_SECONDS)
+    except asyncio.CancelledError:
+        pipeline.cancel()
+        raise
+
+
+# Request model, runner, per-type limit setting and whether TMDB is needed
+JOB_TYPES: Dict[str, Tuple[Any, Callable[[JobContext], Awaitable[Dict[str, Any]]], str, bool]] = {
+    "library_scan": (LibraryScanRequest, _library_scan_job, "JOB_LIMIT_LIBRARY_SCAN", False),
+    "match": (AutoMatchRequest, _match_job, "JOB_LIMIT_MATCH", True),
+    "organize": (OrganizeRequest, _organize_job, "JOB_LIMIT_ORGANIZE", True),
+}
+
+
+def _register_jobs(manager: JobManager) -> None:
+    for job_type, (_, runner, limit, needs_api_key) in JOB_TYPES.items():
+        manager.register(job_type, runner, getattr(settings, limit), needs_api_key)
+
+
+def job_manager() -> JobManager:
+    """The shared job manager with the built-in job types registered"""
+    return get_job_manager(
+        settings.JOBS_FILE, settings.JOB_PROGRESS_INTERVAL_SECONDS, _register_jobs
+    )
+
+
+@router.post("/jobs", response_model=Job, status_code=202)
+async def submit_job(request: JobSubmitRequest, x_api_key: Optional[str] = Header(None)):
+    """Start a library scan, match or organize run in the background
+
+    params take the same fields as the matching endpoint. The job is stored
+    before this returns and keeps running if the client goes away; follow it
+    with GET /api/jobs/{id} or /api/jobs/{id}/events. Jobs interrupted by a
+    restart are run again when the server comes back.
+    """
+    model, _, _, needs_api_key = JOB_TYPES[request.type]
+    try:
+        params = model(**request.params).model_dump(exclude_none=True)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    api_key = x_api_key or settings.TMDB_API_KEY
+    if needs_api_key and not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail="API key required. Please provide API key in X-API-Key header.",
+        )
+    try:
+        manager = await asyncio.to_thread(job_manager)
+        return manager.submit(request.type, params, api_key if needs_api_key else None)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error submitting job: {str(e)}"
+        )
+
+
+@router.get("/jobs", response_model=JobListResponse)
+async def list_jobs(
+    type: Optional[JobType] = None,
+    status: Optional[JobStatus] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Newest jobs first, with their latest progress but without results"""
+    try:
+        manager = await asyncio.to_thread(job_manager)
+        return {"jobs": manager.list(type, status, limit)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error listing jobs: {str(e)}"
+        )
+
+
+async def _get_job(manager: JobManager, job_id: str) -> Dict[str, Any]:
+    try:
+        return manager.get(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+
+@router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str):
+    """A job's status, progress and, once completed, its result"""
+    manager = await asyncio.to_thread(job_manager)
+    return await _get_job(manager, job_id)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=Job)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job; finished jobs are returned unchanged
+
+    Cancellation is asynchronous: the job reports "cancelled" once its
+    runner has stopped. Renames already made by an organize run are kept in
+    the rename history and can be undone from there.
+    """
+    manager = await asyncio.to_thread(job_manager)
+    try:
+        return manager.cancel(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """Server-sent events with the job's status and progress as they change
+
+    Each event is named after the job's status and carries the job (without
+    its result) as JSON. The stream ends after the final status; comments
+    are sent while nothing changes so proxies keep the connection open.
+    """
+    manager = await asyncio.to_thread(job_manager)
+    await _get_job(manager, job_id)
+    return StreamingResponse(
+        _job_events(manager, job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _job_events(manager: JobManager, job_id: str) -> AsyncIterator[str]:
+    queue = manager.subscribe(job_id)
+    try:
+        # Read after subscribing so no change falls between the two
+        job = manager.get(job_id)
+        while True:
+            job["result"] = None
+            yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+            if job["status"] in FINAL_STATUSES:
+                return
+            while True:
+                try:
+                    job = await asyncio.wait_for(queue.get(), JOB_EVENTS_KEEPALIVE_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+    finally:
+        manager.unsubscribe(job_id, queue)
+
+
 @router.post("/files/validate-filename", response_model=ValidateFilenameResponse)
 async def validate_filename(request: ValidateFilenameRequest):
     """Validate a filename for the current operating system"""
@@ -225,12 +1191,11 @@ async def get_genres(media_type: str, x_api_key: Optional[str] = Header(None)):
                 detail="API key required. Please provide API key in X-API-Key header.",
             )
 
-        service = TMDBService(api_key=api_key) if x_api_key else tmdb_service
-        if not service:
-            service = TMDBService(api_key=api_key)
+        service = get_tmdb_service(api_key, x_api_key)
 
-        genres = await service.get_genres(media_type)
-        return genres
+        return await cached_json_response(
+            f"/genres/{media_type}", {}, api_key, lambda: service.get_genres(media_type)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -248,8 +1213,15 @@ async def discover_media(
     with_runtime_gte: Optional[int] = None,
     with_runtime_lte: Optional[int] = None,
     sort_by: Optional[str] = None,
+    pages: int = Query(1, ge=1, le=MAX_RESULT_PAGES),
+    limit: Optional[int] = Query(None, ge=1),
+    stream: bool = False,
 ):
-    """Discover movies or TV shows with filters"""
+    """Discover movies or TV shows with filters
+
+    pages > 1 fetches later pages concurrently; stream=true emits NDJSON
+    page lines as they arrive.
+    """
     if media_type not in ["movie", "tv"]:
         raise HTTPException(status_code=400, detail="Invalid media type. Use 'movie' or 'tv'.")
 
@@ -263,9 +1235,7 @@ async def discover_media(
                 detail="API key required. Please provide API key in X-API-Key header.",
             )
 
-        service = TMDBService(api_key=api_key) if x_api_key else tmdb_service
-        if not service:
-            service = TMDBService(api_key=api_key)
+        service = get_tmdb_service(api_key, x_api_key)
 
         # Build filter params
         filters = {}
@@ -288,7 +1258,31 @@ async def discover_media(
         if sort_by:
             filters["sort_by"] = sort_by
 
-        results = await service.discover_media(media_type, filters)
-        return results
+        if stream:
+            return StreamingResponse(
+                _stream_pages(
+                    service.iter_discover_media(media_type, filters, pages, limit)
+                ),
+                media_type="application/x-ndjson",
+            )
+        return await cached_json_response(
+            f"/discover/{media_type}",
+            {**filters, "pages": pages, "limit": limit},
+            api_key,
+            lambda: service.discover_media(media_type, filters, pages, limit),
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _stream_pages(pages: AsyncIterator[Tuple[int, List[Dict[str, Any]]]]):
+    """Yield one NDJSON line per result page as it arrives, then an end line"""
+    count = 0
+    try:
+        async for page, results in pages:
+            count += len(results)
+            yield json.dumps({"type": "page", "page": page, "results": results}) + "\n"
+    except Exception as e:
+        yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+        return
+    yield json.dumps({"type": "end", "count": count}) + "\n"
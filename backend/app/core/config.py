@@ -5,6 +5,89 @@ from typing import Optional
 
 class Settings(BaseSettings):
     TMDB_API_KEY: Optional[str] = None
+    TMDB_BASE_URL: str = "https://api.themoviedb.org/3"
+
+    # Shared TMDB connection pool and startup warm-up
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE: int = 10
+    WARMUP_ENABLED: bool = True
+    WARMUP_PREWARM_CONNECTIONS: int = 2
+    WARMUP_TIMEOUT_SECONDS: float = 15.0
+
+    # Persist the hottest TMDB cache entries across restarts
+    CACHE_SNAPSHOT_FILE: Optional[str] = None
+    CACHE_SNAPSHOT_MAX_ENTRIES: int = 500
+
+    # Cache of encoded JSON bodies for hot TMDB routes
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_MINUTES: float = 60
+    RESPONSE_CACHE_MAX_SIZE: int = 1000
+
+    # gzip/brotli response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+
+    # /api/batch limits
+    BATCH_MAX_OPERATIONS: int = 200
+    BATCH_CONCURRENCY: int = 8
+
+    # File system calls run on this pool, limited per mount and by timeout
+    FILE_IO_WORKERS: int = 16
+    FILE_IO_PER_MOUNT_LIMIT: int = 4
+    FILE_IO_TIMEOUT_SECONDS: float = 10.0
+
+    # /api/files/rename-batch
+    FILE_RENAME_WORKERS: int = 8
+    FILE_RENAME_MAX_ITEMS: int = 100_000
+
+    # Media library scanner and its file index
+    LIBRARY_INDEX_FILE: str = "library.sqlite3"
+    LIBRARY_SCAN_WORKERS: int = 8
+    PARSE_MAX_NAMES: int = 50_000
+
+    # /api/match: concurrent TMDB calls per batch and the score to accept a match
+    AUTO_MATCH_CONCURRENCY: int = 8
+    AUTO_MATCH_MIN_CONFIDENCE: float = 0.6
+
+    # /api/organize: files waiting in front of each stage, files per rename batch
+    ORGANIZE_QUEUE_SIZE: int = 256
+    ORGANIZE_RENAME_BATCH_SIZE: int = 100
+
+    # Background jobs: their SQLite file, running jobs allowed per type, and a
+    # separate, slower TMDB budget so jobs never starve interactive browsing
+    JOBS_FILE: str = "jobs.sqlite3"
+    JOB_LIMIT_LIBRARY_SCAN: int = 1
+    JOB_LIMIT_MATCH: int = 2
+    JOB_LIMIT_ORGANIZE: int = 1
+    JOB_TMDB_REQUESTS_PER_SECOND: float = 10.0
+    JOB_TMDB_CONCURRENCY: int = 2
+    JOB_PROGRESS_INTERVAL_SECONDS: float = 1.0
+
+    # Crash-safe rename journal backing undo/redo and history
+    RENAME_JOURNAL_ENABLED: bool = True
+    RENAME_JOURNAL_DIR: str = "journal"
+
+    # Record incoming requests and upstream responses to this JSONL file
+    TRACE_FILE: Optional[str] = None
+
+    # Per-request profiling (X-Debug-Profile: 1 or sampled by path)
+    PROFILING_ENABLED: bool = False
+    PROFILING_MODE: str = "sampling"
+    PROFILING_DIR: str = "profiles"
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_PATH_PATTERN: Optional[str] = None
+    PROFILING_INTERVAL_MS: float = 1.0
+
+    # Event-loop lag monitoring
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_MS: float = 100.0
+    SLOW_CALLBACK_MS: float = 100.0
+
+    # Start tracemalloc at startup for /api/diagnostics/memory
+    MEMORY_TRACEMALLOC: bool = False
+    MEMORY_TRACEMALLOC_FRAMES: int = 1
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -1,8 +1,114 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import router as api_router
+from app.api.diagnostics import router as diagnostics_router
+from app.api.routes import (
+    get_server_tmdb_service,
+    job_manager,
+    response_cache,
+    router as api_router,
+)
+from app.core.config import get_settings
+from app.services.compression import CompressionMiddleware
+from app.services.disconnect import DisconnectCancellationMiddleware
+from app.services.file_io import configure_file_io
+from app.services.http_pool import close_pool, open_pool
+from app.services.jobs import close_job_manager
+from app.services.loop_monitor import LoopLagMonitor
+from app.services.memory import start_tracing
+from app.services.profiling import RequestProfiler
+from app.services.rename_journal import close_rename_journal, get_rename_journal
+from app.services.response_cache import etag_matches
+from app.services.trace import get_recorder, start_recording
+from app.services.warmup import WarmupState, warm_up
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    monitor = app.state.loop_monitor
+    if settings.LOOP_MONITOR_ENABLED:
+        monitor.start()
+    if settings.MEMORY_TRACEMALLOC:
+        start_tracing(settings.MEMORY_TRACEMALLOC_FRAMES)
+
+    open_pool(
+        max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+    )
+    file_io = configure_file_io(
+        settings.FILE_IO_WORKERS,
+        settings.FILE_IO_PER_MOUNT_LIMIT,
+        settings.FILE_IO_TIMEOUT_SECONDS,
+    )
+    if settings.RENAME_JOURNAL_ENABLED and os.path.isdir(settings.RENAME_JOURNAL_DIR):
+        # Settle any batch a crash interrupted before new renames run
+        try:
+            journal = await asyncio.to_thread(get_rename_journal, settings.RENAME_JOURNAL_DIR)
+            await asyncio.to_thread(journal.recover)
+        except Exception as e:
+            logger.error(f"Could not recover the rename journal: {e}")
+    if os.path.exists(settings.JOBS_FILE):
+        # Run again whatever the last process left queued or running
+        try:
+            manager = await asyncio.to_thread(job_manager)
+            manager.resume(settings.TMDB_API_KEY or None)
+        except Exception as e:
+            logger.error(f"Could not resume background jobs: {e}")
+
+    app.state.warmup = WarmupState()
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(
+            warm_up(
+                app.state.warmup,
+                get_server_tmdb_service,
+                settings.TMDB_BASE_URL,
+                snapshot_file=settings.CACHE_SNAPSHOT_FILE,
+                prewarm_connections=settings.WARMUP_PREWARM_CONNECTIONS,
+                timeout=settings.WARMUP_TIMEOUT_SECONDS,
+            )
+        )
+    else:
+        app.state.warmup.mark_ready()
 
-app = FastAPI(title="Media File Renamer")
+    yield
+
+    if warmup_task is not None:
+        warmup_task.cancel()
+        await asyncio.wait([warmup_task])
+    await close_job_manager()
+    tmdb_service = get_server_tmdb_service(create=False)
+    if tmdb_service is not None and settings.CACHE_SNAPSHOT_FILE:
+        try:
+            saved = tmdb_service.cache.save_snapshot(
+                settings.CACHE_SNAPSHOT_FILE, settings.CACHE_SNAPSHOT_MAX_ENTRIES
+            )
+            logger.info(f"Saved {saved} cache entries to {settings.CACHE_SNAPSHOT_FILE}")
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not save cache snapshot: {e}")
+    await close_pool()
+    close_rename_journal()
+    file_io.shutdown()
+    await monitor.stop()
+
+
+app = FastAPI(title="Media File Renamer", lifespan=lifespan)
+app.state.loop_monitor = LoopLagMonitor(
+    interval_ms=settings.LOOP_MONITOR_INTERVAL_MS,
+    slow_callback_ms=settings.SLOW_CALLBACK_MS,
+)
+app.state.inflight = {}
+app.state.warmup = WarmupState()
 
 # Configure CORS for frontend
 app.add_middleware(
@@ -19,5 +125,103 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        variant_store=response_cache,
+    )
+
+if settings.TRACE_FILE:
+    start_recording(settings.TRACE_FILE)
+
+profiler = RequestProfiler(
+    enabled=settings.PROFILING_ENABLED,
+    mode=settings.PROFILING_MODE,
+    output_dir=settings.PROFILING_DIR,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    path_pattern=settings.PROFILING_PATH_PATTERN,
+    interval_ms=settings.PROFILING_INTERVAL_MS,
+)
+
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """Answer If-None-Match with a bodyless 304 when the ETag still matches"""
+    response = await call_next(request)
+    if_none_match = request.headers.get("if-none-match")
+    etag = response.headers.get("etag")
+    if (
+        request.method in ("GET", "HEAD")
+        and response.status_code == 200
+        and etag
+        and etag_matches(if_none_match, etag)
+    ):
+        headers = {
+            name: response.headers[name]
+            for name in ("etag", "cache-control", "vary", "x-cache")
+            if name in response.headers
+        }
+        return Response(status_code=304, headers=headers)
+    return response
+
+
+@app.middleware("http")
+async def capture_trace(request: Request, call_next):
+    """Record API traffic for later replay when capture is enabled"""
+    recorder = get_recorder()
+    if recorder is None or not request.url.path.startswith("/api/"):
+        return await call_next(request)
+
+    started_at = recorder.offset()
+    start = time.perf_counter()
+    raw_body = await request.body()
+    response = await call_next(request)
+
+    try:
+        body = json.loads(raw_body) if raw_body else None
+    except ValueError:
+        body = raw_body.decode("utf-8", errors="replace")
+    recorder.record_request(
+        started_at=started_at,
+        method=request.method,
+        path=request.url.path,
+        query=request.url.query,
+        status_code=response.status_code,
+        duration_ms=(time.perf_counter() - start) * 1000,
+        body=body,
+        has_api_key="x-api-key" in request.headers,
+    )
+    return response
+
+
+@app.middleware("http")
+async def track_request(request: Request, call_next):
+    """Assign a request ID, track the request in flight and profile opted-in ones"""
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    inflight = app.state.inflight
+    inflight[request_id] = {"path": request.url.path, "started": time.monotonic()}
+    try:
+        if not profiler.should_profile(request.url.path, request.headers):
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+
+        with profiler.profile(request_id) as session:
+            response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        if session is not None:
+            response.headers["X-Profile-File"] = session.path
+        return response
+    finally:
+        inflight.pop(request_id, None)
+
+
+# Outermost, so it sees the raw receive channel before any other middleware
+app.add_middleware(DisconnectCancellationMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
+app.include_router(diagnostics_router, prefix="/api/diagnostics")
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+
+class BatchOperation(BaseModel):
+    """A single lookup inside a batch request"""
+    op: Literal["search", "details", "seasons", "episodes", "filmography"] = Field(
+        ..., description="Lookup to perform"
+    )
+    params: Dict[str, Any] = Field(
+        default_factory=dict, description="Parameters for the lookup, as for the single-item route"
+    )
+    id: Optional[str] = Field(None, description="Client correlation ID echoed in the result")
+
+
+class BatchRequest(BaseModel):
+    """Request model for running many TMDB lookups in one round trip"""
+    operations: List[BatchOperation] = Field(..., description="Lookups to perform")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "operations": [
+                    {"op": "details", "params": {"id": 1396, "type": "tv"}, "id": "a"},
+                    {"op": "episodes", "params": {"id": 1396, "season_number": 1}},
+                    {"op": "search", "params": {"query": "Inception"}},
+                ]
+            }
+        }
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one operation in a batch"""
+    id: Optional[str] = Field(None, description="Client correlation ID, if one was sent")
+    op: str = Field(..., description="Lookup that was performed")
+    success: bool = Field(..., description="Whether this lookup succeeded")
+    result: Optional[Any] = Field(None, description="Lookup result, shaped as the single-item route")
+    error: Optional[str] = Field(None, description="Error message if the lookup failed")
+
+
+class BatchResponse(BaseModel):
+    """Response model for a batch of lookups, in request order"""
+    results: List[BatchItemResult] = Field(..., description="One result per operation")
+    unique_operations: int = Field(..., description="Operations executed after deduplication")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 
 
 class RenameFileRequest(BaseModel):
@@ -58,4 +58,100 @@ class ValidateFilenameResponse(BaseModel):
                 "valid": True,
                 "message": "Filename is valid"
             }
-        }
\ No newline at end of file
+        }
+
+
+class BatchRenameItem(BaseModel):
+    """One file in a batch rename"""
+    original_path: str = Field(..., description="Full path to the original file")
+    new_name: str = Field(..., description="New filename including extension")
+
+
+class BatchRenameRequest(BaseModel):
+    """Request model for renaming many files in one call"""
+    items: List[BatchRenameItem] = Field(..., description="Files to rename")
+    mode: Literal["best_effort", "all_or_nothing"] = Field(
+        "best_effort",
+        description="all_or_nothing renames nothing if validation fails and reverts completed renames if any rename fails",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"original_path": "/media/show/ep1.mkv", "new_name": "S01E01 - Pilot.mkv"},
+                    {"original_path": "/media/show/ep2.mkv", "new_name": "S01E02 - Second.mkv"},
+                ],
+                "mode": "all_or_nothing",
+            }
+        }
+
+
+class BatchRenameItemResult(BaseModel):
+    """Outcome for one file in a batch rename"""
+    index: int = Field(..., description="Position of the item in the request")
+    success: bool = Field(..., description="Whether the file ends up renamed")
+    message: str = Field(..., description="Human-readable message about the operation")
+    original_path: Optional[str] = Field(None, description="Original file path")
+    new_path: Optional[str] = Field(None, description="Full path to the renamed file (if successful)")
+    error: Optional[str] = Field(None, description="Error code if the rename failed or was reverted")
+
+
+class BatchRenameResponse(BaseModel):
+    """Response model for a batch rename, results in request order"""
+    success: bool = Field(..., description="Whether every file was renamed")
+    mode: str = Field(..., description="Mode the batch ran in")
+    total: int = Field(..., description="Number of files in the batch")
+    renamed: int = Field(..., description="Files renamed")
+    failed: int = Field(..., description="Files not renamed, including reverted ones")
+    rolled_back: bool = Field(..., description="Whether completed renames were reverted")
+    batch_id: Optional[str] = Field(None, description="Journal id of the batch, used by undo and history")
+    results: List[BatchRenameItemResult] = Field(..., description="One result per file")
+
+
+class RenamePlanEntry(BaseModel):
+    """What a batch rename would do to one file"""
+    index: int = Field(..., description="Position of the item in the request")
+    original_path: str = Field(..., description="Original file path")
+    new_path: str = Field(..., description="Path the file would end up at")
+    action: Literal["rename", "noop", "error"] = Field(..., description="Planned action")
+    via_temp: bool = Field(False, description="Whether the file is parked under a temporary name to break a cycle")
+    error: Optional[str] = Field(None, description="Error code if the file cannot be renamed")
+    message: Optional[str] = Field(None, description="Reason for a noop or error")
+
+
+class RenamePlanResponse(BaseModel):
+    """Dry run of a batch rename, entries in request order"""
+    renames: int = Field(..., description="Files that would be renamed")
+    noops: int = Field(..., description="Files whose name is unchanged")
+    errors: int = Field(..., description="Files that cannot be renamed")
+    chains: int = Field(..., description="Independent rename sequences in the plan")
+    cycles: int = Field(..., description="Chains that are cycles, broken with a temporary name")
+    directories_scanned: int = Field(..., description="Directories listed to build the plan")
+    entries: List[RenamePlanEntry] = Field(..., description="One entry per file")
+
+
+class RenameHistoryOperation(BaseModel):
+    """One file renamed by a journaled batch"""
+    original_path: str = Field(..., description="Path before the rename")
+    new_path: str = Field(..., description="Path after the rename")
+
+
+class RenameHistoryBatch(BaseModel):
+    """A journaled rename batch"""
+    batch_id: str = Field(..., description="Journal id of the batch")
+    created_at: float = Field(..., description="Unix time the batch started")
+    finished_at: Optional[float] = Field(None, description="Unix time the batch finished")
+    kind: Literal["rename", "undo", "redo"] = Field(..., description="What started the batch")
+    mode: str = Field(..., description="Mode the batch ran in")
+    reverts: Optional[str] = Field(None, description="Batch this undo or redo reverted")
+    status: Literal["committed", "rolled_back", "undone", "redone"] = Field(
+        ..., description="committed, rolled_back, undone (by a later undo) or redone (undo reverted by a redo)"
+    )
+    renamed: int = Field(..., description="Files the batch renamed")
+    operations: List[RenameHistoryOperation] = Field(..., description="Files renamed, in request order")
+
+
+class RenameHistoryResponse(BaseModel):
+    """Rename history, newest batch first"""
+    batches: List[RenameHistoryBatch] = Field(..., description="Journaled batches")
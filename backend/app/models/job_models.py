@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+
+JobType = Literal["library_scan", "match", "organize"]
+JobStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+
+
+class JobSubmitRequest(BaseModel):
+    """Request model for starting a background job"""
+    type: JobType = Field(..., description="library_scan, match or organize")
+    params: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Same body as POST /api/library/scan, /api/match or /api/organize",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "organize",
+                "params": {"root": "/media/tv/Show Name", "dry_run": True},
+            }
+        }
+
+
+class Job(BaseModel):
+    """A background job and its latest progress"""
+    id: str = Field(..., description="Job ID")
+    type: JobType = Field(..., description="Job type")
+    params: Dict[str, Any] = Field(..., description="Parameters the job was submitted with")
+    status: JobStatus = Field(..., description="queued, running, completed, failed or cancelled")
+    progress: Optional[Dict[str, Any]] = Field(None, description="Latest progress snapshot")
+    result: Optional[Dict[str, Any]] = Field(
+        None, description="Summary once completed (omitted from lists)"
+    )
+    error: Optional[str] = Field(None, description="Why the job failed")
+    attempts: int = Field(..., description="Times the job was started, counting resumes")
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    started_at: Optional[float] = Field(None, description="Start of the latest attempt")
+    finished_at: Optional[float] = Field(None, description="When the job reached a final status")
+
+
+class JobListResponse(BaseModel):
+    """Newest jobs first"""
+    jobs: List[Job] = Field(..., description="Jobs matching the filters")
@@ -0,0 +1,96 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class LibraryScanRequest(BaseModel):
+    """Request model for scanning a media folder into the library index"""
+    root: str = Field(..., description="Folder to scan, including all subfolders")
+    full: bool = Field(
+        False, description="List every folder even if its modification time is unchanged"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "root": "/media/tv",
+                "full": False,
+            }
+        }
+
+
+class LibraryScanSummary(BaseModel):
+    """Outcome of a library scan"""
+    root: str = Field(..., description="Folder that was scanned")
+    full: bool = Field(..., description="Whether unchanged folders were listed too")
+    directories: int = Field(..., description="Folders visited")
+    unchanged_directories: int = Field(..., description="Folders skipped because their mtime was unchanged")
+    removed_directories: int = Field(..., description="Folders dropped from the index because they are gone")
+    files_indexed: int = Field(..., description="Files written to the index by this scan")
+    skipped_names: int = Field(
+        0, description="Files and folders left out because their names are not valid UTF-8"
+    )
+    errors: int = Field(..., description="Folders that could not be read")
+    media: int = Field(..., description="Media files under the root after the scan")
+    sidecar: int = Field(..., description="Subtitle and NFO files under the root after the scan")
+    duration_ms: float = Field(..., description="Time the scan took")
+
+
+class LibraryFile(BaseModel):
+    """A file in the library index"""
+    path: str = Field(..., description="Full path to the file")
+    directory: str = Field(..., description="Folder holding the file")
+    name: str = Field(..., description="Filename including extension")
+    kind: Literal["media", "sidecar"] = Field(..., description="media or sidecar (subtitles, NFO)")
+    size: int = Field(..., description="Size in bytes")
+    mtime_ns: int = Field(..., description="Modification time in nanoseconds")
+    inode: int = Field(..., description="Inode number, stable across renames on the same volume")
+
+
+class LibraryFilesResponse(BaseModel):
+    """Files from the library index, ordered by path"""
+    files: List[LibraryFile] = Field(..., description="Indexed files")
+
+
+class ParseNamesRequest(BaseModel):
+    """Request model for parsing release or file names"""
+    names: List[str] = Field(..., description="Release or file names, without folders")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "names": [
+                    "Show.Name.S01E02.1080p.WEB-DL.x264-GRP.mkv",
+                    "Movie (2010) [2160p].mkv",
+                ]
+            }
+        }
+
+
+class ParsedName(BaseModel):
+    """What was recognised in one release or file name"""
+    name: str = Field(..., description="The name as given")
+    kind: Literal["episode", "movie", "unknown"] = Field(..., description="episode, movie or unknown")
+    title: Optional[str] = Field(None, description="Show or movie title")
+    numbering: Optional[Literal["standard", "multi", "season", "absolute", "anime", "date"]] = Field(
+        None, description="How the episode is numbered"
+    )
+    season: Optional[int] = Field(None, description="Season number")
+    episodes: List[int] = Field(default_factory=list, description="Episode numbers; several for multi-episode files")
+    absolute_episode: Optional[int] = Field(None, description="Absolute episode number (anime, E350)")
+    air_date: Optional[str] = Field(None, description="Air date (YYYY-MM-DD) for date-numbered shows")
+    year: Optional[int] = Field(None, description="Release year")
+    episode_title: Optional[str] = Field(None, description="Episode title following the numbering")
+    resolution: Optional[str] = Field(None, description="e.g. 1080p")
+    source: Optional[str] = Field(None, description="e.g. WEB-DL, BluRay")
+    codec: Optional[str] = Field(None, description="e.g. x264, x265")
+    hdr: Optional[str] = Field(None, description="e.g. HDR10, Dolby Vision")
+    flags: List[str] = Field(default_factory=list, description="PROPER, REPACK, ...")
+    group: Optional[str] = Field(None, description="Release group")
+    language: Optional[str] = Field(None, description="Subtitle language for sidecar files")
+    extension: Optional[str] = Field(None, description="Known media or sidecar extension")
+
+
+class ParseNamesResponse(BaseModel):
+    """Parsed names, in request order"""
+    results: List[ParsedName] = Field(..., description="One entry per requested name")
+    duration_ms: float = Field(..., description="Time spent parsing")
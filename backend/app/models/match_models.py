@@ -0,0 +1,63 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class AutoMatchRequest(BaseModel):
+    """Request model for matching files to TMDB movies and episodes"""
+    names: Optional[List[str]] = Field(None, description="File or release names to match")
+    root: Optional[str] = Field(
+        None, description="Match the media files indexed under this folder instead of names"
+    )
+    min_confidence: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Lowest score accepted as a match (server default if unset)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "names": [
+                    "Show.Name.S01E02.1080p.WEB-DL.x264-GRP.mkv",
+                    "Show.Name.S01E03.1080p.WEB-DL.x264-GRP.mkv",
+                    "Movie (2010) [2160p].mkv",
+                ]
+            }
+        }
+
+
+class MatchedEpisode(BaseModel):
+    """An episode a file was resolved to"""
+    season: int = Field(..., description="Season number on TMDB")
+    episode: int = Field(..., description="Episode number on TMDB")
+    title: Optional[str] = Field(None, description="Episode title")
+    air_date: Optional[str] = Field(None, description="Air date")
+
+
+class AutoMatchResult(BaseModel):
+    """Match for one file"""
+    name: str = Field(..., description="The name as given")
+    path: Optional[str] = Field(None, description="Full path, when matching the library index")
+    status: Literal["matched", "unmatched", "episode_not_found", "error"] = Field(
+        ..., description="matched, unmatched (no confident candidate), episode_not_found or error"
+    )
+    confidence: float = Field(..., description="Score of the best candidate, 0 to 1")
+    media_type: Optional[Literal["movie", "tv"]] = Field(None, description="movie or tv")
+    tmdb_id: Optional[int] = Field(None, description="TMDB ID of the best candidate")
+    title: Optional[str] = Field(None, description="TMDB title of the best candidate")
+    year: Optional[int] = Field(None, description="Release or first air year")
+    season: Optional[int] = Field(None, description="Season parsed from the name")
+    episodes: List[MatchedEpisode] = Field(default_factory=list, description="Resolved episodes")
+    message: Optional[str] = Field(None, description="Why the file is not matched")
+
+
+class AutoMatchResponse(BaseModel):
+    """Matches in request order plus the upstream work it took"""
+    results: List[AutoMatchResult] = Field(..., description="One entry per file")
+    files: int = Field(..., description="Files matched")
+    groups: int = Field(..., description="Distinct shows and movies among the files")
+    searches: int = Field(..., description="TMDB searches issued, one per group")
+    episode_maps: int = Field(..., description="Series whose episode lists were loaded")
+    matched: int = Field(..., description="Files matched")
+    unmatched: int = Field(..., description="Files without a confident match")
+    episode_not_found: int = Field(..., description="Files whose show matched but episode did not")
+    errors: int = Field(..., description="Files whose lookups failed")
+    duration_ms: float = Field(..., description="Time the match took")
@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+
+class OrganizeRequest(BaseModel):
+    """Request model for matching and renaming every media file under a folder"""
+    root: str = Field(..., description="Folder to organize, including all subfolders")
+    dry_run: bool = Field(True, description="Only report the new names; rename nothing")
+    min_confidence: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Lowest match score accepted (server default if unset)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "root": "/media/tv/Show Name",
+                "dry_run": True,
+            }
+        }
+
+
+class OrganizeStageMetrics(BaseModel):
+    """Counters for one pipeline stage"""
+    name: str = Field(..., description="scan, parse, match, render or rename")
+    concurrency: int = Field(..., description="Workers in this stage")
+    queue_depth: int = Field(..., description="Items waiting in front of the stage")
+    queue_capacity: int = Field(..., description="Most items that can wait in front of the stage")
+    received: int = Field(..., description="Items taken from the queue")
+    passed: int = Field(..., description="Items handed to the next stage")
+    finished: int = Field(..., description="Files whose outcome was decided here")
+    failed: int = Field(..., description="Items that raised an error")
+    in_flight: int = Field(..., description="Items being worked on")
+    throughput_per_second: float = Field(..., description="Items handled per second while running")
+    busy_seconds: float = Field(..., description="Worker time spent handling items")
+    blocked_seconds: float = Field(..., description="Time spent waiting for room downstream")
+
+
+class OrganizeSummary(BaseModel):
+    """Outcome of an organize run"""
+    root: str = Field(..., description="Folder that was organized")
+    dry_run: bool = Field(..., description="Whether files were left untouched")
+    files: int = Field(..., description="Media files found")
+    counts: Dict[str, int] = Field(
+        ...,
+        description="Files per outcome: planned, renamed, unchanged, unmatched, "
+        "episode_not_found, unnamed, invalid_name, rename_failed, error",
+    )
+    groups: int = Field(..., description="Distinct shows and movies among the files")
+    searches: int = Field(..., description="TMDB searches issued")
+    episode_maps: int = Field(..., description="Series whose episode lists were loaded")
+    stages: List[OrganizeStageMetrics] = Field(..., description="Per-stage metrics")
+    duration_ms: float = Field(..., description="Time the run took")
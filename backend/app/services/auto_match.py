@@ -0,0 +1,313 @@
+"""Match local files to TMDB entries with one search per show or movie.
+
+Matching file by file would issue a ``search_multi`` per file. Instead the
+names are parsed, grouped by a normalised ``(kind, title, year)`` key, and:
+
+* each key is searched once and its candidates scored with a fuzzy title
+  ratio, adjusted for media type and year;
+* each matched series has its episode map fetched once, after which every
+  file of that series is resolved from memory (season/episode, absolute and
+  air-date numbering alike).
+
+A library of 5,000 episodes across 40 shows costs 40 searches plus 40
+episode maps, however the files are named.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.episodes import EpisodeMap
+from app.services.release_parser import parse_many
+from app.services.search_index import tokenize
+
+try:
+    from rapidfuzz.fuzz import ratio as _rapidfuzz_ratio
+except ImportError:  # pragma: no cover - rapidfuzz is optional
+    _rapidfuzz_ratio = None
+
+if TYPE_CHECKING:
+    from app.services.tmdb import TMDBService
+
+logger = logging.getLogger(__name__)
+
+# Score adjustments on top of the title ratio
+TYPE_MISMATCH_PENALTY = 0.25
+YEAR_MATCH_BONUS = 0.05
+YEAR_MISMATCH_PENALTY = 0.15
+
+MatchKey = Tuple[str, str, Optional[int]]
+
+
+def normalize_title(title: str) -> str:
+    """Lower-case words only: "Law & Order: SVU" -> "law and order svu"."""
+    return " ".join(tokenize(title.replace("&", " and ")))
+
+
+def similarity(a: str, b: str) -> float:
+    """Fuzzy ratio of two normalised titles, 0.0 to 1.0."""
+    if a == b:
+        return 1.0
+    if _rapidfuzz_ratio is not None:
+        return _rapidfuzz_ratio(a, b) / 100
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def score_candidate(
+    title: str, year: Optional[int], media_type: Optional[str], candidate: Dict[str, Any]
+) -> float:
+    """Confidence that a search result is the parsed title, 0.0 to 1.0."""
+    score = similarity(title, normalize_title(candidate.get("title") or ""))
+    if media_type is not None and candidate["media_type"] != media_type:
+        score -= TYPE_MISMATCH_PENALTY
+    if year is not None and candidate.get("year") is not None:
+        if candidate["year"] == year:
+            score += YEAR_MATCH_BONUS
+        elif abs(candidate["year"] - year) > 1:
+            score -= YEAR_MISMATCH_PENALTY
+    return round(min(max(score, 0.0), 1.0), 3)
+
+
+@dataclass
+class MatchGroup:
+    """Files sharing one normalised title key, resolved by a single search."""
+
+    key: MatchKey
+    query: str
+    candidate: Optional[Dict[str, Any]] = None
+    confidence: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def media_type(self) -> Optional[str]:
+        kind = self.key[0]
+        return {"episode": "tv", "movie": "movie"}.get(kind)
+
+
+class _SeriesIndex:
+    """Absolute and air-date lookups derived from one episode map."""
+
+    def __init__(self, episode_map: EpisodeMap):
+        self.episode_map = episode_map
+        self.absolute: List[Tuple[int, int]] = [
+            (season, number)
+            for season in sorted(episode_map.seasons)
+            if season > 0
+            for number in sorted(episode_map.seasons[season])
+        ]
+        self.by_air_date: Dict[str, Tuple[int, int]] = {}
+        for season, episodes in episode_map.seasons.items():
+            for number, episode in episodes.items():
+                if episode.get("air_date"):
+                    self.by_air_date.setdefault(episode["air_date"], (season, number))
+
+    def resolve(self, parsed: Dict[str, Any]) -> List[Tuple[int, int]]:
+        """(season, episode) pairs the parsed name refers to, as numbered on TMDB."""
+        numbering = parsed["numbering"]
+        if numbering == "date":
+            found = self.by_air_date.get(parsed["air_date"])
+            return [found] if found else []
+        if numbering in ("absolute", "anime"):
+            return [
+                self.absolute[number - 1]
+                for number in parsed["episodes"]
+                if 0 < number <= len(self.absolute)
+            ]
+        return [(parsed["season"], number) for number in parsed["episodes"]]
+
+
+class AutoMatcher:
+    """Batch matcher from file names to TMDB movies and episodes.
+
+    Searches and episode maps are shared futures keyed by group and series,
+    so files can be matched one at a time (as the organize pipeline does)
+    and still cost one search per show.
+    """
+
+    def __init__(
+        self, service: "TMDBService", concurrency: int = 8, min_confidence: float = 0.6
+    ):
+        self.service = service
+        self.concurrency = concurrency
+        self.min_confidence = min_confidence
+        self.searches = 0
+        self.episode_maps = 0
+        self._groups: Dict[MatchKey, "asyncio.Future[MatchGroup]"] = {}
+        self._series: Dict[int, "asyncio.Future[Optional[_SeriesIndex]]"] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def key_of(parsed: Dict[str, Any]) -> Optional[MatchKey]:
+        """Normalised (kind, title, year) key, or None if the name has no title."""
+        title = normalize_title(parsed["title"] or "")
+        if not title:
+            return None
+        return (parsed["kind"], title, parsed["year"])
+
+    @property
+    def groups(self) -> int:
+        return len(self._groups)
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _search(self, group: MatchGroup) -> MatchGroup:
+        async with self._limit():
+            self.searches += 1
+            try:
+                candidates = await self.service.search_multi(group.query)
+            except Exception as e:
+                logger.warning(f"Auto-match search failed for '{group.query}': {e}")
+                group.error = str(e)
+                return group
+        _, title, year = group.key
+        for candidate in candidates:
+            if candidate["media_type"] not in ("movie", "tv"):
+                continue
+            score = score_candidate(title, year, group.media_type, candidate)
+            if group.candidate is None or score > group.confidence:
+                group.candidate, group.confidence = candidate, score
+        return group
+
+    async def _episode_map(self, tv_id: int) -> Optional[_SeriesIndex]:
+        async with self._limit():
+            self.episode_maps += 1
+            try:
+                return _SeriesIndex(await self.service.get_episode_map(tv_id))
+            except Exception as e:
+                logger.warning(f"Auto-match could not load episodes of TV {tv_id}: {e}")
+                return None
+
+    async def match_parsed(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Match one parsed name, sharing searches with every other call."""
+        key = self.key_of(parsed)
+        if key is None:
+            return self._result(parsed, "unmatched", message="No title found in the name")
+        future = self._groups.get(key)
+        if future is None:
+            future = self._groups[key] = asyncio.ensure_future(
+                self._search(MatchGroup(key, parsed["title"]))
+            )
+        # Shielded: a caller giving up must not cancel the search for the others
+        group = await asyncio.shield(future)
+
+        index = None
+        candidate = group.candidate
+        if (
+            group.error is None
+            and candidate is not None
+            and candidate["media_type"] == "tv"
+            and group.confidence >= self.min_confidence
+            and parsed["kind"] == "episode"
+            and parsed["numbering"] != "season"
+        ):
+            series = self._series.get(candidate["id"])
+            if series is None:
+                series = self._series[candidate["id"]] = asyncio.ensure_future(
+                    self._episode_map(candidate["id"])
+                )
+            index = await asyncio.shield(series)
+        return self._resolve(parsed, group, index)
+
+    async def match(
+        self, names: List[str], progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """Match every name; returns per-file results in input order plus totals.
+
+        ``progress`` is called with (completed, total) as each file resolves.
+        """
+        parsed = await asyncio.to_thread(parse_many, names)
+        completed = 0
+
+        async def one(item: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal completed
+            result = await self.match_parsed(item)
+            completed += 1
+            if progress is not None:
+                progress(completed, len(parsed))
+            return result
+
+        results = await asyncio.gather(*(one(item) for item in parsed))
+
+        counts: Dict[str, int] = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        return {
+            "results": results,
+            "files": len(names),
+            "groups": self.groups,
+            "searches": self.searches,
+            "episode_maps": self.episode_maps,
+            "matched": counts.get("matched", 0),
+            "unmatched": counts.get("unmatched", 0),
+            "episode_not_found": counts.get("episode_not_found", 0),
+            "errors": counts.get("error", 0),
+        }
+
+    def _resolve(
+        self, parsed: Dict[str, Any], group: MatchGroup, index: Optional[_SeriesIndex]
+    ) -> Dict[str, Any]:
+        if group.error is not None:
+            return self._result(parsed, "error", message=f"Search failed: {group.error}")
+        candidate = group.candidate
+        if candidate is None or group.confidence < self.min_confidence:
+            return self._result(
+                parsed,
+                "unmatched",
+                candidate,
+                group.confidence,
+                message=f"No confident match for '{group.query}'",
+            )
+        if (
+            candidate["media_type"] != "tv"
+            or parsed["kind"] != "episode"
+            or parsed["numbering"] == "season"
+        ):
+            return self._result(parsed, "matched", candidate, group.confidence)
+        if index is None:
+            return self._result(
+                parsed, "error", candidate, group.confidence, message="Could not load episode list"
+            )
+
+        pairs = index.resolve(parsed)
+        episodes = []
+        for season, number in pairs:
+            entry = index.episode_map.lookup(season, number)
+            if entry is not None:
+                episodes.append({"season": season, "episode": number, **entry})
+        if not pairs or len(episodes) < len(pairs):
+            return self._result(
+                parsed,
+                "episode_not_found",
+                candidate,
+                group.confidence,
+                episodes,
+                message=f"Episode not found in {candidate.get('title')}",
+            )
+        return self._result(parsed, "matched", candidate, group.confidence, episodes)
+
+    @staticmethod
+    def _result(
+        parsed: Dict[str, Any],
+        status: str,
+        candidate: Optional[Dict[str, Any]] = None,
+        confidence: float = 0.0,
+        episodes: Optional[List[Dict[str, Any]]] = None,
+        message: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "name": parsed["name"],
+            "status": status,
+            "confidence": confidence,
+            "media_type": candidate["media_type"] if candidate else None,
+            "tmdb_id": candidate["id"] if candidate else None,
+            "title": candidate.get("title") if candidate else None,
+            "year": candidate.get("year") if candidate else None,
+            "season": parsed["season"],
+            "episodes": episodes or [],
+            "message": message,
+        }
@@ -0,0 +1,90 @@
+"""Execute many TMDB lookups concurrently for the batch endpoint."""
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Tuple
+
+from app.models.batch_models import BatchItemResult, BatchOperation, BatchResponse
+from app.services.utils import gather_with_limit
+
+if TYPE_CHECKING:
+    from app.services.tmdb import TMDBService
+
+logger = logging.getLogger(__name__)
+
+
+def _require(params: Dict[str, Any], name: str, cast: Callable = str) -> Any:
+    if params.get(name) is None:
+        raise ValueError(f"Missing parameter: {name}")
+    try:
+        return cast(params[name])
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid parameter: {name}")
+
+
+def _details(service: "TMDBService", params: Dict[str, Any]) -> Awaitable[Any]:
+    media_type = _require(params, "type")
+    if media_type not in ["movie", "tv"]:
+        raise ValueError("Invalid media type")
+    return service.get_details(_require(params, "id", int), media_type)
+
+
+# Each operation validates its params eagerly and returns the lookup coroutine
+BATCH_OPERATIONS: Dict[str, Callable[["TMDBService", Dict[str, Any]], Awaitable[Any]]] = {
+    "search": lambda service, params: service.search_multi(_require(params, "query")),
+    "details": _details,
+    "seasons": lambda service, params: service.get_tv_seasons(_require(params, "id", int)),
+    "episodes": lambda service, params: service.get_tv_episodes(
+        _require(params, "id", int), _require(params, "season_number", int)
+    ),
+    "filmography": lambda service, params: service.get_person_filmography(
+        _require(params, "person_id", int)
+    ),
+}
+
+
+def _operation_key(operation: BatchOperation) -> str:
+    return f"{operation.op}:{json.dumps(operation.params, sort_keys=True, default=str)}"
+
+
+async def execute_batch(
+    service: "TMDBService", operations: List[BatchOperation], concurrency: int = 8
+) -> BatchResponse:
+    """Run operations with deduplication and bounded parallelism.
+
+    Identical operations run once and share their result; each item reports
+    its own success or error so one failure does not sink the batch.
+    """
+    unique: Dict[str, BatchOperation] = {}
+    for operation in operations:
+        unique.setdefault(_operation_key(operation), operation)
+
+    def make_task(operation: BatchOperation) -> Callable[[], Awaitable[Tuple[bool, Any]]]:
+        async def run() -> Tuple[bool, Any]:
+            try:
+                return True, await BATCH_OPERATIONS[operation.op](service, operation.params)
+            except Exception as e:
+                logger.warning(f"Batch operation {operation.op} failed: {e}")
+                return False, str(e)
+
+        return run
+
+    keys = list(unique)
+    outcomes = await gather_with_limit(
+        [make_task(unique[key]) for key in keys], concurrency_limit=concurrency
+    )
+    by_key = dict(zip(keys, outcomes))
+
+    results = []
+    for operation in operations:
+        success, value = by_key[_operation_key(operation)]
+        results.append(
+            BatchItemResult(
+                id=operation.id,
+                op=operation.op,
+                success=success,
+                result=value if success else None,
+                error=None if success else value,
+            )
+        )
+    return BatchResponse(results=results, unique_operations=len(unique))
@@ -0,0 +1,270 @@
+"""Batch renames executed on a bounded worker pool.
+
+The batch is compiled into a plan (see ``rename_plan``) before anything
+touches the disk. Its independent chains then run concurrently in worker
+threads (on a NAS each rename is a network round trip), reporting progress
+per file, and the result is verified with one directory listing per folder.
+In ``all_or_nothing`` mode a failure stops further renames and every
+completed one is reverted.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.rename_plan import RenameStep, compile_plan
+
+if TYPE_CHECKING:
+    from app.services.rename_journal import RenameJournal
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[[Dict[str, Any]], None]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_rename_executor(max_workers: int = 8) -> ThreadPoolExecutor:
+    """Shared pool for file renames, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rename")
+    return _executor
+
+
+def _result(
+    index: int,
+    original_path: str,
+    success: bool,
+    message: str,
+    new_path: Optional[str] = None,
+    error: Optional[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "success": success,
+        "message": message,
+        "original_path": original_path,
+        "new_path": new_path,
+        "error": error,
+    }
+
+
+def _describe_os_error(e: OSError) -> Tuple[str, str]:
+    """Message and error code for a failed rename, as FileService reports them."""
+    if isinstance(e, FileNotFoundError):
+        return f"File not found: {e.filename}", "FILE_NOT_FOUND"
+    if isinstance(e, FileExistsError):
+        return f"A file with the name '{os.path.basename(e.filename2 or '')}' already exists", "FILE_EXISTS"
+    if isinstance(e, PermissionError):
+        return "Permission denied. Unable to rename the file. Check file permissions.", "PERMISSION_DENIED"
+    return f"OS error occurred while renaming file: {e}", "OS_ERROR"
+
+
+def _revert(new_path: str, original_path: str) -> Optional[str]:
+    """Undo one rename; returns an error message if that is impossible."""
+    if os.path.lexists(original_path):
+        return f"'{original_path}' exists again, left '{new_path}' in place"
+    try:
+        os.rename(new_path, original_path)
+        return None
+    except OSError as e:
+        return str(e)
+
+
+class BatchRenamer:
+    """Validate and execute one batch of renames."""
+
+    def __init__(
+        self,
+        items: List[Dict[str, str]],
+        mode: str = "best_effort",
+        max_workers: int = 8,
+        executor: Optional[ThreadPoolExecutor] = None,
+        journal: Optional["RenameJournal"] = None,
+        kind: str = "rename",
+        reverts: Optional[str] = None,
+    ):
+        if mode not in ("best_effort", "all_or_nothing"):
+            raise ValueError(f"Unknown rename mode: {mode}")
+        self.items = items
+        self.mode = mode
+        self.max_workers = max_workers
+        self.executor = executor or get_rename_executor(max_workers)
+        self.journal = journal
+        self.kind = kind
+        self.reverts = reverts
+        self.batch_id: Optional[str] = None
+
+    async def run(self, emit: Optional[Emit] = None) -> Dict[str, Any]:
+        """Execute the batch, emitting progress events; returns the summary."""
+        emit = emit or (lambda event: None)
+        total = len(self.items)
+        loop = asyncio.get_running_loop()
+        # Compiling scans every directory involved, so it runs on the pool too
+        plan = await loop.run_in_executor(self.executor, compile_plan, self.items)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        for op in plan.errors:
+            results[op.index] = _result(
+                op.index, self.items[op.index]["original_path"], False, op.message, error=op.error
+            )
+        invalid = len(plan.errors)
+        emit({"type": "validated", "total": total, "invalid": invalid})
+
+        if invalid and self.mode == "all_or_nothing":
+            for index, item in enumerate(self.items):
+                if results[index] is None:
+                    results[index] = _result(
+                        index, item["original_path"], False,
+                        "Not attempted: the batch failed validation", error="NOT_ATTEMPTED",
+                    )
+            return self._summary(results, rolled_back=False)
+
+        completed = 0
+
+        def finish(index: int, result: Dict[str, Any]) -> None:
+            nonlocal completed
+            results[index] = result
+            completed += 1
+            emit({"type": "progress", "result": result, "completed": completed, "total": total})
+
+        for op in plan.ops:
+            if op.action == "error":
+                finish(op.index, results[op.index])
+            elif op.action == "noop":
+                finish(op.index, _result(
+                    op.index, self.items[op.index]["original_path"], True, op.message,
+                    new_path=op.target,
+                ))
+
+        if self.journal is not None and plan.chains:
+            # The plan is durable before the first rename, so a crash can be recovered
+            self.batch_id = await loop.run_in_executor(
+                self.executor, self.journal.begin, plan, self.mode, self.kind, self.reverts
+            )
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+        abort = asyncio.Event()
+
+        async def run_chain(chain: List[RenameStep]) -> List[RenameStep]:
+            """Run one chain in order; returns the steps that were applied."""
+            applied: List[RenameStep] = []
+            failed = False
+            for step in chain:
+                if abort.is_set():
+                    break
+                original_path = self.items[step.index]["original_path"]
+                async with semaphore:
+                    try:
+                        if self.batch_id is not None and not chain[0].final and step is chain[-1]:
+                            await loop.run_in_executor(
+                                self.executor, self.journal.mark_cycle,
+                                self.batch_id, step.source, len(chain),
+                            )
+                        await loop.run_in_executor(self.executor, os.rename, step.source, step.target)
+                    except OSError as e:
+                        failed = True
+                        message, error = _describe_os_error(e)
+                        finish(step.index, _result(
+                            step.index, original_path, False, message, error=error
+                        ))
+                        if self.mode == "all_or_nothing":
+                            abort.set()
+                        break
+                applied.append(step)
+                if step.final:
+                    finish(step.index, _result(
+                        step.index, original_path, True,
+                        f"File successfully renamed from '{os.path.basename(original_path)}'"
+                        f" to '{os.path.basename(step.target)}'",
+                        new_path=step.target,
+                    ))
+
+            # A cycle stopped half way leaves a file under its temporary name;
+            # put the chain back as it was
+            if failed and not chain[0].final and self.mode == "best_effort":
+                await self._rollback(applied, results, "another rename in its cycle failed")
+                applied = []
+            for step in chain:
+                if results[step.index] is None:
+                    finish(step.index, _result(
+                        step.index, self.items[step.index]["original_path"], False,
+                        "Not attempted: an earlier rename in the batch failed",
+                        error="NOT_ATTEMPTED",
+                    ))
+            return applied
+
+        applied = await asyncio.gather(*(run_chain(chain) for chain in plan.chains))
+
+        rolled_back = False
+        if abort.is_set():
+            rolled_back = True
+            steps = [step for chain in applied for step in chain]
+            emit({"type": "rollback", "count": sum(1 for step in steps if step.final)})
+            await self._rollback(steps, results, "another rename in the batch failed")
+        else:
+            renamed = [r["index"] for r in results if r["success"] and r["new_path"]]
+            mismatched = await loop.run_in_executor(self.executor, plan.verify, renamed)
+            for index in mismatched:
+                logger.error(f"Rename of {results[index]['original_path']} did not verify")
+                results[index].update(
+                    success=False,
+                    message="Renamed, but the file is not where it should be",
+                    error="VERIFY_FAILED",
+                )
+
+        if self.batch_id is not None:
+            renamed = [
+                op.index for op in plan.ops if op.action == "rename" and results[op.index]["success"]
+            ]
+            outcome = (
+                functools.partial(self.journal.commit, self.batch_id, renamed)
+                if renamed
+                else functools.partial(self.journal.rollback, self.batch_id)
+            )
+            await loop.run_in_executor(self.executor, outcome)
+
+        return self._summary(results, rolled_back)
+
+    async def _rollback(
+        self, steps: List[RenameStep], results: List[Optional[Dict[str, Any]]], reason: str
+    ) -> None:
+        """Revert applied steps, newest first so chains unwind in order."""
+        loop = asyncio.get_running_loop()
+        for step in reversed(steps):
+            if self.batch_id is not None and not step.final:
+                # Moving a cycle's temporary file back: journal it, as on the way forward
+                await loop.run_in_executor(
+                    self.executor, self.journal.mark_cycle, self.batch_id, step.target, 0
+                )
+            failure = await loop.run_in_executor(self.executor, _revert, step.target, step.source)
+            result = results[step.index]
+            if failure is not None:
+                logger.error(f"Rollback of {step.target} failed: {failure}")
+                results[step.index] = _result(
+                    step.index, self.items[step.index]["original_path"], False,
+                    f"Rollback failed: {failure}", new_path=step.target, error="ROLLBACK_FAILED",
+                )
+            elif result is not None and result["success"]:
+                result.update(
+                    success=False, message=f"Rolled back after {reason}", error="ROLLED_BACK"
+                )
+
+    def _summary(self, results: List[Dict[str, Any]], rolled_back: bool) -> Dict[str, Any]:
+        renamed = sum(1 for r in results if r["success"])
+        return {
+            "success": renamed == len(results),
+            "mode": self.mode,
+            "total": len(results),
+            "renamed": renamed,
+            "failed": len(results) - renamed,
+            "rolled_back": rolled_back,
+            "batch_id": self.batch_id,
+            "results": results,
+        }
@@ -0,0 +1,191 @@
+"""Response compression with Accept-Encoding negotiation.
+
+Brotli is used when the ``brotli`` package is installed and the client
+accepts it, gzip otherwise. Only complete bodies above ``minimum_size`` are
+compressed; streamed responses (NDJSON, SSE) pass through so each chunk still
+reaches the client as soon as it is produced. When a response carries an ETag
+known to a variant store (the response cache), the compressed bytes are taken
+from, or saved into, that store so each cache fill is compressed once per
+encoding. A compressed body gets its own ETag (``"<tag>-gzip"``,
+``"<tag>-br"``) since its bytes differ from the identity body, and every
+negotiated response carries ``Vary: Accept-Encoding``.
+"""
+
+import gzip
+import logging
+from typing import Dict, Optional, Protocol
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Compress bodies at least this large in a worker thread
+THREAD_MINIMUM_SIZE = 256 * 1024
+
+UNCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/", "text/event-stream")
+
+
+class VariantStore(Protocol):
+    def get_variant(self, etag: str, encoding: str) -> Optional[bytes]: ...
+
+    def add_variant(self, etag: str, encoding: str, body: bytes) -> None: ...
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of ``encoding``'s variant of the body tagged ``etag``."""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return f"{etag}-{encoding}"
+
+
+def identity_etag(etag: str) -> str:
+    """Strip the encoding suffix added by :func:`encoded_etag`, if any."""
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def supported_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in supported_encodings():  # ordered by preference
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing complete responses above a size threshold."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        variant_store: Optional[VariantStore] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.variant_store = variant_store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        await self.app(scope, receive, _Responder(self, encoding, send).send)
+
+    async def encode(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        store = self.variant_store if etag else None
+        if store is not None:
+            cached = store.get_variant(etag, encoding)
+            if cached is not None:
+                return cached
+
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            encoded = await anyio.to_thread.run_sync(
+                compress, body, encoding, self.gzip_level, self.brotli_quality
+            )
+        else:
+            encoded = compress(body, encoding, self.gzip_level, self.brotli_quality)
+
+        if store is not None:
+            store.add_variant(etag, encoding, encoded)
+        return encoded
+
+
+class _Responder:
+    """Holds back the response start until the body shows whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(scope=message)
+            if "content-encoding" in headers or message["status"] < 200:
+                self.passthrough = True
+                await self._send(message)
+                return
+            # The body could have been encoded differently for another client
+            headers.add_vary_header("Accept-Encoding")
+            content_type = headers.get("content-type", "")
+            if (
+                self.encoding is None
+                or message["status"] in (204, 206, 304)
+                or content_type.startswith(UNCOMPRESSIBLE_PREFIXES)
+            ):
+                self.passthrough = True
+                await self._send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.start is None:
+            await self._send(message)
+            return
+
+        start, self.start = self.start, None
+        self.passthrough = True
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.middleware.minimum_size:
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers = MutableHeaders(scope=start)
+        etag = headers.get("etag")
+        encoded = await self.middleware.encode(body, self.encoding, etag)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(encoded))
+        if etag:
+            headers["ETag"] = encoded_etag(etag, self.encoding)
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": encoded, "more_body": False})
@@ -46,6 +46,7 @@ class TMDBConfig:
         """Create configuration from environment variables."""
         return cls(
             api_key=api_key,
+            base_url=os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3"),
             cache_ttl_minutes=int(os.getenv("TMDB_CACHE_TTL_MINUTES", "60")),
             cache_max_size=int(os.getenv("TMDB_CACHE_MAX_SIZE", "1000")),
             timeout_seconds=float(os.getenv("TMDB_TIMEOUT_SECONDS", "30.0")),
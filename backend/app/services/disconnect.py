@@ -0,0 +1,87 @@
+"""Cancel request handling when the client disconnects.
+
+Starlette only notices a disconnect when the app reads ``receive`` again, so
+a handler awaiting TMDB keeps running after the user navigates away. This
+middleware reads ``receive`` itself, forwards every message to the app, and
+cancels the app task as soon as ``http.disconnect`` arrives before the
+response has finished. The cancellation propagates into TMDBService, where
+a shared upstream fetch is only stopped once its last waiter has gone.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Dict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.trace import normalize_route
+
+logger = logging.getLogger(__name__)
+
+
+class DisconnectStats:
+    """Counts of requests abandoned by their client."""
+
+    def __init__(self):
+        self.cancelled_requests = 0
+        self.cancelled_by_route: Counter = Counter()
+
+    def record(self, path: str) -> None:
+        self.cancelled_requests += 1
+        self.cancelled_by_route[normalize_route(path)] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cancelled_requests": self.cancelled_requests,
+            "cancelled_by_route": dict(self.cancelled_by_route.most_common()),
+        }
+
+
+disconnect_stats = DisconnectStats()
+
+
+class DisconnectCancellationMiddleware:
+    """Pure ASGI middleware cancelling the app when the client goes away."""
+
+    def __init__(self, app: ASGIApp, stats: DisconnectStats = disconnect_stats):
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: "asyncio.Queue[Message]" = asyncio.Queue()
+        response_complete = False
+
+        async def read_client() -> None:
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        app_task = asyncio.ensure_future(self.app(scope, messages.get, send_tracking))
+        reader = asyncio.ensure_future(read_client())
+        try:
+            await asyncio.wait({app_task, reader}, return_when=asyncio.FIRST_COMPLETED)
+            if not app_task.done() and not response_complete:
+                app_task.cancel()
+                self.stats.record(scope["path"])
+                logger.info(f"Client disconnected, cancelled {scope['method']} {scope['path']}")
+                await asyncio.wait([app_task])
+                return
+            # Disconnect after the response (background tasks) or app finished
+            await app_task
+        finally:
+            reader.cancel()
+            if not app_task.done():
+                app_task.cancel()
@@ -0,0 +1,68 @@
+"""Whole-series episode lookup table."""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+class EpisodeMap:
+    """Season → episode → {title, air_date} map for one TV series.
+
+    Lookups are plain dict hits, so bulk naming code can resolve thousands of
+    ``(season, episode)`` pairs without touching TMDB again.
+    """
+
+    def __init__(
+        self,
+        tv_id: int,
+        name: Optional[str] = None,
+        seasons: Optional[Dict[int, Dict[int, Dict[str, Any]]]] = None,
+    ):
+        self.tv_id = tv_id
+        self.name = name
+        self.seasons: Dict[int, Dict[int, Dict[str, Any]]] = seasons or {}
+
+    @classmethod
+    def from_season_payloads(
+        cls, tv_id: int, name: Optional[str], payloads: Iterable[Dict[str, Any]]
+    ) -> "EpisodeMap":
+        """Build from raw TMDB ``/tv/{id}/season/{n}`` responses."""
+        seasons: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        for payload in payloads:
+            episodes = seasons.setdefault(payload["season_number"], {})
+            for ep in payload.get("episodes", []):
+                episodes[ep["episode_number"]] = {
+                    "title": ep.get("name"),
+                    "air_date": ep.get("air_date"),
+                }
+        return cls(tv_id, name, seasons)
+
+    def lookup(self, season: int, episode: int) -> Optional[Dict[str, Any]]:
+        """Return ``{title, air_date}`` for an episode, or None if unknown."""
+        return self.seasons.get(season, {}).get(episode)
+
+    def title(self, season: int, episode: int) -> Optional[str]:
+        entry = self.lookup(season, episode)
+        return entry["title"] if entry else None
+
+    @property
+    def episode_count(self) -> int:
+        return sum(len(episodes) for episodes in self.seasons.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form; season and episode numbers become string keys."""
+        return {
+            "id": self.tv_id,
+            "name": self.name,
+            "episode_count": self.episode_count,
+            "seasons": {
+                str(season): {str(number): ep for number, ep in sorted(episodes.items())}
+                for season, episodes in sorted(self.seasons.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EpisodeMap":
+        seasons = {
+            int(season): {int(number): ep for number, ep in episodes.items()}
+            for season, episodes in data.get("seasons", {}).items()
+        }
+        return cls(data["id"], data.get("name"), seasons)
@@ -0,0 +1,174 @@
+"""File system calls run off the event loop, bounded per mount.
+
+A stat on a stalled SMB/NFS share can block for minutes. Every such call runs
+on a dedicated, size-limited thread pool instead of the event loop, and:
+
+* each mount may occupy at most ``per_mount_limit`` workers, so one hung
+  share cannot starve the pool for the others. A worker stuck on a share
+  keeps its slot until the call really returns;
+* callers stop waiting after ``timeout`` seconds, both for a free slot and
+  for the call itself, and get a :class:`FileIOTimeout`.
+
+Mounts are resolved from the path alone (the mount table on Linux, the
+drive or UNC share on Windows), never by touching the file system.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+MOUNT_TABLE = "/proc/self/mounts"
+MOUNT_TABLE_TTL_SECONDS = 30.0
+
+
+class FileIOTimeout(TimeoutError):
+    """A file system call did not finish, or could not start, in time."""
+
+
+def _unescape_mount(field: str) -> str:
+    # /proc/self/mounts escapes space, tab, newline and backslash as octal
+    for code, char in (("\\040", " "), ("\\011", "\t"), ("\\012", "\n"), ("\\134", "\\")):
+        field = field.replace(code, char)
+    return field
+
+
+def read_mount_points(table: str = MOUNT_TABLE) -> Optional[List[str]]:
+    """Mount points, longest first, or None where there is no mount table."""
+    try:
+        with open(table, encoding="utf-8", errors="replace") as f:
+            mounts = {_unescape_mount(line.split()[1]) for line in f if len(line.split()) > 1}
+    except OSError:
+        return None
+    return sorted(mounts, key=len, reverse=True)
+
+
+class _MountGate:
+    def __init__(self, mount: str, limit: int, loop: asyncio.AbstractEventLoop):
+        self.mount = mount
+        self.loop = loop
+        self.semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+
+class FileIO:
+    """Thread pool for file system calls with per-mount limits and timeouts."""
+
+    def __init__(self, max_workers: int = 16, per_mount_limit: int = 4, timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.per_mount_limit = min(per_mount_limit, max_workers)
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._gates: Dict[str, _MountGate] = {}
+        self._mounts: Optional[List[str]] = None
+        self._mounts_read_at = 0.0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="file-io"
+                )
+        return self._executor
+
+    def mount_of(self, path: str) -> str:
+        """Mount holding ``path``, from the path string and the mount table."""
+        path = os.path.abspath(path)
+        if os.name == "nt":
+            return os.path.splitdrive(path)[0].upper() or "\\"
+
+        now = time.monotonic()
+        if now - self._mounts_read_at > MOUNT_TABLE_TTL_SECONDS:
+            self._mounts = read_mount_points()
+            self._mounts_read_at = now
+        if self._mounts is None:
+            # No mount table (macOS): network shares live under /Volumes/<name>
+            parts = path.split("/")
+            if len(parts) > 2 and parts[1] in ("Volumes", "mnt", "media"):
+                return "/".join(parts[:3])
+            return "/"
+        for mount in self._mounts:
+            if path == mount or path.startswith(mount.rstrip("/") + "/"):
+                return mount
+        return "/"
+
+    def _gate(self, mount: str) -> _MountGate:
+        loop = asyncio.get_running_loop()
+        gate = self._gates.get(mount)
+        if gate is None or gate.loop is not loop:
+            gate = self._gates[mount] = _MountGate(mount, self.per_mount_limit, loop)
+        return gate
+
+    async def run(self, path: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool, counted against the mount of ``path``."""
+        gate = self._gate(self.mount_of(path))
+        try:
+            await asyncio.wait_for(gate.semaphore.acquire(), self.timeout)
+        except TimeoutError:
+            gate.rejected += 1
+            raise FileIOTimeout(
+                f"{gate.mount} is not responding ({gate.in_flight} operations still pending)"
+            ) from None
+
+        gate.in_flight += 1
+        future = gate.loop.run_in_executor(self._get_executor(), functools.partial(func, *args))
+
+        def release(_) -> None:
+            gate.in_flight -= 1
+            gate.completed += 1
+            gate.semaphore.release()
+
+        future.add_done_callback(release)
+        try:
+            # The call cannot be interrupted; stop waiting but keep its slot
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except TimeoutError:
+            gate.timeouts += 1
+            raise FileIOTimeout(
+                f"File operation on {gate.mount} did not finish within {self.timeout}s"
+            ) from None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "per_mount_limit": self.per_mount_limit,
+            "timeout_seconds": self.timeout,
+            "mounts": {
+                mount: {
+                    "in_flight": gate.in_flight,
+                    "completed": gate.completed,
+                    "timeouts": gate.timeouts,
+                    "rejected": gate.rejected,
+                }
+                for mount, gate in self._gates.items()
+            },
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                # Threads stuck on a hung share must not hold up process exit
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_file_io = FileIO()
+
+
+def configure_file_io(max_workers: int, per_mount_limit: int, timeout: float) -> FileIO:
+    """Replace the shared FileIO, e.g. from settings at startup."""
+    global _file_io
+    _file_io.shutdown()
+    _file_io = FileIO(max_workers, per_mount_limit, timeout)
+    return _file_io
+
+
+def get_file_io() -> FileIO:
+    return _file_io
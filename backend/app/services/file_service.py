@@ -1,7 +1,9 @@
 import os
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
+
+from app.services.file_io import FileIOTimeout, get_file_io
 
 
 class FileService:
@@ -79,6 +81,47 @@ class FileService:
                 "error": "UNKNOWN_ERROR"
             }
 
+    @staticmethod
+    async def rename_file_async(
+        original_path: str,
+        new_name: str,
+        on_renamed: Optional[Callable[[str, str], Any]] = None,
+    ) -> dict:
+        """
+        Rename a file on the file I/O pool instead of the event loop
+
+        A slow or hung network share then only delays this call, bounded by
+        the per-mount limit and timeout, rather than every request.
+
+        Args:
+            original_path: Full path to the original file
+            new_name: New filename (including extension)
+            on_renamed: Called on the pool with (original_path, new_path) once
+                the rename succeeds, even if this call has already timed out
+
+        Returns:
+            Same as rename_file, with error TIMEOUT if the share does not respond
+        """
+        try:
+            return await get_file_io().run(
+                original_path, FileService._rename_and_notify, original_path, new_name, on_renamed
+            )
+        except FileIOTimeout as e:
+            return {
+                "success": False,
+                "message": f"Timed out renaming file: {str(e)}",
+                "error": "TIMEOUT"
+            }
+
+    @staticmethod
+    def _rename_and_notify(
+        original_path: str, new_name: str, on_renamed: Optional[Callable[[str, str], Any]]
+    ) -> dict:
+        result = FileService.rename_file(original_path, new_name)
+        if result["success"] and on_renamed is not None:
+            on_renamed(result["original_path"], result["new_path"])
+        return result
+
     @staticmethod
     def validate_filename(filename: str) -> dict:
         """
@@ -0,0 +1,119 @@
+"""Presorted, filterable index over a person's credits."""
+
+import base64
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class FilmographyFilters:
+    """Server-side credit filters; unset fields match everything."""
+
+    role_type: Optional[str] = None  # "cast" or "crew"
+    department: Optional[str] = None
+    job: Optional[str] = None
+    media_type: Optional[str] = None  # "movie" or "tv"
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in vars(self).values())
+
+    def matches(self, credit: Dict[str, Any]) -> bool:
+        if self.role_type and credit["role_type"] != self.role_type:
+            return False
+        if self.media_type and credit["media_type"] != self.media_type:
+            return False
+        if self.department and (credit.get("department") or "").lower() != self.department.lower():
+            return False
+        if self.job and (credit.get("job") or "").lower() != self.job.lower():
+            return False
+        if self.year_from is not None or self.year_to is not None:
+            year = credit.get("year")
+            if year is None:
+                return False
+            if self.year_from is not None and year < self.year_from:
+                return False
+            if self.year_to is not None and year > self.year_to:
+                return False
+        return True
+
+
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(f"f:{position}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, position = base64.urlsafe_b64decode(padded).decode().split(":")
+        if prefix != "f" or int(position) < 0:
+            raise ValueError
+        return int(position)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+
+class FilmographyIndex:
+    """A person's cast and crew credits, sorted once, newest first.
+
+    ``credits`` merges both lists in year order; cursors are positions in it,
+    so a page costs only the credits scanned to fill it.
+    """
+
+    def __init__(
+        self,
+        person: Dict[str, Any],
+        cast: List[Dict[str, Any]],
+        crew: List[Dict[str, Any]],
+    ):
+        def by_year(credit: Dict[str, Any]) -> int:
+            return credit["year"] or 0
+
+        self.person = person
+        self.cast = sorted(cast, key=by_year, reverse=True)
+        self.crew = sorted(crew, key=by_year, reverse=True)
+        self.credits = sorted(self.cast + self.crew, key=by_year, reverse=True)
+
+    def to_dict(self, filters: Optional[FilmographyFilters] = None) -> Dict[str, Any]:
+        """The full ``{person, cast, crew}`` response, optionally filtered."""
+        if filters is None or filters.is_empty():
+            return {"person": self.person, "cast": self.cast, "crew": self.crew}
+        return {
+            "person": self.person,
+            "cast": [c for c in self.cast if filters.matches(c)],
+            "crew": [c for c in self.crew if filters.matches(c)],
+        }
+
+    def page(
+        self,
+        filters: Optional[FilmographyFilters] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return up to ``limit`` matching credits and the cursor for the next page."""
+        filters = filters or FilmographyFilters()
+        position = decode_cursor(cursor) if cursor else 0
+        items: List[Dict[str, Any]] = []
+        while position < len(self.credits) and len(items) < limit:
+            credit = self.credits[position]
+            position += 1
+            if filters.matches(credit):
+                items.append(credit)
+        next_cursor = encode_cursor(position) if position < len(self.credits) else None
+        return items, next_cursor
+
+    def iter_pages(
+        self, filters: Optional[FilmographyFilters] = None, page_size: int = 50
+    ) -> Iterator[List[Dict[str, Any]]]:
+        cursor: Optional[str] = None
+        while True:
+            items, cursor = self.page(filters, cursor, page_size)
+            if items:
+                yield items
+            if cursor is None:
+                return
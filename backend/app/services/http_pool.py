@@ -0,0 +1,87 @@
+"""Process-wide HTTP connection pool for TMDB traffic.
+
+Enabled by the app lifespan and shared by every TMDBService, including the
+short-lived ones created for client-supplied API keys, so DNS, TCP and TLS
+setup is paid once per connection instead of once per request. The client
+(and httpx itself) is created on first use to keep it out of startup.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from app.services.config import TMDBConfig
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional["httpx.AsyncClient"] = None
+_pool_options: Optional[Dict[str, Any]] = None
+
+
+def open_pool(
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    timeout_seconds: float = TMDBConfig.timeout_seconds,
+) -> None:
+    """Enable the shared pool; the client itself is built by get_pool()."""
+    global _pool_options
+    _pool_options = {
+        "max_connections": max_connections,
+        "max_keepalive_connections": max_keepalive_connections,
+        "timeout_seconds": timeout_seconds,
+    }
+
+
+def get_pool() -> Optional["httpx.AsyncClient"]:
+    """The shared client, or None outside the app lifespan."""
+    global _pool
+    if _pool_options is None:
+        return None
+    if _pool is None or _pool.is_closed:
+        import httpx
+
+        _pool = httpx.AsyncClient(
+            timeout=httpx.Timeout(_pool_options["timeout_seconds"]),
+            limits=httpx.Limits(
+                max_connections=_pool_options["max_connections"],
+                max_keepalive_connections=_pool_options["max_keepalive_connections"],
+            ),
+        )
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool, _pool_options
+    _pool_options = None
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
+
+async def prewarm(url: str, connections: int = 2) -> int:
+    """Open ``connections`` keep-alive connections to ``url``'s host.
+
+    Any HTTP status counts as warm (unauthenticated requests get a 401, which
+    still completes DNS, TCP and TLS). Returns the number that succeeded.
+    """
+    if connections <= 0:
+        return 0
+    pool = get_pool()
+    if pool is None:
+        return 0
+
+    import httpx
+
+    async def touch() -> bool:
+        try:
+            await pool.head(url)
+            return True
+        except httpx.HTTPError as e:
+            logger.warning(f"Connection prewarm to {url} failed: {e}")
+            return False
+
+    results = await asyncio.gather(*(touch() for _ in range(connections)))
+    return sum(results)
@@ -0,0 +1,408 @@
+"""Durable background jobs for long-running library operations.
+
+A job is submitted, persisted as ``queued`` in SQLite and run on the event
+loop by the runner registered for its type. Each type has its own
+concurrency cap, so a long organize run cannot take every slot, and jobs
+past the cap wait in submission order.
+
+Progress is kept in memory and fanned out to subscribers (the SSE endpoint)
+as it changes; it is written to SQLite at most once per
+``progress_interval`` seconds. Every status change is written at once. On
+start, jobs left ``queued`` or ``running`` by a previous process are run
+again from the start. The runners are written to make that safe: scans are
+incremental, and a resumed organize looks up the rename journal for files
+the earlier attempt already renamed and reports them unchanged instead of
+matching them again (without a journal, such files come back unmatched).
+
+TMDB API keys supplied by clients are held in memory only. A job that
+needs one cannot resume after a restart unless the server has its own key.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Subscribers only need the latest snapshot; older ones are dropped when full
+SUBSCRIBER_QUEUE_SIZE = 16
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    type TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    needs_api_key INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, seq);
+CREATE INDEX IF NOT EXISTS jobs_type ON jobs (type, seq);
+"""
+
+_COLUMNS = (
+    "id", "type", "params", "status", "progress", "result", "error", "attempts",
+    "created_at", "started_at", "finished_at",
+)
+_JSON_COLUMNS = ("params", "progress", "result")
+
+
+class JobNotFound(KeyError):
+    """No job has this id."""
+
+
+class UnknownJobType(ValueError):
+    """No runner is registered for this job type."""
+
+
+class JobStore:
+    """SQLite table of jobs; every method is safe to call from any thread."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _row(row: tuple) -> Dict[str, Any]:
+        job = dict(zip(_COLUMNS, row))
+        for column in _JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def insert(self, job: Dict[str, Any], needs_api_key: bool) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, type, params, status, needs_api_key, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job["id"], job["type"], json.dumps(job["params"]), job["status"],
+                    int(needs_api_key), job["created_at"],
+                ),
+            )
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        values = [
+            json.dumps(value) if column in _JSON_COLUMNS and value is not None else value
+            for column, value in fields.items()
+        ]
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*values, job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def list(
+        self, job_type: Optional[str] = None, status: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Newest first, without results (they can be large)."""
+        clauses, params = [], []
+        if job_type is not None:
+            clauses.append("type = ?")
+            params.append(job_type)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs{where} ORDER BY seq DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        jobs = [self._row(row) for row in rows]
+        for job in jobs:
+            job["result"] = None
+        return jobs
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """Jobs a previous process left queued or running, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)}, needs_api_key FROM jobs"
+                " WHERE status IN ('queued', 'running') ORDER BY seq"
+            ).fetchall()
+        jobs = []
+        for row in rows:
+            job = self._row(row[:-1])
+            job["needs_api_key"] = bool(row[-1])
+            jobs.append(job)
+        return jobs
+
+
+class JobContext:
+    """Handed to a runner: its parameters, API key and a progress callback."""
+
+    def __init__(self, manager: "JobManager", job: Dict[str, Any], api_key: Optional[str]):
+        self._manager = manager
+        self.job_id = job["id"]
+        self.params: Dict[str, Any] = job["params"]
+        self.api_key = api_key
+        self.created_at: float = job["created_at"]
+        self.resumed = job["attempts"] > 1
+
+    def report(self, progress: Dict[str, Any]) -> None:
+        """Replace the job's progress snapshot; subscribers see it at once."""
+        self._manager._progress(self.job_id, progress)
+
+
+Runner = Callable[[JobContext], Awaitable[Dict[str, Any]]]
+
+
+class JobManager:
+    """Runs persisted jobs with a concurrency cap per job type."""
+
+    def __init__(self, path: str, progress_interval: float = 1.0):
+        self.store = JobStore(path)
+        self.progress_interval = progress_interval
+        self._runners: Dict[str, Runner] = {}
+        self._limits: Dict[str, int] = {}
+        self._needs_api_key: Dict[str, bool] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._api_keys: Dict[str, Optional[str]] = {}
+        self._live: Dict[str, Dict[str, Any]] = {}
+        self._persisted_at: Dict[str, float] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._cancelling: Set[str] = set()
+
+    def register(self, job_type: str, runner: Runner, limit: int, needs_api_key: bool) -> None:
+        self._runners[job_type] = runner
+        self._limits[job_type] = max(1, limit)
+        self._needs_api_key[job_type] = needs_api_key
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def resume(self, server_api_key: Optional[str]) -> int:
+        """Queue again every job a previous process did not finish."""
+        resumed = 0
+        for job in self.store.unfinished():
+            if job["type"] not in self._runners:
+                self._set(
+                    job,
+                    status="failed",
+                    error=f"Unknown job type: {job['type']}",
+                    finished_at=time.time(),
+                )
+                continue
+            if job["needs_api_key"] and not server_api_key:
+                self._set(
+                    job,
+                    status="failed",
+                    error=(
+                        "Interrupted by a restart; submit it again "
+                        "(client API keys are not stored)"
+                    ),
+                    finished_at=time.time(),
+                )
+                continue
+            self._set(job, status="queued")
+            self._start(job, server_api_key)
+            resumed += 1
+        if resumed:
+            logger.info(f"Resumed {resumed} background jobs")
+        return resumed
+
+    async def shutdown(self) -> None:
+        """Stop running jobs without marking them, so the next start resumes them."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+        self.store.close()
+
+    # -- jobs -----------------------------------------------------------------
+
+    def submit(
+        self, job_type: str, params: Dict[str, Any], api_key: Optional[str]
+    ) -> Dict[str, Any]:
+        if job_type not in self._runners:
+            raise UnknownJobType(job_type)
+        job = {
+            "id": uuid.uuid4().hex,
+            "type": job_type,
+            "params": params,
+            "status": "queued",
+            "progress": None,
+            "result": None,
+            "error": None,
+            "attempts": 0,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        self.store.insert(job, self._needs_api_key[job_type])
+        self._start(job, api_key)
+        return dict(job)
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        live = self._live.get(job_id)
+        if live is not None:
+            return dict(live)
+        job = self.store.get(job_id)
+        if job is None:
+            raise JobNotFound(job_id)
+        return job
+
+    def list(
+        self, job_type: Optional[str] = None, status: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        jobs = self.store.list(job_type, status, limit)
+        for job in jobs:
+            live = self._live.get(job["id"])
+            if live is not None:
+                job.update(progress=live["progress"], status=live["status"])
+        return jobs
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued or running job; finished jobs are returned unchanged."""
+        job = self.get(job_id)
+        task = self._tasks.get(job_id)
+        if job["status"] in ACTIVE_STATUSES and task is not None:
+            self._cancelling.add(job_id)
+            task.cancel()
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        running: Dict[str, int] = {}
+        queued: Dict[str, int] = {}
+        for job in self._live.values():
+            counts = running if job["status"] == "running" else queued
+            counts[job["type"]] = counts.get(job["type"], 0) + 1
+        return {
+            "limits": dict(self._limits),
+            "running": running,
+            "queued": queued,
+        }
+
+    # -- events ---------------------------------------------------------------
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Queue receiving a snapshot of the job on every change."""
+        queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def _publish(self, job: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(job["id"], ()):
+            if queue.full():
+                queue.get_nowait()  # a newer snapshot supersedes the oldest
+            queue.put_nowait(dict(job))
+
+    # -- internals ------------------------------------------------------------
+
+    def _set(self, job: Dict[str, Any], **fields: Any) -> None:
+        """Apply a status change, persist it and tell subscribers."""
+        job.update(fields)
+        self.store.update(job["id"], **fields)
+        self._publish(job)
+
+    def _progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        job = self._live.get(job_id)
+        if job is None:
+            return
+        job["progress"] = progress
+        now = time.monotonic()
+        if now - self._persisted_at.get(job_id, 0.0) >= self.progress_interval:
+            self._persisted_at[job_id] = now
+            self.store.update(job_id, progress=progress)
+        self._publish(job)
+
+    def _semaphore(self, job_type: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(job_type)
+        if semaphore is None:
+            semaphore = self._semaphores[job_type] = asyncio.Semaphore(self._limits[job_type])
+        return semaphore
+
+    def _start(self, job: Dict[str, Any], api_key: Optional[str]) -> None:
+        self._live[job["id"]] = job
+        self._api_keys[job["id"]] = api_key
+        self._tasks[job["id"]] = asyncio.ensure_future(self._execute(job))
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        try:
+            async with self._semaphore(job["type"]):
+                self._set(
+                    job, status="running", attempts=job["attempts"] + 1, started_at=time.time()
+                )
+                context = JobContext(self, job, self._api_keys.get(job_id))
+                result = await self._runners[job["type"]](context)
+            self.store.update(job_id, progress=job["progress"])
+            self._set(job, status="completed", result=result, finished_at=time.time())
+        except asyncio.CancelledError:
+            if job_id in self._cancelling:
+                self._set(job, status="cancelled", finished_at=time.time())
+            else:
+                # Shutting down: leave it queued/running so the next start resumes it
+                self.store.update(job_id, progress=job["progress"])
+                raise
+        except Exception as e:
+            logger.warning(f"Job {job_id} ({job['type']}) failed: {e}")
+            self._set(job, status="failed", error=str(e), finished_at=time.time())
+        finally:
+            self._tasks.pop(job_id, None)
+            self._api_keys.pop(job_id, None)
+            self._live.pop(job_id, None)
+            self._persisted_at.pop(job_id, None)
+            self._cancelling.discard(job_id)
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager(
+    path: str, progress_interval: float = 1.0, setup: Optional[Callable[[JobManager], None]] = None
+) -> JobManager:
+    """Shared manager, created on first use; ``setup`` registers its runners."""
+    global _manager
+    if _manager is None:
+        _manager = JobManager(path, progress_interval)
+        if setup is not None:
+            setup(_manager)
+    return _manager
+
+
+async def close_job_manager() -> None:
+    global _manager
+    if _manager is not None:
+        manager, _manager = _manager, None
+        await manager.shutdown()
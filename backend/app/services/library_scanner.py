@@ -0,0 +1,396 @@
+"""Parallel, incremental media library scanner with a SQLite file index.
+
+Directories are read with ``os.scandir`` on a pool of worker threads, so
+several folders of a NAS are listed at once. Media files and their sidecars
+(subtitles, NFOs) are recorded with size, mtime and inode.
+
+Rescans are incremental: adding, removing or renaming a file changes its
+directory's mtime, so a directory whose mtime matches the index costs one
+``stat`` and its children are taken from the index instead of listing it.
+An unchanged 200k-file library is rescanned with one stat per folder.
+Edits in place (same name, new content) are only picked up by a full scan.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MEDIA_EXTENSIONS = frozenset(
+    {
+        ".mkv", ".mp4", ".m4v", ".avi", ".mov", ".wmv", ".mpg", ".mpeg",
+        ".ts", ".m2ts", ".webm", ".flv", ".vob", ".divx",
+    }
+)
+SIDECAR_EXTENSIONS = frozenset(
+    {".srt", ".ass", ".ssa", ".sub", ".idx", ".vtt", ".sup", ".nfo"}
+)
+
+# Written in one transaction; keeps commits (and their fsyncs) per batch of
+# directories rather than per directory
+COMMIT_EVERY_DIRECTORIES = 200
+PROGRESS_INTERVAL_SECONDS = 0.25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL,
+    scanned_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS directories_parent ON directories (parent);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    device INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+CREATE INDEX IF NOT EXISTS files_inode ON files (device, inode);
+"""
+
+# (path, name, kind, size, mtime_ns, inode, device)
+FileRow = Tuple[str, str, str, int, int, int, int]
+
+
+def classify(name: str) -> Optional[str]:
+    """"media", "sidecar" or None for files the library ignores."""
+    extension = os.path.splitext(name)[1].lower()
+    if extension in MEDIA_EXTENSIONS:
+        return "media"
+    if extension in SIDECAR_EXTENSIONS:
+        return "sidecar"
+    return None
+
+
+def _subtree_bounds(path: str) -> Tuple[str, str]:
+    """Range of strings covering every path below ``path`` (index-friendly LIKE)."""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+@dataclass
+class _Listing:
+    path: str
+    mtime_ns: int
+    changed: bool
+    subdirectories: List[str] = field(default_factory=list)
+    files: List[FileRow] = field(default_factory=list)
+    skipped_names: int = 0
+    error: Optional[str] = None
+
+
+def _storable(name: str) -> bool:
+    """False for names that are not valid UTF-8 on disk.
+
+    Python decodes those with surrogate escapes, which SQLite cannot store.
+    """
+    try:
+        name.encode("utf-8")
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def _read_directory(path: str, known_mtime_ns: Optional[int], full: bool) -> _Listing:
+    """Runs on a worker: stat the directory, and list it only if it changed."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError as e:
+        return _Listing(path, 0, False, error=str(e))
+    if not full and mtime_ns == known_mtime_ns:
+        return _Listing(path, mtime_ns, changed=False)
+
+    listing = _Listing(path, mtime_ns, changed=True)
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not _storable(entry.name):
+                    listing.skipped_names += 1
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Hidden and NAS metadata folders (.@__thumb, @eaDir)
+                        if not entry.name.startswith((".", "@")):
+                            listing.subdirectories.append(entry.path)
+                        continue
+                    kind = classify(entry.name)
+                    if kind is None or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    listing.files.append(
+                        (entry.path, entry.name, kind, stat.st_size, stat.st_mtime_ns,
+                         stat.st_ino, stat.st_dev)
+                    )
+                except OSError:
+                    continue  # vanished or unreadable entry; the rest still counts
+    except OSError as e:
+        listing.error = str(e)
+    return listing
+
+
+class LibraryIndex:
+    """SQLite index of scanned files; each caller thread gets its own connection."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = self.connect()
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+        finally:
+            db.close()
+
+    def connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def files(
+        self,
+        root: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 500,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        query = "SELECT path, directory, name, kind, size, mtime_ns, inode FROM files WHERE 1 = 1"
+        params: List[Any] = []
+        if root is not None:
+            root = os.path.normpath(root)
+            low, high = _subtree_bounds(root)
+            query += " AND (directory = ? OR (directory >= ? AND directory < ?))"
+            params += [root, low, high]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY path LIMIT ? OFFSET ?"
+        params += [limit, offset]
+        db = self.connect()
+        try:
+            rows = db.execute(query, params).fetchall()
+        finally:
+            db.close()
+        return [
+            {
+                "path": path, "directory": directory, "name": name, "kind": kind,
+                "size": size, "mtime_ns": mtime_ns, "inode": inode,
+            }
+            for path, directory, name, kind, size, mtime_ns, inode in rows
+        ]
+
+    def counts(self, db: sqlite3.Connection, root: str) -> Dict[str, int]:
+        low, high = _subtree_bounds(root)
+        rows = db.execute(
+            "SELECT kind, COUNT(*) FROM files"
+            " WHERE directory = ? OR (directory >= ? AND directory < ?) GROUP BY kind",
+            (root, low, high),
+        ).fetchall()
+        counts = {"media": 0, "sidecar": 0}
+        counts.update(dict(rows))
+        return counts
+
+
+class ScanCancelled(Exception):
+    pass
+
+
+class LibraryScanner:
+    """Scan one root into the index, reporting progress through ``emit``."""
+
+    def __init__(
+        self,
+        index: LibraryIndex,
+        root: str,
+        full: bool = False,
+        workers: int = 8,
+        emit: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.index = index
+        self.root = os.path.normpath(os.path.abspath(root))
+        self.full = full
+        self.workers = workers
+        self.emit = emit or (lambda event: None)
+        self.cancelled = threading.Event()
+        self.stats = {
+            "directories": 0,
+            "unchanged_directories": 0,
+            "removed_directories": 0,
+            "files_indexed": 0,
+            "skipped_names": 0,
+            "errors": 0,
+        }
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def run(self) -> Dict[str, Any]:
+        """Blocking; run it in a thread. Returns the summary."""
+        if not os.path.isdir(self.root):
+            raise NotADirectoryError(f"Not a directory: {self.root}")
+        started = time.perf_counter()
+        db = self.index.connect()
+        try:
+            self._scan(db)
+            summary = {
+                "root": self.root,
+                "full": self.full,
+                **self.stats,
+                **self.index.counts(db, self.root),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        finally:
+            db.close()
+        return summary
+
+    def _scan(self, db: sqlite3.Connection) -> None:
+        # Everything already known under the root, loaded with one query
+        low, high = _subtree_bounds(self.root)
+        known: Dict[str, int] = {}
+        children: Dict[str, List[str]] = {}
+        for path, parent, mtime_ns in db.execute(
+            "SELECT path, parent, mtime_ns FROM directories"
+            " WHERE path = ? OR (path >= ? AND path < ?)",
+            (self.root, low, high),
+        ):
+            known[path] = mtime_ns
+            children.setdefault(parent, []).append(path)
+
+        seen: Set[str] = set()
+        pending: Dict[Future, str] = {}
+        last_progress = 0.0
+        uncommitted = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scan") as pool:
+
+            def submit(path: str) -> None:
+                seen.add(path)
+                pending[pool.submit(_read_directory, path, known.get(path), self.full)] = path
+
+            submit(self.root)
+            db.execute("BEGIN")
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        del pending[future]
+                        listing = future.result()
+                        if self.cancelled.is_set():
+                            raise ScanCancelled()
+                        subdirectories = self._apply(db, listing, known, children)
+                        for path in subdirectories:
+                            submit(path)
+                        uncommitted += 1
+                    if uncommitted >= COMMIT_EVERY_DIRECTORIES:
+                        db.execute("COMMIT")
+                        db.execute("BEGIN")
+                        uncommitted = 0
+                    now = time.monotonic()
+                    if now - last_progress >= PROGRESS_INTERVAL_SECONDS:
+                        last_progress = now
+                        self.emit({"type": "progress", "queued": len(pending), **self.stats})
+                db.execute("COMMIT")
+            except BaseException:
+                self.cancelled.set()
+                for future in pending:
+                    future.cancel()
+                # Each directory is written whole, so what was applied so far is
+                # consistent; the rest is picked up by the next scan
+                if db.in_transaction:
+                    db.execute("COMMIT")
+                raise
+
+    def _apply(
+        self,
+        db: sqlite3.Connection,
+        listing: _Listing,
+        known: Dict[str, int],
+        children: Dict[str, List[str]],
+    ) -> List[str]:
+        """Write one directory's result; returns the subdirectories to visit."""
+        self.stats["directories"] += 1
+        if listing.error is not None:
+            self.stats["errors"] += 1
+            logger.warning(f"Could not scan {listing.path}: {listing.error}")
+            if not os.path.lexists(listing.path):
+                self._remove_subtree(db, listing.path)
+            return []
+        if not listing.changed:
+            self.stats["unchanged_directories"] += 1
+            return children.get(listing.path, [])
+
+        path = listing.path
+        if listing.skipped_names:
+            self.stats["skipped_names"] += listing.skipped_names
+            logger.warning(f"Skipped {listing.skipped_names} entries in {path} with non-UTF-8 names")
+        db.execute("DELETE FROM files WHERE directory = ?", (path,))
+        db.executemany(
+            "INSERT OR REPLACE INTO files"
+            " (path, directory, name, kind, size, mtime_ns, inode, device)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((row[0], path, *row[1:]) for row in listing.files),
+        )
+        self.stats["files_indexed"] += len(listing.files)
+
+        current = set(listing.subdirectories)
+        for old in children.get(path, []):
+            if old not in current:
+                self._remove_subtree(db, old)
+        db.execute(
+            "INSERT OR REPLACE INTO directories (path, parent, mtime_ns, scanned_at)"
+            " VALUES (?, ?, ?, ?)",
+            (path, os.path.dirname(path), listing.mtime_ns, time.time()),
+        )
+        return listing.subdirectories
+
+    def _remove_subtree(self, db: sqlite3.Connection, path: str) -> None:
+        low, high = _subtree_bounds(path)
+        db.execute(
+            "DELETE FROM files WHERE directory = ? OR (directory >= ? AND directory < ?)",
+            (path, low, high),
+        )
+        removed = db.execute(
+            "DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+            (path, low, high),
+        ).rowcount
+        self.stats["removed_directories"] += removed
+
+
+_index: Optional[LibraryIndex] = None
+_index_lock = threading.Lock()
+_active_roots: Set[str] = set()
+
+
+def get_library_index(path: str) -> LibraryIndex:
+    """Shared index, created on first use."""
+    global _index
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = LibraryIndex(path)
+    return _index
+
+
+def claim_root(root: str) -> bool:
+    """Mark a root as being scanned; False if a scan of it is already running."""
+    root = os.path.normpath(os.path.abspath(root))
+    with _index_lock:
+        if root in _active_roots:
+            return False
+        _active_roots.add(root)
+        return True
+
+
+def release_root(root: str) -> None:
+    with _index_lock:
+        _active_roots.discard(os.path.normpath(os.path.abspath(root)))
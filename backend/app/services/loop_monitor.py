@@ -0,0 +1,137 @@
+"""Event-loop lag monitoring and slow-callback detection.
+
+A ticker coroutine sleeps for a fixed interval and records how late it wakes
+up; that overshoot is the time the loop spent running other callbacks. A
+watchdog thread watches the ticker's heartbeat and, when the loop has been
+stuck for longer than the slow-callback threshold, samples the loop thread's
+stack so the blocking handler can be identified.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.services.utils import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Continuously measure event-loop lag and capture stacks of slow callbacks."""
+
+    def __init__(
+        self,
+        interval_ms: float = 100.0,
+        slow_callback_ms: float = 100.0,
+        max_samples: int = 3000,
+        max_events: int = 50,
+        stack_limit: int = 30,
+    ):
+        self.interval = interval_ms / 1000
+        self.slow_threshold = slow_callback_ms / 1000
+        self.stack_limit = stack_limit
+        self.lag_samples: Deque[float] = deque(maxlen=max_samples)
+        self.slow_events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.slow_callbacks = 0
+        self.max_lag = 0.0
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._stall_stack: Optional[List[str]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Loop lag monitor started (interval {self.interval * 1000:.0f}ms, "
+            f"slow callback threshold {self.slow_threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled - self.interval)
+            self._heartbeat = time.monotonic()
+            self.record_lag(lag)
+
+    def record_lag(self, lag: float) -> None:
+        """Record one lag measurement, closing out a slow-callback event if any."""
+        self.lag_samples.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag < self.slow_threshold:
+            return
+
+        self.slow_callbacks += 1
+        stack = self._stall_stack
+        self._stall_stack = None
+        event = {
+            "timestamp": time.time(),
+            "lag_ms": round(lag * 1000, 2),
+            "stack": stack,
+        }
+        self.slow_events.append(event)
+        where = stack[-1].strip().splitlines()[0] if stack else "unknown location"
+        logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms at {where}")
+
+    def _watch(self) -> None:
+        check_every = max(self.slow_threshold / 2, 0.005)
+        while not self._stop.wait(check_every):
+            stalled_for = time.monotonic() - self._heartbeat - self.interval
+            if stalled_for < self.slow_threshold or self._stall_stack is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                # Sampled mid-stall, so this is the callback holding the loop
+                self._stall_stack = traceback.format_stack(frame, limit=self.stack_limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lag percentiles and recent slow callbacks."""
+        samples_ms = [lag * 1000 for lag in self.lag_samples]
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "slow_callback_threshold_ms": self.slow_threshold * 1000,
+            "samples": len(samples_ms),
+            "lag_p50_ms": round(percentile(samples_ms, 50), 2),
+            "lag_p95_ms": round(percentile(samples_ms, 95), 2),
+            "lag_p99_ms": round(percentile(samples_ms, 99), 2),
+            "lag_max_ms": round(self.max_lag * 1000, 2),
+            "slow_callbacks": self.slow_callbacks,
+            "recent_slow_callbacks": list(self.slow_events),
+        }
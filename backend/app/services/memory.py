@@ -0,0 +1,164 @@
+"""Memory footprint introspection for caches and in-flight requests.
+
+Caches register themselves under a tier name; the report walks every live
+cache in every tier, deep-sizes each entry and groups the totals by endpoint
+class (``/movie/{id}``, ``/person/{id}/combined_credits``...). tracemalloc
+snapshots add allocation sites and growth since the previous report.
+"""
+
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.trace import normalize_route
+
+logger = logging.getLogger(__name__)
+
+_cache_tiers: Dict[str, "weakref.WeakSet[Any]"] = defaultdict(weakref.WeakSet)
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+def register_cache(tier: str, cache: Any) -> None:
+    """Track a cache for memory reports; it must provide ``entries()``."""
+    _cache_tiers[tier].add(cache)
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate retained size of a JSON-like object graph in bytes."""
+    if seen is None:
+        seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__"):
+            stack.append(vars(current))
+    return total
+
+
+def endpoint_class(cache_key: str) -> str:
+    """Map a cache key such as ``/movie/27205:123`` to ``/movie/{id}``."""
+    return normalize_route(cache_key.split(":", 1)[0])
+
+
+def _rss_bytes() -> Dict[str, Optional[int]]:
+    current = None
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = None
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            peak *= 1024  # Linux reports kilobytes, macOS bytes
+    except (ImportError, OSError):
+        pass
+    return {"rss_bytes": current, "peak_rss_bytes": peak}
+
+
+def _cache_report(caches: Iterable[Any], top_n: int) -> Dict[str, Any]:
+    by_endpoint: Dict[str, Dict[str, int]] = defaultdict(lambda: {"entries": 0, "bytes": 0})
+    largest: List[Tuple[int, str]] = []
+    total_bytes = 0
+    total_entries = 0
+    instances = 0
+    for cache in list(caches):
+        instances += 1
+        seen: set = set()
+        for key, value in cache.entries():
+            size = deep_sizeof(value, seen)
+            group = by_endpoint[endpoint_class(key)]
+            group["entries"] += 1
+            group["bytes"] += size
+            total_bytes += size
+            total_entries += 1
+            largest.append((size, key))
+
+    largest.sort(reverse=True)
+    return {
+        "instances": instances,
+        "entries": total_entries,
+        "bytes": total_bytes,
+        "by_endpoint": dict(
+            sorted(by_endpoint.items(), key=lambda item: item[1]["bytes"], reverse=True)
+        ),
+        "largest_entries": [{"key": key, "bytes": size} for size, key in largest[:top_n]],
+    }
+
+
+def _tracemalloc_report(top_n: int) -> Dict[str, Any]:
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+    current, peak = tracemalloc.get_traced_memory()
+    report: Dict[str, Any] = {
+        "tracing": True,
+        "traced_bytes": current,
+        "traced_peak_bytes": peak,
+        "top_allocations": [
+            {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:top_n]
+        ],
+    }
+    if _last_snapshot is not None:
+        report["growth_since_last_report"] = [
+            {"location": str(stat.traceback), "bytes_diff": stat.size_diff}
+            for stat in snapshot.compare_to(_last_snapshot, "lineno")[:top_n]
+            if stat.size_diff
+        ]
+    _last_snapshot = snapshot
+    return report
+
+
+def start_tracing(frames: int = 1) -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.info(f"tracemalloc started with {frames} frame(s) per trace")
+
+
+def build_memory_report(
+    inflight: Optional[Dict[str, Dict[str, Any]]] = None, top_n: int = 10
+) -> Dict[str, Any]:
+    """Retained memory by subsystem plus process and tracemalloc figures."""
+    now = time.monotonic()
+    inflight = inflight or {}
+    return {
+        "process": _rss_bytes(),
+        "cache_tiers": {
+            tier: _cache_report(caches, top_n) for tier, caches in sorted(_cache_tiers.items())
+        },
+        "inflight_requests": {
+            "count": len(inflight),
+            "requests": [
+                {
+                    "request_id": request_id,
+                    "path": info["path"],
+                    "age_ms": round((now - info["started"]) * 1000, 1),
+                }
+                for request_id, info in list(inflight.items())[:top_n]
+            ],
+        },
+        "tracemalloc": _tracemalloc_report(top_n),
+    }
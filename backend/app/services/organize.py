@@ -0,0 +1,451 @@
+"""Streaming organize pipeline: scan → parse → match → render → rename.
+
+Each stage is a set of workers reading from a bounded queue and writing to
+the next stage's queue. A full queue blocks the stage feeding it, so the
+slowest stage sets the pace for the whole pipeline and at most
+``queue_size`` files wait in front of each stage, however large the
+library. Files leave the pipeline as soon as their outcome is known
+(unmatched, invalid name, renamed, ...) and are reported through ``emit``
+instead of being collected, so memory stays flat. ``emit`` may be a
+coroutine function (e.g. a bounded queue's ``put``), which extends the
+backpressure to whoever consumes the events.
+
+Renames are gathered into chunks and run as best-effort batches through
+:class:`BatchRenamer`, which resolves swaps and occupied names and journals
+each chunk for undo.
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.services.auto_match import AutoMatcher
+from app.services.batch_rename import BatchRenamer
+from app.services.file_service import FileService
+from app.services.library_scanner import classify
+from app.services.release_parser import parse
+from app.services.utils import sanitize_filename
+
+if TYPE_CHECKING:
+    from app.services.rename_journal import RenameJournal
+    from app.services.tmdb import TMDBService
+
+logger = logging.getLogger(__name__)
+
+# May return an awaitable; the pipeline then waits on it, so a slow consumer slows the pipeline
+Emit = Callable[[Dict[str, Any]], Any]
+
+# Marks the end of the stream in a stage's queue
+_DONE = object()
+
+# Pipelines currently running, for diagnostics
+active_pipelines: Set["OrganizePipeline"] = set()
+
+
+class OrganizeCancelled(Exception):
+    """The pipeline was cancelled before every file was handled."""
+
+
+def render_name(parsed: Dict[str, Any], match: Dict[str, Any]) -> Optional[str]:
+    """Target filename in the app's naming scheme, or None if it cannot be named.
+
+    Episodes: ``S01E02 - Title (1080p).mkv`` (``S01E01-E02`` for multi-episode
+    files); movies: ``Title [2010](1080p).mkv``.
+    """
+    quality = f" ({parsed['resolution']})" if parsed["resolution"] else ""
+    extension = f".{parsed['extension']}" if parsed["extension"] else ""
+    if match["media_type"] == "movie":
+        if not match["title"]:
+            return None
+        year = f" [{match['year']}]" if match["year"] else ""
+        quality = f"({parsed['resolution']})" if parsed["resolution"] else ""
+        return f"{sanitize_filename(match['title'])}{year}{quality}{extension}"
+
+    episodes = match["episodes"]
+    if not episodes:
+        return None
+    first, last = episodes[0], episodes[-1]
+    numbering = f"S{first['season']:02d}E{first['episode']:02d}"
+    if last is not first:
+        numbering += f"-E{last['episode']:02d}"
+    title = sanitize_filename(first["title"] or "Unknown Episode")
+    return f"{numbering} - {title}{quality}{extension}"
+
+
+@dataclass
+class StageMetrics:
+    """Counters for one stage.
+
+    ``blocked_seconds`` is time spent waiting on a full downstream queue: a
+    stage that blocks a lot is being held back by a slower one after it.
+    """
+
+    name: str
+    concurrency: int
+    queue_capacity: int
+    received: int = 0
+    passed: int = 0
+    finished: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    started_at: Optional[float] = None
+    stopped_at: Optional[float] = None
+
+    def snapshot(self, queue_depth: int) -> Dict[str, Any]:
+        now = self.stopped_at or time.perf_counter()
+        elapsed = now - self.started_at if self.started_at is not None else 0.0
+        handled = self.passed + self.finished + self.failed
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "queue_depth": queue_depth,
+            "queue_capacity": self.queue_capacity,
+            "received": self.received,
+            "passed": self.passed,
+            "finished": self.finished,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "throughput_per_second": round(handled / elapsed, 1) if elapsed > 0 else 0.0,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
+
+
+class _Stage:
+    """Workers draining one bounded queue into the next stage's queue.
+
+    A ``batched`` stage's handler takes a list of up to ``batch_size`` items
+    (possibly just one); any other handler takes a single item.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handle: Callable[[Any], Awaitable[Any]],
+        on_error: Callable[[str, List[Any], Exception], Awaitable[None]],
+        concurrency: int,
+        queue_size: int,
+        batched: bool = False,
+        batch_size: int = 1,
+    ):
+        self.name = name
+        self.handle = handle
+        self.on_error = on_error
+        self.concurrency = concurrency
+        self.batched = batched
+        self.batch_size = max(1, batch_size) if batched else 1
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.next: Optional["_Stage"] = None
+        self.metrics = StageMetrics(name, concurrency, queue_size)
+        self._running = concurrency
+
+    async def _take(self) -> Optional[List[Any]]:
+        """Next item (or up to batch_size items already queued), None at end of stream."""
+        item = await self.queue.get()
+        if item is _DONE:
+            self.queue.put_nowait(_DONE)  # let sibling workers see it too
+            return None
+        items = [item]
+        while len(items) < self.batch_size and not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is _DONE:
+                self.queue.put_nowait(_DONE)
+                break
+            items.append(item)
+        return items
+
+    async def send(self, item: Any) -> None:
+        """Hand an item to the next stage, waiting while its queue is full."""
+        queue = self.next.queue
+        self.metrics.passed += 1
+        if queue.full():
+            started = time.perf_counter()
+            await queue.put(item)
+            self.metrics.blocked_seconds += time.perf_counter() - started
+        else:
+            queue.put_nowait(item)
+
+    async def worker(self) -> None:
+        metrics = self.metrics
+        if metrics.started_at is None:
+            metrics.started_at = time.perf_counter()
+        try:
+            while (items := await self._take()) is not None:
+                metrics.received += len(items)
+                metrics.in_flight += len(items)
+                started = time.perf_counter()
+                try:
+                    outputs = await self.handle(items if self.batched else items[0])
+                except Exception as e:
+                    metrics.failed += len(items)
+                    await self.on_error(self.name, items, e)
+                    outputs = None
+                finally:
+                    metrics.busy_seconds += time.perf_counter() - started
+                    metrics.in_flight -= len(items)
+                for output in outputs or ():
+                    await self.send(output)
+        finally:
+            self._running -= 1
+        if self._running == 0:
+            metrics.stopped_at = time.perf_counter()
+            self.queue.get_nowait()  # the end marker left for sibling workers
+            if self.next is not None:
+                await self.next.queue.put(_DONE)
+
+
+class OrganizePipeline:
+    """Scan a folder and rename its media files after their TMDB match."""
+
+    def __init__(
+        self,
+        service: "TMDBService",
+        root: str,
+        dry_run: bool = True,
+        match_concurrency: int = 8,
+        min_confidence: float = 0.6,
+        queue_size: int = 256,
+        rename_batch_size: int = 100,
+        journal: Optional["RenameJournal"] = None,
+        emit: Optional[Emit] = None,
+        skip: Optional[Set[str]] = None,
+    ):
+        self.root = root
+        # Files an earlier, interrupted run already renamed: reported unchanged
+        self.skip = {os.path.normpath(path) for path in skip or ()}
+        self.dry_run = dry_run
+        self.journal = journal
+        self.emit = emit or (lambda event: None)
+        self.matcher = AutoMatcher(service, match_concurrency, min_confidence)
+        self.counts: Dict[str, int] = {}
+        self._cancelled = False
+
+        self.stages: List[_Stage] = [
+            _Stage("scan", self._scan, self._failed, 1, 2),
+            _Stage("parse", self._parse, self._failed, 1, queue_size),
+            _Stage("match", self._match, self._failed, match_concurrency, queue_size),
+            _Stage("render", self._render, self._failed, 1, queue_size),
+            _Stage(
+                "rename", self._rename, self._failed, 1, queue_size,
+                batched=True, batch_size=rename_batch_size,
+            ),
+        ]
+        for stage, following in zip(self.stages, self.stages[1:]):
+            stage.next = following
+        self._by_name = {stage.name: stage for stage in self.stages}
+
+    # -- stages --------------------------------------------------------------
+
+    async def _scan(self, root: str) -> None:
+        """Walk the tree in a thread, feeding parse; blocks while parse is full."""
+        loop = asyncio.get_running_loop()
+        stage = self._by_name["scan"]
+
+        def feed(path: str) -> None:
+            sent = asyncio.run_coroutine_threadsafe(stage.send(path), loop)
+            while True:
+                try:
+                    return sent.result(timeout=0.5)
+                except concurrent.futures.TimeoutError:
+                    if self._cancelled:
+                        sent.cancel()
+                        return None
+
+        def walk() -> None:
+            pending = [root]
+            while pending and not self._cancelled:
+                directory = pending.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        listing = sorted(entries, key=lambda entry: entry.name)
+                except OSError as e:
+                    logger.warning(f"Organize could not list {directory}: {e}")
+                    continue
+                for entry in listing:
+                    if self._cancelled:
+                        return
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name[:1] not in (".", "@"):
+                            pending.append(entry.path)
+                    elif classify(entry.name) == "media" and entry.is_file():
+                        feed(entry.path)
+
+        await asyncio.to_thread(walk)
+        return None
+
+    async def _parse(self, path: str) -> List[Dict[str, Any]]:
+        if self._cancelled:
+            return []
+        if os.path.normpath(path) in self.skip:
+            name = os.path.basename(path)
+            await self._finish("parse", {"path": path}, "unchanged", None, new_name=name)
+            return []
+        return [{"path": path, "parsed": parse(os.path.basename(path))}]
+
+    async def _match(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if self._cancelled:
+            return []
+        match = await self.matcher.match_parsed(item["parsed"])
+        if match["status"] != "matched":
+            await self._finish(
+                "match", item, match["status"], match.get("message"), match=match
+            )
+            return []
+        item["match"] = match
+        return [] if self._cancelled else [item]
+
+    async def _render(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if self._cancelled:
+            return []
+        new_name = render_name(item["parsed"], item["match"])
+        if new_name is None:
+            await self._finish(
+                "render", item, "unnamed", "Match has no episode or title to name the file after"
+            )
+            return []
+        validation = FileService.validate_filename(new_name)
+        if not validation["valid"]:
+            await self._finish(
+                "render", item, "invalid_name", validation["message"], new_name=new_name
+            )
+            return []
+        if new_name == os.path.basename(item["path"]):
+            await self._finish("render", item, "unchanged", None, new_name=new_name)
+            return []
+        item["new_name"] = new_name
+        return [item]
+
+    async def _rename(self, items: List[Dict[str, Any]]) -> None:
+        if self._cancelled:
+            return None
+        if self.dry_run:
+            for item in items:
+                await self._finish("rename", item, "planned", None, new_name=item["new_name"])
+            return None
+        renamer = BatchRenamer(
+            [{"original_path": item["path"], "new_name": item["new_name"]} for item in items],
+            mode="best_effort",
+            journal=self.journal,
+        )
+        summary = await renamer.run()
+        for item, result in zip(items, summary["results"]):
+            if result["success"]:
+                await self._finish("rename", item, "renamed", None, new_name=item["new_name"])
+            else:
+                await self._finish(
+                    "rename",
+                    item,
+                    "rename_failed",
+                    result.get("message"),
+                    new_name=item["new_name"],
+                )
+        return None
+
+    # -- driver --------------------------------------------------------------
+
+    async def _report(self, event: Dict[str, Any]) -> None:
+        result = self.emit(event)
+        if inspect.isawaitable(result):
+            await result
+
+    async def _finish(
+        self,
+        stage: str,
+        item: Dict[str, Any],
+        status: str,
+        message: Optional[str],
+        new_name: Optional[str] = None,
+        match: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        match = match or item.get("match") or {}
+        self._by_name[stage].metrics.finished += 1
+        self.counts[status] = self.counts.get(status, 0) + 1
+        await self._report(
+            {
+                "type": "file",
+                "path": item["path"],
+                "status": status,
+                "new_name": new_name,
+                "tmdb_id": match.get("tmdb_id"),
+                "media_type": match.get("media_type"),
+                "confidence": match.get("confidence"),
+                "message": message,
+            }
+        )
+
+    async def _failed(self, stage: str, items: List[Any], error: Exception) -> None:
+        logger.warning(f"Organize stage {stage} failed: {error}")
+        for item in items:
+            if isinstance(item, dict):
+                self.counts["error"] = self.counts.get("error", 0) + 1
+                await self._report(
+                    {"type": "file", "path": item["path"], "status": "error", "message": str(error)}
+                )
+            else:
+                await self._report({"type": "error", "stage": stage, "detail": str(error)})
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Per-stage counters, throughput and queue depth, in pipeline order."""
+        return [stage.metrics.snapshot(stage.queue.qsize()) for stage in self.stages]
+
+    def cancel(self) -> None:
+        """Stop scanning and drop files already queued in later stages.
+
+        A rename batch already handed to :class:`BatchRenamer` still finishes,
+        so the journal stays consistent; nothing after it is renamed.
+        """
+        self._cancelled = True
+
+    async def run(self, metrics_interval: float = 1.0) -> Dict[str, Any]:
+        """Run every stage to completion; returns the summary."""
+        started = time.perf_counter()
+        # The scan stage's only input is the root; its thread feeds parse directly
+        scan = self._by_name["scan"]
+        scan.queue.put_nowait(self.root)
+        scan.queue.put_nowait(_DONE)
+
+        workers = [
+            asyncio.ensure_future(stage.worker())
+            for stage in self.stages
+            for _ in range(stage.concurrency)
+        ]
+
+        async def report() -> None:
+            while True:
+                await asyncio.sleep(metrics_interval)
+                await self._report({"type": "metrics", "stages": self.metrics()})
+
+        reporter = asyncio.ensure_future(report())
+        active_pipelines.add(self)
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            self.cancel()
+            for worker in workers:
+                worker.cancel()
+            raise
+        finally:
+            reporter.cancel()
+            active_pipelines.discard(self)
+        if self._cancelled:
+            raise OrganizeCancelled()
+
+        files = sum(self.counts.values())
+        return {
+            "root": self.root,
+            "dry_run": self.dry_run,
+            "files": files,
+            "counts": dict(self.counts),
+            "groups": self.matcher.groups,
+            "searches": self.matcher.searches,
+            "episode_maps": self.matcher.episode_maps,
+            "stages": self.metrics(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
@@ -0,0 +1,165 @@
+"""Opt-in per-request profiling.
+
+A profiled request is sampled on the event-loop thread for as long as it is in
+flight, so the samples cover the async route code and the TMDBService response
+shaping it awaits. Other requests interleaved on the loop during that window
+show up too; profile on a quiet server for clean attribution.
+
+Two modes are available:
+
+* ``sampling`` - a background thread snapshots the loop thread's stack every
+  ``interval_ms`` and writes folded stacks (``<request_id>.folded``) that
+  flamegraph.pl, speedscope and inferno read directly.
+* ``deterministic`` - cProfile instruments every call and writes
+  ``<request_id>.prof`` for snakeviz, flameprof or pstats.
+"""
+
+import cProfile
+import logging
+import os
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-debug-profile"
+
+# Leaf frames that mean the loop was idle waiting for I/O
+_IDLE_FILES = ("selectors.py",)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Periodically sample one thread's stack into folded-stack counts."""
+
+    def __init__(self, thread_id: int, interval_ms: float = 1.0):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self.idle_samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            if frame.f_code.co_filename.endswith(_IDLE_FILES):
+                self.idle_samples += 1
+                continue
+            labels: List[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_folded(self, path: str) -> None:
+        """Write ``stack count`` lines in the flamegraph folded format."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileSession:
+    """Result of profiling one request."""
+
+    def __init__(self, request_id: str, path: str):
+        self.request_id = request_id
+        self.path = path
+        self.samples = 0
+
+
+class RequestProfiler:
+    """Decide which requests to profile and write one profile file per request."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        mode: str = "sampling",
+        output_dir: str = "profiles",
+        sample_rate: float = 0.0,
+        path_pattern: Optional[str] = None,
+        interval_ms: float = 1.0,
+    ):
+        if mode not in ("sampling", "deterministic"):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.enabled = enabled
+        self.mode = mode
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.path_pattern = re.compile(path_pattern) if path_pattern else None
+        self.interval_ms = interval_ms
+        self.profiles_written = 0
+        # cProfile cannot nest on one thread, so only one deterministic run at a time
+        self._deterministic_busy = False
+
+    def should_profile(self, path: str, headers: Mapping[str, str]) -> bool:
+        """Profile when the debug header is set or the sampling rule matches."""
+        if not self.enabled:
+            return False
+        if headers.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes"):
+            return True
+        if self.sample_rate <= 0:
+            return False
+        if self.path_pattern is not None and not self.path_pattern.search(path):
+            return False
+        return random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, request_id: str) -> Iterator[Optional[ProfileSession]]:
+        """Profile the enclosed block; yields None if profiling is unavailable."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", request_id)
+
+        if self.mode == "deterministic":
+            if self._deterministic_busy:
+                yield None
+                return
+            self._deterministic_busy = True
+            session = ProfileSession(request_id, os.path.join(self.output_dir, f"{safe_id}.prof"))
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield session
+            finally:
+                profiler.disable()
+                self._deterministic_busy = False
+                profiler.dump_stats(session.path)
+                session.samples = len(profiler.getstats())
+                self._written(session)
+            return
+
+        session = ProfileSession(request_id, os.path.join(self.output_dir, f"{safe_id}.folded"))
+        sampler = StackSampler(threading.get_ident(), self.interval_ms)
+        sampler.start()
+        try:
+            yield session
+        finally:
+            sampler.stop()
+            sampler.write_folded(session.path)
+            session.samples = sum(sampler.stacks.values())
+            self._written(session)
+
+    def _written(self, session: ProfileSession) -> None:
+        self.profiles_written += 1
+        logger.info(
+            f"Wrote {self.mode} profile for request {session.request_id} "
+            f"to {session.path} ({session.samples} samples)"
+        )
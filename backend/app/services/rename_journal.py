@@ -0,0 +1,488 @@
+"""Append-only journal of file renames, for crash recovery and undo/redo.
+
+Before a batch touches the disk its whole plan is appended to ``renames.log``,
+and when it finishes its outcome is appended too. Each of those is a single
+write and a single fsync, however many files the batch holds. If the process
+dies mid-batch, the next start finds a batch without an outcome, works out
+from the disk how far each chain got (one ``scandir`` per directory), and
+rolls it back (``all_or_nothing``) or finishes it (``best_effort``).
+
+A cycle is the exception: once its temporary name is gone, the disk looks
+the same whether the cycle ran to the end or never started. So just before
+any rename that removes a temporary name, a ``cycle`` record says which of
+the two it is about to be, at the cost of one more fsync per cycle.
+
+The log is the source of truth. ``history.sqlite3`` indexes it by batch and
+by directory so undo and history stay fast after millions of renames; it is
+caught up from the log on open, so it never needs its own fsync.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.rename_plan import RenamePlan, lookup, scan_directories
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE = "renames.log"
+INDEX_FILE = "history.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS batches (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    kind TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    reverts TEXT,
+    status TEXT NOT NULL,
+    renamed INTEGER NOT NULL DEFAULT 0,
+    plan TEXT
+);
+CREATE TABLE IF NOT EXISTS operations (
+    batch_seq INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    source_dir TEXT NOT NULL,
+    target_dir TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS operations_batch ON operations (batch_seq, position);
+CREATE INDEX IF NOT EXISTS operations_source_dir ON operations (source_dir, batch_seq);
+CREATE INDEX IF NOT EXISTS operations_target_dir ON operations (target_dir, batch_seq);
+CREATE INDEX IF NOT EXISTS batches_kind ON batches (kind, status, seq);
+"""
+
+# A chain step as journaled: [op index, source, target, completes the op]
+Step = Tuple[int, str, str, bool]
+
+
+def _chain_progress(chain: List[Step], listings: Dict[str, Any], cycles: Dict[str, int]) -> int:
+    """How many leading steps of a chain were applied, judged from the disk.
+
+    Step i+1 renames onto step i's source, so while it has not run, step i's
+    source is missing exactly when step i was applied. Walking back from the
+    end, the first step whose source is gone marks the applied prefix. A
+    cycle whose temporary file is absent is either untouched or finished;
+    its last ``cycle`` record (keyed by the temporary path) says which.
+    """
+    if not chain[0][3] and lookup(listings, chain[0][2]) is None:
+        return cycles.get(chain[0][2], 0)
+    for position in range(len(chain) - 1, -1, -1):
+        _, source, target, _ = chain[position]
+        if lookup(listings, source) is None and lookup(listings, target) is not None:
+            return position + 1
+    return 0
+
+
+def _move(source: str, target: str) -> Optional[str]:
+    """Rename without clobbering; returns an error message on failure."""
+    if os.path.lexists(target):
+        return f"'{target}' already exists"
+    try:
+        os.rename(source, target)
+        return None
+    except OSError as e:
+        return str(e)
+
+
+class RenameJournal:
+    """Journal and history index stored in one directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, LOG_FILE)
+        self._log = open(self._log_path, "ab")
+        self._db = sqlite3.connect(
+            os.path.join(directory, INDEX_FILE), check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._catch_up()
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
+            self._db.close()
+
+    # Log
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records with one write and one fsync, then index them."""
+        data = b"".join(json.dumps(r, separators=(",", ":")).encode() + b"\n" for r in records)
+        with self._lock:
+            self._log.write(data)
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            offset = self._log.tell()
+            self._db.execute("BEGIN")
+            try:
+                for record in records:
+                    self._index(record)
+                self._set_offset(offset)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _catch_up(self) -> None:
+        """Index records appended after the index was last written.
+
+        Also drops a torn final line left by a crash during an append.
+        """
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'log_offset'").fetchone()
+        offset = int(row[0]) if row else 0
+        size = os.path.getsize(self._log_path)
+        if offset > size:
+            logger.warning("Rename history index is ahead of the journal; rebuilding it")
+            self._db.executescript("DELETE FROM operations; DELETE FROM batches; DELETE FROM meta;")
+            offset = 0
+        if offset == size:
+            return
+
+        with open(self._log_path, "rb") as f:
+            f.seek(offset)
+            tail = f.read()
+        self._db.execute("BEGIN")
+        good = offset
+        for line in tail.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            self._index(record)
+            good += len(line)
+        self._set_offset(good)
+        self._db.execute("COMMIT")
+        if good < size:
+            logger.warning(f"Discarding {size - good} bytes of a torn journal record")
+            self._log.truncate(good)
+
+    def _set_offset(self, offset: int) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('log_offset', ?)", (str(offset),)
+        )
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        kind = record["type"]
+        if kind == "begin":
+            self._db.execute(
+                "INSERT INTO batches (id, created_at, kind, mode, reverts, status, plan)"
+                " VALUES (?, ?, ?, ?, ?, 'pending', ?)",
+                (
+                    record["batch"], record["at"], record["kind"], record["mode"],
+                    record.get("reverts"),
+                    json.dumps({"ops": record["ops"], "chains": record["chains"]}),
+                ),
+            )
+            return
+
+        row = self._db.execute(
+            "SELECT seq, kind, reverts, plan FROM batches WHERE id = ?", (record["batch"],)
+        ).fetchone()
+        if row is None:
+            logger.warning(f"Journal outcome for unknown batch {record['batch']}")
+            return
+        seq, batch_kind, reverts, plan = row
+        if kind == "cycle":
+            if plan is not None:
+                state = json.loads(plan)
+                state.setdefault("cycles", {})[record["temp"]] = record["applied"]
+                self._db.execute(
+                    "UPDATE batches SET plan = ? WHERE seq = ?", (json.dumps(state), seq)
+                )
+            return
+        if kind == "rollback":
+            self._db.execute(
+                "UPDATE batches SET status = 'rolled_back', finished_at = ?, plan = NULL"
+                " WHERE seq = ?",
+                (record["at"], seq),
+            )
+            return
+
+        renamed = set(record["renamed"])
+        ops = json.loads(plan)["ops"] if plan else []
+        self._db.executemany(
+            "INSERT INTO operations (batch_seq, position, source, target, source_dir, target_dir)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (seq, index, source, target, os.path.dirname(source), os.path.dirname(target))
+                for index, source, target in ops
+                if index in renamed
+            ),
+        )
+        self._db.execute(
+            "UPDATE batches SET status = 'committed', finished_at = ?, renamed = ?, plan = NULL"
+            " WHERE seq = ?",
+            (record["at"], len(renamed), seq),
+        )
+        if reverts and renamed:
+            # An undo marks the batch it reverted; a redo marks the undo it reverted
+            status = "undone" if batch_kind == "undo" else "redone"
+            self._db.execute("UPDATE batches SET status = ? WHERE id = ?", (status, reverts))
+
+    # Batches
+
+    def begin(
+        self, plan: RenamePlan, mode: str, kind: str = "rename", reverts: Optional[str] = None
+    ) -> str:
+        """Make a batch's plan durable before any of it runs; returns its id."""
+        batch_id = uuid.uuid4().hex
+        self._append(
+            [
+                {
+                    "type": "begin",
+                    "batch": batch_id,
+                    "at": time.time(),
+                    "kind": kind,
+                    "mode": mode,
+                    "reverts": reverts,
+                    "ops": [
+                        [op.index, op.source, op.target]
+                        for op in plan.ops
+                        if op.action == "rename"
+                    ],
+                    "chains": [
+                        [[s.index, s.source, s.target, s.final] for s in chain]
+                        for chain in plan.chains
+                    ],
+                }
+            ]
+        )
+        return batch_id
+
+    def commit(self, batch_id: str, renamed: List[int]) -> None:
+        """Record which ops of a batch ended up renamed."""
+        self._append([{"type": "commit", "batch": batch_id, "at": time.time(), "renamed": renamed}])
+
+    def rollback(self, batch_id: str) -> None:
+        """Record that a batch left the disk as it found it."""
+        self._append([{"type": "rollback", "batch": batch_id, "at": time.time()}])
+
+    def mark_cycle(self, batch_id: str, temp: str, applied: int) -> None:
+        """Record, before the rename that removes a cycle's temporary file,
+        how many of the cycle's steps will then be applied (all of them, or
+        none when it is being rolled back)."""
+        self._append(
+            [
+                {
+                    "type": "cycle", "batch": batch_id, "at": time.time(),
+                    "temp": temp, "applied": applied,
+                }
+            ]
+        )
+
+    def record(self, source: str, target: str) -> str:
+        """Journal a rename that has already happened, as a one-file batch."""
+        batch_id = uuid.uuid4().hex
+        now = time.time()
+        self._append(
+            [
+                {
+                    "type": "begin", "batch": batch_id, "at": now, "kind": "rename",
+                    "mode": "best_effort", "reverts": None,
+                    "ops": [[0, source, target]], "chains": [[[0, source, target, True]]],
+                },
+                {"type": "commit", "batch": batch_id, "at": now, "renamed": [0]},
+            ]
+        )
+        return batch_id
+
+    # Recovery
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """Settle batches interrupted by a crash; returns what was done to each."""
+        with self._lock:
+            pending = self._db.execute(
+                "SELECT id, mode, plan FROM batches WHERE status = 'pending' ORDER BY seq"
+            ).fetchall()
+
+        outcomes = []
+        for batch_id, mode, plan in pending:
+            state = json.loads(plan)
+            chains: List[List[Step]] = state["chains"]
+            listings = scan_directories(
+                {os.path.dirname(path) for chain in chains for step in chain for path in step[1:3]}
+            )
+            cycles = state.get("cycles", {})
+            progress = [_chain_progress(chain, listings, cycles) for chain in chains]
+            errors = []
+            renamed: List[int] = []
+            for chain, applied in zip(chains, progress):
+                if mode == "best_effort":
+                    for position in range(applied, len(chain)):
+                        _, source, target, _ = chain[position]
+                        if not chain[0][3] and position == len(chain) - 1:
+                            self.mark_cycle(batch_id, source, len(chain))
+                        error = _move(source, target)
+                        if error is not None:
+                            errors.append(error)
+                            break
+                        applied += 1
+                    if applied == len(chain) or chain[0][3]:
+                        renamed.extend(step[0] for step in chain[:applied] if step[3])
+                        continue
+                # Roll back: all_or_nothing, or a cycle that cannot be finished
+                for position in range(applied - 1, -1, -1):
+                    _, source, target, final = chain[position]
+                    if not final:
+                        self.mark_cycle(batch_id, target, 0)
+                    error = _move(target, source)
+                    if error is not None:
+                        errors.append(f"rollback: {error}")
+                        renamed.extend(s[0] for s in chain[: position + 1] if s[3])
+                        break
+
+            if renamed:
+                self.commit(batch_id, sorted(renamed))
+            else:
+                self.rollback(batch_id)
+            action = "completed" if mode == "best_effort" else "rolled_back"
+            logger.warning(
+                f"Recovered interrupted rename batch {batch_id}: {action},"
+                f" {len(renamed)} renamed, {len(errors)} errors"
+            )
+            outcomes.append(
+                {"batch_id": batch_id, "action": action, "renamed": len(renamed), "errors": errors}
+            )
+        return outcomes
+
+    # History
+
+    def _batch(self, row: Tuple, operations: List[Tuple]) -> Dict[str, Any]:
+        seq, batch_id, created_at, finished_at, kind, mode, reverts, status, renamed = row
+        return {
+            "batch_id": batch_id,
+            "created_at": created_at,
+            "finished_at": finished_at,
+            "kind": kind,
+            "mode": mode,
+            "reverts": reverts,
+            "status": status,
+            "renamed": renamed,
+            "operations": [{"original_path": s, "new_path": t} for s, t in operations],
+        }
+
+    _BATCH_COLUMNS = "seq, id, created_at, finished_at, kind, mode, reverts, status, renamed"
+
+    def history(
+        self, directory: Optional[str] = None, limit: int = 50, before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Newest batches first; with ``directory``, only those touching it and
+        only their operations in it. ``before`` pages from a batch id."""
+        with self._lock:
+            max_seq = 2 ** 62
+            if before is not None:
+                row = self._db.execute("SELECT seq FROM batches WHERE id = ?", (before,)).fetchone()
+                if row is not None:
+                    max_seq = row[0]
+            if directory is None:
+                rows = self._db.execute(
+                    f"SELECT {self._BATCH_COLUMNS} FROM batches"
+                    " WHERE seq < ? AND status != 'pending' ORDER BY seq DESC LIMIT ?",
+                    (max_seq, limit),
+                ).fetchall()
+            else:
+                directory = os.path.normpath(directory)
+                rows = self._db.execute(
+                    f"SELECT {self._BATCH_COLUMNS} FROM batches WHERE seq IN ("
+                    " SELECT batch_seq FROM operations WHERE source_dir = ? AND batch_seq < ?"
+                    " UNION SELECT batch_seq FROM operations WHERE target_dir = ? AND batch_seq < ?"
+                    ") ORDER BY seq DESC LIMIT ?",
+                    (directory, max_seq, directory, max_seq, limit),
+                ).fetchall()
+
+            batches = []
+            for row in rows:
+                query = "SELECT source, target FROM operations WHERE batch_seq = ?"
+                params: Tuple = (row[0],)
+                if directory is not None:
+                    query += " AND (source_dir = ? OR target_dir = ?)"
+                    params += (directory, directory)
+                operations = self._db.execute(query + " ORDER BY position", params).fetchall()
+                batches.append(self._batch(row, operations))
+            return batches
+
+    def renamed_under(self, root: str, since: float) -> Set[str]:
+        """New paths below ``root`` of renames committed since ``since`` and not undone."""
+        prefix = os.path.join(os.path.normpath(root), "")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT o.target FROM operations o JOIN batches b ON b.seq = o.batch_seq"
+                " WHERE b.kind IN ('rename', 'redo') AND b.status = 'committed'"
+                " AND b.created_at >= ? AND substr(o.target, 1, ?) = ?",
+                (since, len(prefix), prefix),
+            ).fetchall()
+        return {target for (target,) in rows}
+
+    def undo_candidate(self) -> Optional[str]:
+        """Newest batch that can still be undone."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM batches WHERE kind IN ('rename', 'redo')"
+                " AND status = 'committed' AND renamed > 0 ORDER BY seq DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def redo_candidate(self) -> Optional[str]:
+        """Newest undo, unless a new rename has happened since."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, seq FROM batches WHERE kind = 'undo' AND status = 'committed'"
+                " ORDER BY seq DESC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            newer = self._db.execute(
+                "SELECT 1 FROM batches WHERE kind = 'rename' AND seq > ?"
+                " AND status IN ('committed', 'undone') AND renamed > 0 LIMIT 1",
+                (row[1],),
+            ).fetchone()
+        return None if newer else row[0]
+
+    def inverse_items(self, batch_id: str) -> List[Dict[str, str]]:
+        """Items that put every file of a batch back where it came from."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT o.source, o.target FROM operations o JOIN batches b ON b.seq = o.batch_seq"
+                " WHERE b.id = ? ORDER BY o.position",
+                (batch_id,),
+            ).fetchall()
+        return [{"original_path": target, "target_path": source} for source, target in rows]
+
+
+_journal: Optional[RenameJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_rename_journal(directory: str) -> RenameJournal:
+    """Shared journal, opened on first use."""
+    global _journal
+    with _journal_lock:
+        if _journal is not None and _journal.directory != directory:
+            _journal.close()
+            _journal = None
+        if _journal is None:
+            _journal = RenameJournal(directory)
+    return _journal
+
+
+def close_rename_journal() -> None:
+    global _journal
+    with _journal_lock:
+        if _journal is not None:
+            _journal.close()
+            _journal = None
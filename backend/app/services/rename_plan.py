@@ -0,0 +1,312 @@
+"""Compile a batch of renames into an executable, conflict-free plan.
+
+Everything is done in a few linear passes over the batch:
+
+* duplicate sources and duplicate targets are rejected;
+* the file system is read with one ``scandir`` per directory involved,
+  never a ``stat`` per file, to check sources exist and targets are free.
+  Only a target whose name matches an existing entry except for case is
+  checked with ``lexists``, since on case-insensitive volumes (APFS, HFS+,
+  SMB shares) that entry is the same file;
+* a target occupied by another file being renamed away is not a conflict but
+  an ordering constraint. Because targets are unique, every rename waits on
+  at most one other, so the constraints form disjoint chains and cycles.
+  Chains run in order from the end whose target is free; a cycle (a→b, b→a)
+  is broken by first moving one file to a temporary name in its directory.
+
+Chains are independent of each other and can be executed concurrently.
+"""
+
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.file_service import FileService
+
+# Listing of one directory: normcased name -> (actual name, is a regular file)
+Listing = Dict[str, Tuple[str, bool]]
+
+
+@dataclass
+class RenameOp:
+    """One requested rename and what the compiler decided about it."""
+
+    index: int
+    source: str
+    target: str
+    action: str = "rename"  # "rename", "noop" or "error"
+    error: Optional[str] = None
+    message: Optional[str] = None
+    via_temp: bool = False
+
+    def fail(self, error: str, message: str) -> None:
+        self.action = "error"
+        self.error = error
+        self.message = message
+
+
+@dataclass
+class RenameStep:
+    """A single ``os.rename`` call; ``final`` steps complete their op."""
+
+    index: int
+    source: str
+    target: str
+    final: bool = True
+
+
+@dataclass
+class RenamePlan:
+    ops: List[RenameOp]
+    chains: List[List[RenameStep]] = field(default_factory=list)
+    directories_scanned: int = 0
+
+    @property
+    def errors(self) -> List[RenameOp]:
+        return [op for op in self.ops if op.action == "error"]
+
+    def diff(self) -> Dict[str, Any]:
+        """Dry-run view of the plan: one entry per requested rename plus totals."""
+        counts = {"rename": 0, "noop": 0, "error": 0}
+        entries = []
+        for op in self.ops:
+            counts[op.action] += 1
+            entries.append(
+                {
+                    "index": op.index,
+                    "original_path": op.source,
+                    "new_path": op.target,
+                    "action": op.action,
+                    "via_temp": op.via_temp,
+                    "error": op.error,
+                    "message": op.message,
+                }
+            )
+        return {
+            "renames": counts["rename"],
+            "noops": counts["noop"],
+            "errors": counts["error"],
+            "chains": len(self.chains),
+            "cycles": sum(1 for chain in self.chains if not chain[0].final),
+            "directories_scanned": self.directories_scanned,
+            "entries": entries,
+        }
+
+    def verify(self, indices: Iterable[int]) -> List[int]:
+        """Check completed ops against the disk; returns indices that do not match.
+
+        One ``scandir`` per directory: each target must exist, and each source
+        must be gone unless another op renamed a file onto it.
+        """
+        ops = [self.ops[i] for i in indices]
+        listings = scan_directories(
+            {os.path.dirname(op.target) for op in ops} | {os.path.dirname(op.source) for op in ops}
+        )
+        targets = {_key(op.target) for op in self.ops if op.action == "rename"}
+        mismatched = []
+        for op in ops:
+            target_present = lookup(listings, op.target) is not None
+            source_cleared = (
+                _key(op.source) in targets
+                or _key(op.source) == _key(op.target)
+                or lookup(listings, op.source) is None
+            )
+            if not (target_present and source_cleared):
+                mismatched.append(op.index)
+        return mismatched
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(path)
+
+
+def scan_directories(directories: Iterable[str]) -> Dict[str, Optional[Listing]]:
+    """List each directory once; a missing or unreadable directory maps to None."""
+    listings: Dict[str, Optional[Listing]] = {}
+    for directory in directories:
+        key = _key(directory)
+        if key in listings:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                listings[key] = {
+                    _key(entry.name): (entry.name, entry.is_file()) for entry in entries
+                }
+        except OSError:
+            listings[key] = None
+    return listings
+
+
+def lookup(listings: Dict[str, Optional[Listing]], path: str) -> Optional[Tuple[str, bool]]:
+    """Entry for ``path`` in listings from scan_directories, or None."""
+    listing = listings.get(_key(os.path.dirname(path)))
+    if listing is None:
+        return None
+    return listing.get(_key(os.path.basename(path)))
+
+
+def _temp_path(source: str, listings: Dict[str, Optional[Listing]]) -> str:
+    directory, name = os.path.split(source)
+    listing = listings.get(_key(directory)) or {}
+    while True:
+        candidate = f".{name}.{uuid.uuid4().hex[:8]}.renaming"
+        if _key(candidate) not in listing:
+            return os.path.join(directory, candidate)
+
+
+def _case_conflict(
+    op: RenameOp,
+    listings: Dict[str, Optional[Listing]],
+    folded: Dict[str, Dict[str, List[str]]],
+) -> Optional[str]:
+    """Existing name differing from the target only by case, if the file
+    system treats the two as one file; ``folded`` caches casefolded listings."""
+    directory, name = os.path.split(op.target)
+    key = _key(directory)
+    variants = folded.get(key)
+    if variants is None:
+        variants = folded[key] = {}
+        for actual, _ in (listings.get(key) or {}).values():
+            variants.setdefault(actual.casefold(), []).append(actual)
+    own = os.path.basename(op.source) if _key(os.path.dirname(op.source)) == key else None
+    for variant in variants.get(name.casefold(), ()):
+        if variant != name and variant != own:
+            return variant if os.path.lexists(op.target) else None
+    return None
+
+
+def compile_plan(items: List[Dict[str, str]]) -> RenamePlan:
+    """Compile ``[{original_path, new_name}]`` (or ``target_path``) into a plan."""
+    ops: List[RenameOp] = []
+    sources: Dict[str, RenameOp] = {}
+    targets: Dict[str, RenameOp] = {}
+    folded_targets: Set[str] = set()
+
+    # Pass 1: names, duplicate sources and duplicate targets
+    for index, item in enumerate(items):
+        source = os.path.normpath(item["original_path"])
+        if item.get("target_path"):
+            target = os.path.normpath(item["target_path"])
+            name = os.path.basename(target)
+        else:
+            name = item["new_name"]
+            target = os.path.join(os.path.dirname(source), name)
+        op = RenameOp(index, source, target)
+        ops.append(op)
+
+        validation = FileService.validate_filename(name)
+        if not validation["valid"]:
+            op.fail("INVALID_FILENAME", f"Invalid filename: {validation['message']}")
+            continue
+        if _key(source) in sources:
+            op.fail("DUPLICATE_SOURCE", f"'{source}' appears more than once in this batch")
+            continue
+        # Names differing only by case would collide on a case-insensitive volume
+        if _key(target) in targets or target.casefold() in folded_targets:
+            op.fail(
+                "DUPLICATE_TARGET",
+                f"Another file in this batch is also being renamed to '{name}'",
+            )
+            continue
+        sources[_key(source)] = op
+        targets[_key(target)] = op
+        folded_targets.add(target.casefold())
+        if source == target:
+            op.action = "noop"
+            op.message = "Name is unchanged"
+
+    # Pass 2: one scandir per directory; sources must exist as files
+    live = [op for op in ops if op.action != "error"]
+    listings = scan_directories(
+        {os.path.dirname(op.source) for op in live} | {os.path.dirname(op.target) for op in live}
+    )
+    for op in live:
+        found = lookup(listings, op.source)
+        if found is None:
+            op.fail("FILE_NOT_FOUND", f"File not found: {op.source}")
+        elif not found[1]:
+            op.fail("NOT_A_FILE", f"Path is not a file: {op.source}")
+        elif listings.get(_key(os.path.dirname(op.target))) is None:
+            op.fail("DIRECTORY_NOT_FOUND", f"Directory not found: {os.path.dirname(op.target)}")
+
+    # Pass 3: occupied targets. A target held by a file that is itself being
+    # renamed is fine; otherwise the op fails, and so does any op waiting on it.
+    movers = {_key(op.source): op for op in ops if op.action == "rename"}
+    waiting_on: Dict[str, RenameOp] = {}  # source key -> op whose target it is
+    for op in ops:
+        if op.action == "rename" and _key(op.target) != _key(op.source):
+            waiting_on[_key(op.target)] = op
+
+    failed = [op for op in ops if op.action == "error"]
+    folded: Dict[str, Dict[str, List[str]]] = {}
+    for op in ops:
+        if op.action != "rename" or _key(op.target) == _key(op.source):
+            continue  # case-only renames replace their own directory entry
+        if _key(op.target) in movers:
+            continue
+        if lookup(listings, op.target) is not None:
+            op.fail(
+                "FILE_EXISTS",
+                f"A file with the name '{os.path.basename(op.target)}' already exists in the same directory",
+            )
+            failed.append(op)
+            continue
+        variant = _case_conflict(op, listings, folded)
+        if variant is not None:
+            op.fail(
+                "FILE_EXISTS",
+                f"'{variant}' already exists in the same directory, and this file system"
+                " does not tell names apart by case",
+            )
+            failed.append(op)
+    while failed:
+        blocker = failed.pop()
+        if sources.get(_key(blocker.source)) is not blocker:
+            continue  # rejected duplicate; the op that owns this source decides
+        dependent = waiting_on.pop(_key(blocker.source), None)
+        if dependent is not None and dependent.action == "rename":
+            dependent.fail(
+                "TARGET_BLOCKED",
+                f"'{os.path.basename(dependent.target)}' is held by a file that cannot be renamed",
+            )
+            failed.append(dependent)
+
+    # Pass 4: order into chains and break cycles with a temporary name
+    movers = {_key(op.source): op for op in ops if op.action == "rename"}
+    by_target = {_key(op.target): op for op in movers.values()}
+    plan = RenamePlan(ops, directories_scanned=len(listings))
+    done: Set[int] = set()
+
+    def blocker_of(op: RenameOp) -> Optional[RenameOp]:
+        if _key(op.target) == _key(op.source):
+            return None
+        return movers.get(_key(op.target))
+
+    def follow(start: RenameOp, stop: Optional[RenameOp] = None) -> List[RenameStep]:
+        steps = []
+        op: Optional[RenameOp] = start
+        while op is not None and op is not stop and op.index not in done:
+            done.add(op.index)
+            steps.append(RenameStep(op.index, op.source, op.target))
+            dependent = by_target.get(_key(op.source))
+            op = dependent if dependent is not None and dependent is not op else None
+        return steps
+
+    for op in movers.values():
+        if blocker_of(op) is None and op.index not in done:
+            plan.chains.append(follow(op))
+
+    for op in movers.values():
+        if op.index in done:
+            continue
+        # Every remaining op is on a cycle: park op's file, run the cycle, unpark
+        temp = _temp_path(op.source, listings)
+        op.via_temp = True
+        done.add(op.index)
+        chain = [RenameStep(op.index, op.source, temp, final=False)]
+        chain.extend(follow(by_target[_key(op.source)], stop=op))
+        chain.append(RenameStep(op.index, temp, op.target))
+        plan.chains.append(chain)
+
+    return plan
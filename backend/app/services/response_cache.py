@@ -0,0 +1,219 @@
+"""Cache of final encoded JSON response bodies.
+
+A hit returns stored bytes as a raw Response, skipping both the TMDBService
+shaping loops and FastAPI's encoder. While a response is computed, every
+upstream cache key it touches is collected; the entry expires no later than
+the earliest of those upstream entries and is dropped as soon as any of them
+is invalidated.
+"""
+
+import hashlib
+import json
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+from app.services.compression import identity_etag
+from app.services.memory import register_cache
+
+logger = logging.getLogger(__name__)
+
+_dependencies: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "response_dependencies", default=None
+)
+_response_caches: "weakref.WeakSet[ResponseCache]" = weakref.WeakSet()
+
+
+def encode_json(data: Any) -> bytes:
+    """Serialize with orjson when installed, otherwise compact stdlib JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+@contextmanager
+def collect_dependencies() -> Iterator[Dict[str, float]]:
+    """Collect upstream cache keys (and their expiry) used inside the block."""
+    collected: Dict[str, float] = {}
+    token = _dependencies.set(collected)
+    try:
+        yield collected
+    finally:
+        _dependencies.reset(token)
+
+
+def record_dependency(upstream_key: str, expires_at: Optional[float]) -> None:
+    """Note that the response being computed depends on an upstream entry."""
+    collected = _dependencies.get()
+    if collected is not None and expires_at is not None:
+        previous = collected.get(upstream_key)
+        collected[upstream_key] = expires_at if previous is None else min(previous, expires_at)
+
+
+def invalidate_dependents(upstream_key: str) -> None:
+    """Drop every cached response built from ``upstream_key``."""
+    for cache in list(_response_caches):
+        cache.invalidate_upstream(upstream_key)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the encoded body."""
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag`` (RFC 9110).
+
+    The per-encoding tags set by the compression middleware match the body
+    they were derived from, so a client holding the gzip copy still gets a
+    304 for a HEAD or an identity response.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = identity_etag(etag.removeprefix("W/"))
+    return any(
+        identity_etag(candidate.strip().removeprefix("W/")) == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class CachedResponse:
+    """Encoded body plus the bookkeeping needed to expire and validate it."""
+
+    __slots__ = ("body", "etag", "expires_at", "dependencies", "variants", "__weakref__")
+
+    def __init__(self, body: bytes, expires_at: float, dependencies: Set[str]):
+        self.body = body
+        self.etag = make_etag(body)
+        self.expires_at = expires_at
+        self.dependencies = dependencies
+        # Compressed copies of body by content coding, filled on first use
+        self.variants: Dict[str, bytes] = {}
+
+
+class ResponseCache:
+    """LRU cache of encoded response bodies keyed by (route, params, API key)."""
+
+    def __init__(self, ttl_minutes: float = 60, max_size: int = 1000):
+        self.ttl = ttl_minutes * 60
+        self.max_size = max_size
+        self.cache: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._dependents: Dict[str, Set[str]] = {}
+        self._by_etag: "weakref.WeakValueDictionary[str, CachedResponse]" = (
+            weakref.WeakValueDictionary()
+        )
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        _response_caches.add(self)
+        register_cache("encoded_responses", self)
+
+    @staticmethod
+    def make_key(route: str, params: Dict[str, Any], api_key: Optional[str]) -> str:
+        """Key on route, params and a digest of the API key that fetched the data."""
+        key_id = hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+        param_str = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.md5(f"{key_id}:{param_str}".encode()).hexdigest()
+        return f"{route}:{digest}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.time() >= entry.expires_at:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(
+        self, key: str, body: bytes, dependencies: Optional[Dict[str, float]] = None
+    ) -> CachedResponse:
+        dependencies = dependencies or {}
+        expires_at = min([time.time() + self.ttl, *dependencies.values()])
+        if key in self.cache:
+            self._remove(key)
+        entry = CachedResponse(body, expires_at, set(dependencies))
+        self.cache[key] = entry
+        self._by_etag[entry.etag] = entry
+        for upstream_key in entry.dependencies:
+            self._dependents.setdefault(upstream_key, set()).add(key)
+
+        while len(self.cache) > self.max_size:
+            self._remove(next(iter(self.cache)))
+            self.evictions += 1
+        return entry
+
+    def _remove(self, key: str) -> None:
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return
+        for upstream_key in entry.dependencies:
+            dependents = self._dependents.get(upstream_key)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[upstream_key]
+
+    def invalidate_upstream(self, upstream_key: str) -> None:
+        for key in list(self._dependents.get(upstream_key, ())):
+            self._remove(key)
+            self.invalidations += 1
+
+    def get_variant(self, etag: str, encoding: str) -> Optional[bytes]:
+        """Precompressed body for a live entry with this ETag, if already built."""
+        entry = self._by_etag.get(etag)
+        return entry.variants.get(encoding) if entry is not None else None
+
+    def add_variant(self, etag: str, encoding: str, body: bytes) -> None:
+        entry = self._by_etag.get(etag)
+        if entry is not None:
+            entry.variants[encoding] = body
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self._dependents.clear()
+
+    def entries(self) -> List[Tuple[str, List[bytes]]]:
+        """Snapshot of (key, [body, *variants]) pairs for memory accounting."""
+        return [
+            (key, [entry.body, *entry.variants.values()])
+            for key, entry in list(self.cache.items())
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "cache_size": len(self.cache),
+            "max_size": self.max_size,
+            "bytes": sum(len(entry.body) for entry in self.cache.values()),
+            "compressed_bytes": sum(
+                len(variant)
+                for entry in self.cache.values()
+                for variant in entry.variants.values()
+            ),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(self.hits / total * 100, 2) if total else 0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "tracked_upstream_keys": len(self._dependents),
+        }
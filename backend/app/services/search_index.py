@@ -0,0 +1,100 @@
+"""In-memory title index over results already seen from TMDB.
+
+Every search and discover page the service formats is added here, so
+search-as-you-type can answer from memory while the TMDB request is still in
+flight. Matching is word-prefix based: every query word must prefix some word
+of the title ("dark kni" matches "The Dark Knight").
+"""
+
+import bisect
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+_WORD = re.compile(r"\w+")
+
+EntityKey = Tuple[str, int]
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class SearchIndex:
+    """Word-prefix index of search results, bounded to ``max_entries``."""
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries = max_entries
+        self.entities: "OrderedDict[EntityKey, Dict[str, Any]]" = OrderedDict()
+        self._postings: Dict[str, Set[EntityKey]] = {}
+        self._words: List[str] = []  # sorted keys of _postings for prefix scans
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def add(self, results: Iterable[Dict[str, Any]]) -> None:
+        for result in results:
+            label = result.get("title") or result.get("name")
+            if not label or "id" not in result or "media_type" not in result:
+                continue
+            key = (result["media_type"], result["id"])
+            if key in self.entities:
+                self.entities.move_to_end(key)
+                self.entities[key] = result
+                continue
+            self.entities[key] = result
+            for word in set(tokenize(label)):
+                postings = self._postings.get(word)
+                if postings is None:
+                    postings = self._postings[word] = set()
+                    bisect.insort(self._words, word)
+                postings.add(key)
+
+        while len(self.entities) > self.max_entries:
+            self._evict(next(iter(self.entities)))
+
+    def _evict(self, key: EntityKey) -> None:
+        result = self.entities.pop(key)
+        for word in set(tokenize(result.get("title") or result.get("name") or "")):
+            postings = self._postings.get(word)
+            if postings is None:
+                continue
+            postings.discard(key)
+            if not postings:
+                del self._postings[word]
+                del self._words[bisect.bisect_left(self._words, word)]
+
+    def _prefix_matches(self, prefix: str) -> Set[EntityKey]:
+        matches: Set[EntityKey] = set()
+        start = bisect.bisect_left(self._words, prefix)
+        for word in self._words[start:]:
+            if not word.startswith(prefix):
+                break
+            matches |= self._postings[word]
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Results whose title contains every query word as a word prefix."""
+        words = tokenize(query)
+        if not words:
+            return []
+        # Rarest-looking (longest) word first keeps the intersection small
+        words.sort(key=len, reverse=True)
+        keys = self._prefix_matches(words[0])
+        for word in words[1:]:
+            if not keys:
+                break
+            keys &= self._prefix_matches(word)
+
+        results = [self.entities[key] for key in keys]
+        results.sort(
+            key=lambda r: (
+                (r.get("title") or r.get("name") or "").lower() != query.strip().lower(),
+                -(r.get("popularity") or r.get("vote_count") or 0),
+            )
+        )
+        return results[:limit]
+
+
+# Shared by every TMDBService; catalog data is the same whichever key fetched it
+search_index = SearchIndex()
@@ -0,0 +1,87 @@
+"""Search-as-you-type sessions.
+
+A session runs at most one search at a time. Submitting a new query cancels
+the previous one, and that cancellation reaches the service's pending
+upstream fetch when no other caller is waiting on it. Each search first sends
+local index matches, then TMDB pages as they arrive, then ``done``.
+"""
+
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from app.services.tmdb import TMDBService
+
+logger = logging.getLogger(__name__)
+
+SendJson = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class SearchSession:
+    """One client's stream of queries; each new query supersedes the last."""
+
+    def __init__(self, service: "TMDBService", send: SendJson, local_limit: int = 10):
+        self.service = service
+        self.send = send
+        self.local_limit = local_limit
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.queries = 0
+        self.superseded = 0
+
+    async def submit(
+        self,
+        query_id: Any,
+        query: str,
+        pages: int = 1,
+        limit: Optional[int] = None,
+    ) -> None:
+        """Cancel the running search and start one for ``query``."""
+        await self.cancel()
+        if not query.strip():
+            return
+        self.queries += 1
+        self._task = asyncio.create_task(self._run(query_id, query, pages, limit))
+
+    async def cancel(self) -> None:
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        self.superseded += 1
+        # Let it unwind before anything else is sent; wait() never raises, so
+        # a cancellation aimed at the caller is not swallowed here
+        await asyncio.wait([task])
+
+    async def wait(self) -> None:
+        """Wait for the current search, if any, to finish."""
+        if self._task is not None:
+            await asyncio.wait([self._task])
+
+    async def _run(
+        self, query_id: Any, query: str, pages: int, limit: Optional[int]
+    ) -> None:
+        await self.send(
+            {
+                "type": "local",
+                "id": query_id,
+                "query": query,
+                "results": self.service.search_index.search(query, self.local_limit),
+            }
+        )
+        try:
+            async with aclosing(self.service.iter_search_multi(query, pages, limit)) as stream:
+                async for page, results in stream:
+                    await self.send(
+                        {"type": "results", "id": query_id, "page": page, "results": results}
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Search-as-you-type failed for '{query}': {e}")
+            await self.send({"type": "error", "id": query_id, "detail": str(e)})
+            return
+        await self.send({"type": "done", "id": query_id})
@@ -1,10 +1,25 @@
 import httpx
 import asyncio
+import contextlib
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import math
+import os
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from functools import wraps
 
+from app.services.config import TMDBConfig
+from app.services.episodes import EpisodeMap
+from app.services.filmography import FilmographyFilters, FilmographyIndex
+from app.services.http_pool import get_pool
+from app.services.memory import register_cache
+from app.services.response_cache import invalidate_dependents, record_dependency
+from app.services.search_index import SearchIndex, search_index as shared_search_index
+from app.services.trace import get_recorder
+from app.services.utils import RateLimiter
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,26 +30,103 @@ class TMDBCache:
     def __init__(self, ttl_minutes: int = 60):
         self.cache = {}
         self.ttl = timedelta(minutes=ttl_minutes)
+        self.hit_counts: Dict[str, int] = {}
 
     def get(self, key: str) -> Optional[Any]:
         if key in self.cache:
             data, timestamp = self.cache[key]
             if datetime.now() - timestamp < self.ttl:
                 logger.debug(f"Cache hit for key: {key}")
+                self.hit_counts[key] = self.hit_counts.get(key, 0) + 1
+                record_dependency(key, (timestamp + self.ttl).timestamp())
                 return data
             else:
                 del self.cache[key]
+                self.hit_counts.pop(key, None)
+                invalidate_dependents(key)
                 logger.debug(f"Cache expired for key: {key}")
         return None
 
     def set(self, key: str, value: Any) -> None:
-        self.cache[key] = (value, datetime.now())
+        if key in self.cache:
+            invalidate_dependents(key)
+        timestamp = datetime.now()
+        self.cache[key] = (value, timestamp)
+        record_dependency(key, (timestamp + self.ttl).timestamp())
         logger.debug(f"Cache set for key: {key}")
 
+    def expires_at(self, key: str) -> Optional[float]:
+        """Epoch time at which an entry expires, or None if it is not cached."""
+        if key not in self.cache:
+            return None
+        return (self.cache[key][1] + self.ttl).timestamp()
+
     def clear(self) -> None:
+        for key in list(self.cache):
+            invalidate_dependents(key)
         self.cache.clear()
+        self.hit_counts.clear()
         logger.info("Cache cleared")
 
+    def entries(self) -> List[tuple]:
+        """Snapshot of (key, value) pairs for memory accounting."""
+        return [(key, data) for key, (data, _) in list(self.cache.items())]
+
+    def save_snapshot(self, path: str, max_entries: int = 500) -> int:
+        """Write the most-hit unexpired entries to ``path``; returns the count.
+
+        Only raw upstream payloads are saved. Derived objects cached next to
+        them (episode maps, filmography indexes) are not JSON and are rebuilt
+        from those payloads on demand, so they are skipped.
+        """
+        now = datetime.now()
+        live = [
+            (key, data, timestamp)
+            for key, (data, timestamp) in list(self.cache.items())
+            if now - timestamp < self.ttl
+        ]
+        live.sort(key=lambda entry: (self.hit_counts.get(entry[0], 0), entry[2]), reverse=True)
+        encoded: List[str] = []
+        for key, data, timestamp in live:
+            if len(encoded) == max_entries:
+                break
+            try:
+                encoded.append(
+                    json.dumps({"key": key, "data": data, "cached_at": timestamp.timestamp()})
+                )
+            except (TypeError, ValueError):
+                continue
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("[" + ",".join(encoded) + "]")
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        return len(encoded)
+
+    def load_snapshot(self, path: str) -> int:
+        """Restore entries saved by save_snapshot, keeping their original age."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache snapshot {path}: {e}")
+            return 0
+
+        now = datetime.now()
+        loaded = 0
+        for entry in snapshot:
+            timestamp = datetime.fromtimestamp(entry["cached_at"])
+            if now - timestamp < self.ttl and entry["key"] not in self.cache:
+                self.cache[entry["key"]] = (entry["data"], timestamp)
+                loaded += 1
+        return loaded
+
 
 # Retry decorator
 def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
@@ -76,27 +168,69 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0):
     return decorator
 
 
+DEFAULT_BASE_URL = "https://api.themoviedb.org/3"
+
+
+class _InflightFetch:
+    """An upstream fetch shared by every caller waiting on the same cache key."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
 class TMDBService:
-    def __init__(self, api_key: str):
+    # Totals across every instance, including short-lived per-key services
+    total_coalesced_requests = 0
+    total_cancelled_requests = 0
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        search_index: Optional[SearchIndex] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
         self.api_key = api_key
-        self.base_url = "https://api.themoviedb.org/3"
+        # base_url can point at a local stand-in such as benchmarks.fake_tmdb
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
         self.cache = TMDBCache(ttl_minutes=60)  # Cache for 1 hour
+        register_cache("tmdb_responses", self.cache)
+        # Upstream requests in flight, keyed by cache key, shared by all waiters
+        self._inflight: Dict[str, _InflightFetch] = {}
+        self.coalesced_requests = 0
+        self.cancelled_requests = 0
+        # Titles seen in search/discover pages, for instant local matches
+        self.search_index = search_index or shared_search_index
         self.client_config = {
             "timeout": httpx.Timeout(30.0),  # 30 second timeout
             "limits": httpx.Limits(max_connections=10, max_keepalive_connections=5),
         }
+        if transport is not None:
+            self.client_config["transport"] = transport
+        # Explicit client; otherwise the app-wide pool from http_pool is used
+        self._client = client
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_second=TMDBConfig.requests_per_second,
+            burst_limit=TMDBConfig.burst_limit,
+        )
 
     def _get_cache_key(self, endpoint: str, params: Dict[str, Any]) -> str:
         """Generate a cache key from endpoint and parameters"""
         # Remove api_key from params for cache key
         cache_params = {k: v for k, v in params.items() if k != "api_key"}
-        return f"{endpoint}:{hash(str(sorted(cache_params.items())))}"
+        # A stable digest (not hash()) so keys survive restarts for cache snapshots
+        digest = hashlib.md5(str(sorted(cache_params.items())).encode()).hexdigest()[:16]
+        return f"{endpoint}:{digest}"
 
-    @retry_on_failure(max_retries=3)
     async def _make_request(
         self, endpoint: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Make a request to TMDB API with caching and error handling"""
+        """Make a request to TMDB API with caching and in-flight coalescing"""
         cache_key = self._get_cache_key(endpoint, params)
 
         # Check cache first
@@ -104,28 +238,70 @@ class TMDBService:
         if cached_result is not None:
             return cached_result
 
+        # Join an identical request that is already on the wire
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = _InflightFetch(
+                asyncio.ensure_future(self._fetch(endpoint, params, cache_key))
+            )
+            self._inflight[cache_key] = inflight
+            inflight.task.add_done_callback(
+                lambda _: self._forget_inflight(cache_key, inflight)
+            )
+        else:
+            self.coalesced_requests += 1
+            TMDBService.total_coalesced_requests += 1
+
+        inflight.waiters += 1
+        try:
+            data = await asyncio.shield(inflight.task)
+        finally:
+            inflight.waiters -= 1
+            if inflight.waiters == 0 and not inflight.task.done():
+                # Every caller has gone away, so stop the upstream request too
+                self._forget_inflight(cache_key, inflight)
+                inflight.task.cancel()
+                self.cancelled_requests += 1
+                TMDBService.total_cancelled_requests += 1
+        # The fetch recorded the dependency in the first caller's context only
+        record_dependency(cache_key, self.cache.expires_at(cache_key))
+        return data
+
+    def _forget_inflight(self, cache_key: str, inflight: _InflightFetch) -> None:
+        if self._inflight.get(cache_key) is inflight:
+            del self._inflight[cache_key]
+
+    @retry_on_failure(max_retries=3)
+    async def _fetch(
+        self, endpoint: str, params: Dict[str, Any], cache_key: str
+    ) -> Dict[str, Any]:
+        """Fetch from TMDB API and cache the result, with error handling"""
         # Add API key to params
         request_params = {**params, "api_key": self.api_key}
 
+        await self.rate_limiter.acquire()
+
         start_time = datetime.now()
         logger.info(
             f"Making TMDB API request: {endpoint} with params: {list(params.keys())}"
         )
 
         try:
-            async with httpx.AsyncClient(**self.client_config) as client:
-                response = await client.get(
-                    f"{self.base_url}{endpoint}", params=request_params
+            response = await self._get(f"{self.base_url}{endpoint}", request_params)
+            recorder = get_recorder()
+            if recorder is not None:
+                recorder.record_upstream(
+                    endpoint, params, response.status_code, response.text
                 )
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = response.json()
 
-                duration = (datetime.now() - start_time).total_seconds()
-                logger.info(f"TMDB API request completed in {duration:.2f}s")
+            duration = (datetime.now() - start_time).total_seconds()
+            logger.info(f"TMDB API request completed in {duration:.2f}s")
 
-                # Cache the result
-                self.cache.set(cache_key, data)
-                return data
+            # Cache the result
+            self.cache.set(cache_key, data)
+            return data
 
         except httpx.HTTPStatusError as e:
             duration = (datetime.now() - start_time).total_seconds()
@@ -145,6 +321,16 @@ class TMDBService:
             logger.error(f"TMDB API request error after {duration:.2f}s: {e}")
             raise Exception("Network error: Unable to connect to TMDB API")
 
+    async def _get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET through the shared pool when one is open, else a one-off client"""
+        client = self._client
+        if client is None and "transport" not in self.client_config:
+            client = get_pool()
+        if client is not None:
+            return await client.get(url, params=params)
+        async with httpx.AsyncClient(**self.client_config) as client:
+            return await client.get(url, params=params)
+
     async def test_api_key(self) -> bool:
         """Tests if the API key is valid by making a request to a simple endpoint"""
         try:
@@ -154,47 +340,129 @@ class TMDBService:
             logger.error(f"API key test failed: {e}")
             raise Exception(f"Invalid API key: {str(e)}")
 
-    async def search_multi(self, query: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _format_search_results(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format one /search/multi page according to our API specification"""
+        results = []
+        for item in data.get("results", []):
+            if item["media_type"] not in ["movie", "tv", "person"]:
+                continue
+
+            if item["media_type"] == "person":
+                result = {
+                    "id": item["id"],
+                    "media_type": "person",
+                    "name": item.get("name"),
+                    "known_for_department": item.get("known_for_department"),
+                    "profile_path": item.get("profile_path"),
+                    "popularity": item.get("popularity", 0),
+                }
+                results.append(result)
+            else:
+                result = {
+                    "id": item["id"],
+                    "media_type": item["media_type"],
+                    "title": item.get("title") or item.get("name"),
+                    "year": int(item.get("release_date", "")[:4])
+                    if item.get("release_date")
+                    else None,
+                    "poster_path": item.get("poster_path"),
+                }
+                if not result["year"] and item.get("first_air_date"):
+                    result["year"] = int(item["first_air_date"][:4])
+                results.append(result)
+
+        return results
+
+    async def _iter_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        format_page: Callable[[Dict[str, Any]], List[Dict[str, Any]]],
+        pages: int = 1,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (page, results) as pages arrive, stopping once limit is met
+
+        Page 1 is fetched first to learn total_pages; the remaining pages are
+        fetched concurrently under the rate limiter and yielded in arrival
+        order. With a limit, pages are yielded in page order instead (a page
+        that arrives early waits for the ones before it), so the limit keeps
+        the first results rather than whichever came back first. Each page
+        is its own cache entry, so deeper browsing reuses pages already
+        fetched. Pages beyond what limit needs are never requested.
+        A page that fails ends the iteration with its error rather than being
+        left out, so callers never mistake a partial result for a complete one.
+        """
+        first = await self._make_request(endpoint, params)
+        results = format_page(first)
+        self.search_index.add(results)
+        remaining = limit if limit is not None else None
+        if remaining is not None:
+            results = results[:remaining]
+            remaining -= len(results)
+        yield 1, results
+
+        page_size = len(first.get("results", [])) or 20
+        last_page = min(pages, first.get("total_pages") or 1)
+        if limit is not None:
+            last_page = min(last_page, math.ceil(limit / page_size))
+        if last_page < 2 or remaining == 0:
+            return
+
+        async def fetch(page: int) -> Tuple[int, Dict[str, Any]]:
+            try:
+                return page, await self._make_request(endpoint, {**params, "page": page})
+            except Exception as e:
+                raise Exception(f"Failed to fetch page {page} of {endpoint}: {e}") from e
+
+        pending = {asyncio.ensure_future(fetch(page)) for page in range(2, last_page + 1)}
+        early: Dict[int, List[Dict[str, Any]]] = {}
+        next_page = 2
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page, data = task.result()
+                    results = format_page(data)
+                    self.search_index.add(results)
+                    if remaining is None:
+                        yield page, results
+                        continue
+                    early[page] = results
+                    while next_page in early:
+                        results = early.pop(next_page)[:remaining]
+                        remaining -= len(results)
+                        yield next_page, results
+                        next_page += 1
+                        if remaining == 0:
+                            return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def search_multi(
+        self, query: str, pages: int = 1, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """Search for movies, TV shows, and people with enhanced error handling and caching"""
         try:
-            data = await self._make_request("/search/multi", {"query": query})
-
-            # Format the response according to our API specification
-            results = []
-            for item in data.get("results", []):
-                if item["media_type"] not in ["movie", "tv", "person"]:
-                    continue
-
-                if item["media_type"] == "person":
-                    result = {
-                        "id": item["id"],
-                        "media_type": "person",
-                        "name": item.get("name"),
-                        "known_for_department": item.get("known_for_department"),
-                        "profile_path": item.get("profile_path"),
-                        "popularity": item.get("popularity", 0),
-                    }
-                    results.append(result)
-                else:
-                    result = {
-                        "id": item["id"],
-                        "media_type": item["media_type"],
-                        "title": item.get("title") or item.get("name"),
-                        "year": int(item.get("release_date", "")[:4])
-                        if item.get("release_date")
-                        else None,
-                        "poster_path": item.get("poster_path"),
-                    }
-                    if not result["year"] and item.get("first_air_date"):
-                        result["year"] = int(item["first_air_date"][:4])
-                    results.append(result)
-
-            return results
+            by_page = {}
+            async for page, results in self.iter_search_multi(query, pages, limit):
+                by_page[page] = results
+            return [item for page in sorted(by_page) for item in by_page[page]]
 
         except Exception as e:
             logger.error(f"Search failed for query '{query}': {e}")
             raise Exception(f"Search failed: {str(e)}")
 
+    def iter_search_multi(
+        self, query: str, pages: int = 1, limit: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Stream formatted search pages as they arrive"""
+        return self._iter_pages(
+            "/search/multi", {"query": query}, self._format_search_results, pages, limit
+        )
+
     async def get_tv_seasons(self, tv_id: int) -> List[Dict[str, Any]]:
         """Get TV show seasons with enhanced error handling and caching"""
         try:
@@ -417,8 +685,55 @@ class TMDBService:
             )
             raise Exception(f"Failed to get TV episodes: {str(e)}")
 
-    async def get_person_filmography(self, person_id: int) -> Dict[str, Any]:
+    async def get_episode_map(
+        self, tv_id: int, include_specials: bool = True
+    ) -> EpisodeMap:
+        """Get every episode of a series, fetching all seasons concurrently"""
+        cache_key = self._get_cache_key(
+            f"/tv/{tv_id}/episode_map", {"include_specials": include_specials}
+        )
+        cached_map = self.cache.get(cache_key)
+        if cached_map is not None:
+            return cached_map
+
+        try:
+            data = await self._make_request(f"/tv/{tv_id}", {})
+            season_numbers = [
+                season["season_number"]
+                for season in data.get("seasons", [])
+                if include_specials or season["season_number"] > 0
+            ]
+
+            # The rate limiter in _fetch paces the fan-out
+            payloads = await asyncio.gather(
+                *(
+                    self._make_request(f"/tv/{tv_id}/season/{number}", {})
+                    for number in season_numbers
+                )
+            )
+
+            episode_map = EpisodeMap.from_season_payloads(tv_id, data.get("name"), payloads)
+            self.cache.set(cache_key, episode_map)
+            return episode_map
+
+        except Exception as e:
+            logger.error(f"Failed to get episode map for TV {tv_id}: {e}")
+            raise Exception(f"Failed to get episode map: {str(e)}")
+
+    async def get_person_filmography(
+        self, person_id: int, filters: Optional[FilmographyFilters] = None
+    ) -> Dict[str, Any]:
         """Get a person's filmography including movies and TV shows with enhanced error handling"""
+        index = await self.get_filmography_index(person_id)
+        return index.to_dict(filters)
+
+    async def get_filmography_index(self, person_id: int) -> FilmographyIndex:
+        """Get a person's credits as a presorted index, built once per cache lifetime"""
+        cache_key = self._get_cache_key(f"/person/{person_id}/filmography_index", {})
+        cached_index = self.cache.get(cache_key)
+        if cached_index is not None:
+            return cached_index
+
         try:
             # Get person details and credits concurrently
             person_task = self._make_request(f"/person/{person_id}", {})
@@ -489,12 +804,9 @@ class TMDBService:
 
                     crew_credits.append(item)
 
-            # Sort both by year (newest first), handling None values
-            cast_credits.sort(key=lambda x: x["year"] or 0, reverse=True)
-            crew_credits.sort(key=lambda x: x["year"] or 0, reverse=True)
-
-            return {
-                "person": {
+            # The index sorts both by year (newest first), handling None values
+            index = FilmographyIndex(
+                person={
                     "id": person_data["id"],
                     "name": person_data["name"],
                     "known_for_department": person_data.get("known_for_department"),
@@ -503,9 +815,11 @@ class TMDBService:
                     "birthday": person_data.get("birthday"),
                     "place_of_birth": person_data.get("place_of_birth"),
                 },
-                "cast": cast_credits,
-                "crew": crew_credits,
-            }
+                cast=cast_credits,
+                crew=crew_credits,
+            )
+            self.cache.set(cache_key, index)
+            return index
 
         except Exception as e:
             logger.error(f"Failed to get filmography for person ID {person_id}: {e}")
@@ -521,40 +835,64 @@ class TMDBService:
             logger.error(f"Failed to get genres for {media_type}: {e}")
             raise Exception(f"Failed to get genres: {str(e)}")
 
+    @staticmethod
+    def _format_discover_results(
+        media_type: str, data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Format one /discover page similar to search"""
+        results = []
+        for item in data.get("results", []):
+            result = {
+                "id": item["id"],
+                "media_type": media_type,
+                "title": item.get("title") or item.get("name"),
+                "poster_path": item.get("poster_path"),
+                "vote_average": item.get("vote_average"),
+                "vote_count": item.get("vote_count"),
+            }
+
+            # Add year
+            if media_type == "movie":
+                result["year"] = int(item["release_date"][:4]) if item.get("release_date") else None
+            else:
+                result["year"] = int(item["first_air_date"][:4]) if item.get("first_air_date") else None
+
+            results.append(result)
+
+        return results
+
     async def discover_media(
         self,
         media_type: str,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        pages: int = 1,
+        limit: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Discover movies or TV shows with filters"""
         try:
-            endpoint = f"/discover/{media_type}"
-            params = filters or {}
-
-            data = await self._make_request(endpoint, params)
-
-            # Format results similar to search
-            results = []
-            for item in data.get("results", []):
-                result = {
-                    "id": item["id"],
-                    "media_type": media_type,
-                    "title": item.get("title") or item.get("name"),
-                    "poster_path": item.get("poster_path"),
-                    "vote_average": item.get("vote_average"),
-                    "vote_count": item.get("vote_count"),
-                }
-
-                # Add year
-                if media_type == "movie":
-                    result["year"] = int(item["release_date"][:4]) if item.get("release_date") else None
-                else:
-                    result["year"] = int(item["first_air_date"][:4]) if item.get("first_air_date") else None
-
-                results.append(result)
-
-            return results
+            by_page = {}
+            async for page, results in self.iter_discover_media(
+                media_type, filters, pages, limit
+            ):
+                by_page[page] = results
+            return [item for page in sorted(by_page) for item in by_page[page]]
 
         except Exception as e:
             logger.error(f"Failed to discover {media_type} with filters {filters}: {e}")
             raise Exception(f"Failed to discover {media_type}: {str(e)}")
+
+    def iter_discover_media(
+        self,
+        media_type: str,
+        filters: Optional[Dict[str, Any]] = None,
+        pages: int = 1,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Stream formatted discover pages as they arrive"""
+        return self._iter_pages(
+            f"/discover/{media_type}",
+            filters or {},
+            lambda data: self._format_discover_results(media_type, data),
+            pages,
+            limit,
+        )
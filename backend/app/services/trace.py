@@ -0,0 +1,157 @@
+"""Traffic capture for record-and-replay benchmarking.
+
+When capture is enabled every incoming API request and every upstream TMDB
+response is appended to a JSON Lines trace file. ``benchmarks.replay`` turns
+that trace back into load against a fresh backend and a recorded upstream.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Query parameters and body fields whose values never reach the trace file
+_SECRET_NAME = re.compile(r"api_?key|token|secret|password|auth", re.IGNORECASE)
+REDACTED = "REDACTED"
+
+
+def normalize_route(path: str) -> str:
+    """Collapse numeric path segments so /movie/27205 groups as /movie/{id}."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def upstream_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Stable identity for an upstream request, excluding the API key."""
+    # Compare as query-string text so captured and replayed params match
+    clean_params = {
+        k: str(v).lower() if isinstance(v, bool) else str(v)
+        for k, v in params.items()
+        if k != "api_key"
+    }
+    return f"{endpoint}?{json.dumps(clean_params, sort_keys=True)}"
+
+
+def redact_query(query: str) -> str:
+    """Replace the values of secret-looking parameters, keeping their names."""
+    if not query or not _SECRET_NAME.search(query):
+        return query
+    pairs = parse_qsl(query, keep_blank_values=True)
+    return urlencode([(k, REDACTED if _SECRET_NAME.search(k) else v) for k, v in pairs])
+
+
+def redact_body(body: Any) -> Any:
+    """Copy of a JSON body with secret-looking fields replaced, at any depth."""
+    if isinstance(body, dict):
+        return {
+            k: REDACTED if _SECRET_NAME.search(str(k)) else redact_body(v)
+            for k, v in body.items()
+        }
+    if isinstance(body, list):
+        return [redact_body(item) for item in body]
+    return body
+
+
+class TraceRecorder:
+    """Append-only JSON Lines writer for request and upstream events."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.started = time.monotonic()
+        self.events_written = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        self._write({"kind": "start", "wall_time": time.time()})
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.events_written += 1
+
+    def offset(self) -> float:
+        """Seconds since capture started."""
+        return time.monotonic() - self.started
+
+    def record_request(
+        self,
+        started_at: float,
+        method: str,
+        path: str,
+        query: str,
+        status_code: int,
+        duration_ms: float,
+        body: Optional[Any] = None,
+        has_api_key: bool = False,
+    ) -> None:
+        """Record one incoming API request, timestamped at its arrival.
+
+        Values of secret-looking query parameters and body fields (such as
+        ``api_key`` on /api/validate-key) are replaced with ``REDACTED``.
+        """
+        self._write(
+            {
+                "kind": "request",
+                "t": round(started_at, 6),
+                "method": method,
+                "path": path,
+                "query": redact_query(query),
+                "body": redact_body(body),
+                "has_api_key": has_api_key,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+            }
+        )
+
+    def record_upstream(
+        self, endpoint: str, params: Dict[str, Any], status_code: int, body: str
+    ) -> None:
+        """Record one raw response body received from TMDB."""
+        self._write(
+            {
+                "kind": "upstream",
+                "t": round(self.offset(), 6),
+                "key": upstream_key(endpoint, params),
+                "endpoint": endpoint,
+                "status": status_code,
+                "body": body,
+            }
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        logger.info(f"Trace capture stopped: {self.events_written} events in {self.path}")
+
+
+_recorder: Optional[TraceRecorder] = None
+
+
+def start_recording(path: str) -> TraceRecorder:
+    """Start capturing traffic to ``path``, replacing any active recorder."""
+    global _recorder
+    stop_recording()
+    _recorder = TraceRecorder(path)
+    logger.info(f"Trace capture started: {path}")
+    return _recorder
+
+
+def stop_recording() -> None:
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        _recorder = None
+
+
+def get_recorder() -> Optional[TraceRecorder]:
+    """Return the active recorder, or None when capture is off."""
+    return _recorder
@@ -150,6 +150,15 @@ async def gather_with_limit(
     return await asyncio.gather(*[limited_task(task) for task in tasks])
 
 
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
 def format_duration(seconds: float) -> str:
     """Format duration in human-readable format."""
     if seconds < 1:
@@ -0,0 +1,102 @@
+"""Startup warm-up run from the app lifespan.
+
+Restores the hottest TMDB cache entries from the last snapshot, opens
+keep-alive connections to TMDB and preloads ``/configuration`` and both genre
+lists, so the first interactive request is served like the hundredth. It runs
+in the background: the server answers immediately and ``/api/ready`` reports
+when warm-up has finished. The TMDB client modules are imported here, in a
+worker thread, rather than at app import time.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
+
+from app.services.http_pool import prewarm
+
+if TYPE_CHECKING:
+    from app.services.tmdb import TMDBService
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Progress of the startup warm-up, reported by the readiness endpoint."""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        if self.started_at is not None:
+            self.duration_ms = round((time.monotonic() - self.started_at) * 1000, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "duration_ms": self.duration_ms, "steps": self.steps}
+
+
+async def _step(state: WarmupState, name: str, work: Awaitable[Any]) -> None:
+    start = time.perf_counter()
+    try:
+        result = await work
+        state.steps[name] = {"ok": True, "result": result}
+    except Exception as e:
+        logger.warning(f"Warm-up step {name} failed: {e}")
+        state.steps[name] = {"ok": False, "error": str(e)}
+    state.steps[name]["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _preload(service: "TMDBService") -> Dict[str, int]:
+    configuration, movie_genres, tv_genres = await asyncio.gather(
+        service._make_request("/configuration", {}),
+        service.get_genres("movie"),
+        service.get_genres("tv"),
+    )
+    return {
+        "configuration_keys": len(configuration),
+        "movie_genres": len(movie_genres),
+        "tv_genres": len(tv_genres),
+    }
+
+
+async def _rehydrate(service: "TMDBService", snapshot_file: str) -> int:
+    return service.cache.load_snapshot(snapshot_file)
+
+
+async def warm_up(
+    state: WarmupState,
+    get_service: Callable[[], Optional["TMDBService"]],
+    base_url: str,
+    snapshot_file: Optional[str] = None,
+    prewarm_connections: int = 2,
+    timeout: float = 15.0,
+) -> None:
+    """Run every warm-up step, then mark the state ready even if some failed."""
+    state.started_at = time.monotonic()
+    try:
+        async with asyncio.timeout(timeout):
+            # Deferred from app import; a thread keeps the loop serving meanwhile
+            await asyncio.to_thread(importlib.import_module, "app.services.tmdb")
+            service = get_service()
+            if service is not None and snapshot_file:
+                await _step(state, "rehydrate", _rehydrate(service, snapshot_file))
+
+            steps = [
+                _step(state, "connections", prewarm(f"{base_url}/configuration", prewarm_connections))
+            ]
+            # Without a server key there is nothing to preload; client keys
+            # still benefit from the warm connections
+            if service is not None:
+                steps.append(_step(state, "preload", _preload(service)))
+            await asyncio.gather(*steps)
+    except TimeoutError:
+        logger.warning(f"Warm-up did not finish within {timeout}s")
+        state.steps["timeout"] = {"ok": False, "error": f"exceeded {timeout}s"}
+    finally:
+        state.mark_ready()
+    logger.info(f"Warm-up finished in {state.duration_ms}ms")
@@ -0,0 +1 @@
+"""Load-testing and benchmarking tools for the Media File Renamer backend."""
@@ -0,0 +1,586 @@
+"""Synthetic, seeded stand-in for the TMDB API used for scale testing.
+
+The catalog is never materialised: every movie, show, season and person is
+derived on demand from ``(seed, kind, id)``, so a catalog with millions of
+titles costs no memory and always returns the same data for the same seed.
+
+Titles and names are built from word tables using a mixed-radix encoding of
+the entity ID, which makes ``/search/multi`` invertible: searching for a
+generated title finds every entity carrying it without scanning anything.
+
+Run it standalone and point the backend at it::
+
+    python -m benchmarks.fake_tmdb --port 8001 --latency lognormal --latency-ms 40
+    TMDB_BASE_URL=http://127.0.0.1:8001/3 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse
+
+PAGE_SIZE = 20
+
+ADJECTIVES = [
+    "Silent", "Broken", "Golden", "Hidden", "Crimson", "Frozen", "Endless",
+    "Savage", "Midnight", "Burning", "Hollow", "Electric", "Wild", "Lost",
+    "Secret", "Bitter", "Iron", "Velvet", "Distant", "Fallen", "Scarlet",
+    "Quiet", "Restless", "Shattered", "Northern", "Lonely", "Wicked",
+    "Emerald", "Final", "Forgotten", "Glass", "Neon",
+]
+NOUNS = [
+    "River", "Empire", "Garden", "Signal", "Harbor", "Kingdom", "Mirror",
+    "Horizon", "Station", "Frontier", "Orchard", "Voyage", "Canyon", "Circuit",
+    "Lantern", "Island", "Machine", "Archive", "Fortress", "Meadow", "Tide",
+    "Protocol", "Summit", "Valley", "Engine", "Citadel", "Desert", "Harvest",
+    "Compass", "Colony", "Shadow", "Paradox",
+]
+FIRST_NAMES = [
+    "Ava", "Liam", "Maya", "Noah", "Iris", "Ezra", "Lena", "Owen", "Nora",
+    "Felix", "Clara", "Hugo", "Ruby", "Milo", "Zoe", "Jonah", "Ines", "Theo",
+    "Vera", "Caleb", "Alma", "Rafael", "Greta", "Soren", "Paloma", "Idris",
+    "Freya", "Tomas", "Yara", "Dmitri", "Hana", "Lucien",
+]
+LAST_NAMES = [
+    "Hart", "Okafor", "Lindqvist", "Moreau", "Tanaka", "Castillo", "Brennan",
+    "Novak", "Adeyemi", "Kowalski", "Ferreira", "Whitlock", "Achterberg",
+    "Salazar", "Nakamura", "Ostrowski", "Quinn", "Delacroix", "Haddad",
+    "Mbeki", "Rasmussen", "Valente", "Petrov", "Sandoval", "Yilmaz",
+    "Abernathy", "Kaur", "Lindgren", "Oyelaran", "Marchetti", "Sato", "Bloom",
+]
+
+MOVIE_GENRES = [
+    {"id": 28, "name": "Action"}, {"id": 12, "name": "Adventure"},
+    {"id": 16, "name": "Animation"}, {"id": 35, "name": "Comedy"},
+    {"id": 80, "name": "Crime"}, {"id": 99, "name": "Documentary"},
+    {"id": 18, "name": "Drama"}, {"id": 14, "name": "Fantasy"},
+    {"id": 27, "name": "Horror"}, {"id": 9648, "name": "Mystery"},
+    {"id": 10749, "name": "Romance"}, {"id": 878, "name": "Science Fiction"},
+    {"id": 53, "name": "Thriller"}, {"id": 37, "name": "Western"},
+]
+TV_GENRES = [
+    {"id": 10759, "name": "Action & Adventure"}, {"id": 16, "name": "Animation"},
+    {"id": 35, "name": "Comedy"}, {"id": 80, "name": "Crime"},
+    {"id": 99, "name": "Documentary"}, {"id": 18, "name": "Drama"},
+    {"id": 10751, "name": "Family"}, {"id": 9648, "name": "Mystery"},
+    {"id": 10765, "name": "Sci-Fi & Fantasy"}, {"id": 10768, "name": "War & Politics"},
+]
+NETWORKS = ["AMC", "HBO", "BBC One", "Netflix", "FX", "NBC", "Channel 4", "Apple TV+"]
+CREW_JOBS = [
+    ("Directing", "Director"), ("Writing", "Screenplay"), ("Writing", "Writer"),
+    ("Production", "Producer"), ("Production", "Executive Producer"),
+    ("Sound", "Original Music Composer"), ("Camera", "Director of Photography"),
+    ("Editing", "Editor"),
+]
+DEPARTMENTS = ["Acting", "Acting", "Acting", "Directing", "Writing", "Production", "Sound"]
+
+
+@dataclass
+class FakeTMDBConfig:
+    """Shape of the synthetic catalog and the fault profile of the fake API."""
+
+    seed: int = 42
+
+    # Catalog size
+    num_movies: int = 2_000_000
+    num_shows: int = 250_000
+    num_people: int = 1_000_000
+    max_seasons: int = 25
+    max_episodes_per_season: int = 40
+    max_person_credits: int = 4000
+    prolific_person_every: int = 1000  # every Nth person has thousands of credits
+
+    # Latency: "none", "fixed", "uniform" or "lognormal"
+    latency: str = "none"
+    latency_ms: float = 0.0  # fixed value, uniform midpoint or lognormal median
+    latency_jitter_ms: float = 0.0  # uniform half-width or lognormal sigma in ms
+
+    # Fault injection (probabilities per request)
+    rate_limit_rate: float = 0.0
+    error_rate: float = 0.0
+    retry_after_seconds: int = 1
+
+    @classmethod
+    def from_env(cls) -> "FakeTMDBConfig":
+        """Create configuration from FAKE_TMDB_* environment variables."""
+        values: Dict[str, Any] = {}
+        for field in fields(cls):
+            raw = os.getenv(f"FAKE_TMDB_{field.name.upper()}")
+            if raw is not None:
+                values[field.name] = field.type(raw) if callable(field.type) else raw
+        return cls(**values)
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Return a latency in seconds drawn from the configured distribution."""
+        if self.latency == "fixed":
+            return self.latency_ms / 1000
+        if self.latency == "uniform":
+            low = max(0.0, self.latency_ms - self.latency_jitter_ms)
+            return rng.uniform(low, self.latency_ms + self.latency_jitter_ms) / 1000
+        if self.latency == "lognormal" and self.latency_ms > 0:
+            sigma = self.latency_jitter_ms / self.latency_ms if self.latency_jitter_ms else 0.5
+            return rng.lognormvariate(math.log(self.latency_ms), sigma) / 1000
+        return 0.0
+
+
+class SyntheticCatalog:
+    """Deterministic catalog where every entity is a pure function of its ID."""
+
+    def __init__(self, config: FakeTMDBConfig):
+        self.config = config
+        self._combos = len(ADJECTIVES) * len(NOUNS)
+        self._name_combos = len(FIRST_NAMES) * len(LAST_NAMES)
+
+    def _rng(self, kind: str, entity_id: int) -> random.Random:
+        return random.Random(f"{self.config.seed}:{kind}:{entity_id}")
+
+    # -- naming -------------------------------------------------------------
+
+    def title_for(self, entity_id: int) -> str:
+        index = entity_id - 1
+        adjective = ADJECTIVES[index % len(ADJECTIVES)]
+        noun = NOUNS[(index // len(ADJECTIVES)) % len(NOUNS)]
+        sequel = index // self._combos
+        return f"{adjective} {noun}" + (f" {sequel + 1}" if sequel else "")
+
+    def name_for(self, person_id: int) -> str:
+        index = person_id - 1
+        first = FIRST_NAMES[index % len(FIRST_NAMES)]
+        last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        generation = index // self._name_combos
+        return f"{first} {last}" + (f" {generation + 1}" if generation else "")
+
+    @staticmethod
+    def _parse(
+        words: List[str], left: List[str], right: List[str]
+    ) -> Optional[Tuple[int, Optional[int]]]:
+        """Invert a generated "left right [n]" string into (base index, suffix)."""
+        lowered = [w.lower() for w in words]
+        left_index = next((i for i, w in enumerate(left) if w.lower() in lowered), None)
+        right_index = next((i for i, w in enumerate(right) if w.lower() in lowered), None)
+        if left_index is None or right_index is None:
+            return None
+        suffix = next((int(w) for w in words if w.isdigit()), None)
+        return left_index + right_index * len(left), suffix
+
+    def _matching_ids(
+        self, base: int, suffix: Optional[int], combos: int, limit: int
+    ) -> List[int]:
+        if suffix is not None:
+            entity_id = base + (suffix - 1) * combos + 1
+            return [entity_id] if entity_id <= limit else []
+        return list(range(base + 1, limit + 1, combos))
+
+    def search(self, query: str) -> List[Tuple[str, int]]:
+        """Return ``(media_type, id)`` pairs whose generated name matches."""
+        words = query.replace(".", " ").split()
+        matches: List[Tuple[str, int]] = []
+
+        title = self._parse(words, ADJECTIVES, NOUNS)
+        if title is not None:
+            base, suffix = title
+            # Interleave shows and movies so page 1 contains both
+            shows = self._matching_ids(base, suffix, self._combos, self.config.num_shows)
+            movies = self._matching_ids(base, suffix, self._combos, self.config.num_movies)
+            for i in range(max(len(shows), len(movies))):
+                if i < len(shows):
+                    matches.append(("tv", shows[i]))
+                if i < len(movies):
+                    matches.append(("movie", movies[i]))
+
+        person = self._parse(words, FIRST_NAMES, LAST_NAMES)
+        if person is not None:
+            base, suffix = person
+            matches.extend(
+                ("person", pid)
+                for pid in self._matching_ids(
+                    base, suffix, self._name_combos, self.config.num_people
+                )
+            )
+        return matches
+
+    # -- entities -----------------------------------------------------------
+
+    def _date(self, rng: random.Random, start: int = 1950, end: int = 2025) -> str:
+        return f"{rng.randint(start, end)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    def movie(self, movie_id: int) -> Dict[str, Any]:
+        rng = self._rng("movie", movie_id)
+        return {
+            "id": movie_id,
+            "title": self.title_for(movie_id),
+            "original_title": self.title_for(movie_id),
+            "release_date": self._date(rng),
+            "runtime": rng.randint(75, 190),
+            "vote_average": round(rng.uniform(2.0, 9.5), 1),
+            "vote_count": rng.randint(0, 40000),
+            "popularity": round(rng.paretovariate(1.5), 3),
+            "tagline": f"Every {NOUNS[rng.randrange(len(NOUNS))].lower()} has a price.",
+            "overview": "Synthetic catalog entry.",
+            "poster_path": f"/m{movie_id}.jpg",
+            "genres": rng.sample(MOVIE_GENRES, rng.randint(1, 3)),
+        }
+
+    def show(self, tv_id: int) -> Dict[str, Any]:
+        rng = self._rng("tv", tv_id)
+        first_year = rng.randint(1960, 2022)
+        season_count = rng.randint(1, self.config.max_seasons)
+        seasons = [
+            {
+                "season_number": number,
+                "name": "Specials" if number == 0 else f"Season {number}",
+                "poster_path": f"/s{tv_id}_{number}.jpg",
+                "episode_count": self._episode_count(tv_id, number),
+                "air_date": f"{first_year + max(number - 1, 0)}-09-01",
+            }
+            for number in range(0 if rng.random() < 0.3 else 1, season_count + 1)
+        ]
+        return {
+            "id": tv_id,
+            "name": self.title_for(tv_id),
+            "original_name": self.title_for(tv_id),
+            "first_air_date": f"{first_year}-09-01",
+            "last_air_date": f"{first_year + season_count - 1}-12-15",
+            "episode_run_time": [rng.choice([22, 30, 45, 60])],
+            "number_of_seasons": season_count,
+            "number_of_episodes": sum(s["episode_count"] for s in seasons),
+            "vote_average": round(rng.uniform(2.0, 9.5), 1),
+            "vote_count": rng.randint(0, 20000),
+            "popularity": round(rng.paretovariate(1.5), 3),
+            "tagline": "",
+            "status": rng.choice(["Ended", "Returning Series", "Canceled"]),
+            "networks": [{"id": 1, "name": rng.choice(NETWORKS)}],
+            "poster_path": f"/t{tv_id}.jpg",
+            "genres": rng.sample(TV_GENRES, rng.randint(1, 3)),
+            "seasons": seasons,
+        }
+
+    def _episode_count(self, tv_id: int, season_number: int) -> int:
+        rng = self._rng(f"tv-season-{season_number}", tv_id)
+        return rng.randint(6, self.config.max_episodes_per_season)
+
+    def season(self, tv_id: int, season_number: int) -> Optional[Dict[str, Any]]:
+        show = self.show(tv_id)
+        season = next(
+            (s for s in show["seasons"] if s["season_number"] == season_number), None
+        )
+        if season is None:
+            return None
+        year = int(season["air_date"][:4])
+        episodes = [
+            {
+                "id": tv_id * 100_000 + season_number * 1000 + number,
+                "episode_number": number,
+                "season_number": season_number,
+                "name": f"{ADJECTIVES[(tv_id + number) % len(ADJECTIVES)]} "
+                f"{NOUNS[(season_number * 7 + number) % len(NOUNS)]}",
+                "air_date": f"{year + (number * 7) // 365}-{(number % 12) + 1:02d}-"
+                f"{(number % 28) + 1:02d}",
+                "runtime": show["episode_run_time"][0],
+            }
+            for number in range(1, season["episode_count"] + 1)
+        ]
+        return {**season, "id": tv_id * 1000 + season_number, "episodes": episodes}
+
+    def credits(self, kind: str, entity_id: int) -> Dict[str, Any]:
+        rng = self._rng(f"{kind}-credits", entity_id)
+        people = self.config.num_people
+        cast = [
+            {
+                "id": rng.randint(1, people),
+                "character": f"{FIRST_NAMES[rng.randrange(len(FIRST_NAMES))]}",
+                "order": order,
+                "profile_path": None,
+            }
+            for order in range(rng.randint(8, 60))
+        ]
+        crew = []
+        for department, job in CREW_JOBS:
+            for _ in range(rng.randint(0 if job != "Director" else 1, 2)):
+                crew.append(
+                    {
+                        "id": rng.randint(1, people),
+                        "department": department,
+                        "job": job,
+                        "profile_path": None,
+                    }
+                )
+        for person in cast + crew:
+            person["name"] = self.name_for(person["id"])
+        return {"id": entity_id, "cast": cast, "crew": crew}
+
+    def keywords(self, kind: str, entity_id: int) -> Dict[str, Any]:
+        rng = self._rng(f"{kind}-keywords", entity_id)
+        words = [
+            {"id": index, "name": NOUNS[index].lower()}
+            for index in rng.sample(range(len(NOUNS)), rng.randint(0, 8))
+        ]
+        key = "keywords" if kind == "movie" else "results"
+        return {"id": entity_id, key: words}
+
+    def person(self, person_id: int) -> Dict[str, Any]:
+        rng = self._rng("person", person_id)
+        return {
+            "id": person_id,
+            "name": self.name_for(person_id),
+            "known_for_department": rng.choice(DEPARTMENTS),
+            "profile_path": f"/p{person_id}.jpg",
+            "biography": "Synthetic person.",
+            "birthday": self._date(rng, 1920, 2005),
+            "place_of_birth": "Nowhere",
+            "popularity": round(rng.paretovariate(1.5), 3),
+        }
+
+    def combined_credits(self, person_id: int) -> Dict[str, Any]:
+        rng = self._rng("person-credits", person_id)
+        if self.config.prolific_person_every and person_id % self.config.prolific_person_every == 0:
+            total = rng.randint(self.config.max_person_credits // 2, self.config.max_person_credits)
+        else:
+            total = min(int(rng.paretovariate(1.2) * 5), self.config.max_person_credits)
+
+        cast, crew = [], []
+        for _ in range(total):
+            media_type = "movie" if rng.random() < 0.7 else "tv"
+            limit = self.config.num_movies if media_type == "movie" else self.config.num_shows
+            entity_id = rng.randint(1, limit)
+            credit = {
+                "id": entity_id,
+                "media_type": media_type,
+                "poster_path": f"/{media_type[0]}{entity_id}.jpg",
+                "vote_average": round(rng.uniform(2.0, 9.5), 1),
+            }
+            date = self._date(rng)
+            if media_type == "movie":
+                credit.update(title=self.title_for(entity_id), release_date=date)
+            else:
+                credit.update(name=self.title_for(entity_id), first_air_date=date)
+            if rng.random() < 0.75:
+                credit["character"] = FIRST_NAMES[rng.randrange(len(FIRST_NAMES))]
+                cast.append(credit)
+            else:
+                department, job = CREW_JOBS[rng.randrange(len(CREW_JOBS))]
+                credit.update(department=department, job=job)
+                crew.append(credit)
+        return {"id": person_id, "cast": cast, "crew": crew}
+
+    def summary(self, media_type: str, entity_id: int) -> Dict[str, Any]:
+        """Return the compact list-item form used by search and discover."""
+        if media_type == "person":
+            person = self.person(entity_id)
+            return {
+                "id": entity_id,
+                "media_type": "person",
+                "name": person["name"],
+                "known_for_department": person["known_for_department"],
+                "profile_path": person["profile_path"],
+                "popularity": person["popularity"],
+            }
+        rng = self._rng(media_type, entity_id)
+        date = self._date(rng, 1950 if media_type == "movie" else 1960, 2025)
+        item = {
+            "id": entity_id,
+            "media_type": media_type,
+            "poster_path": f"/{media_type[0]}{entity_id}.jpg",
+            "vote_average": round(rng.uniform(2.0, 9.5), 1),
+            "vote_count": rng.randint(0, 40000),
+            "popularity": round(rng.paretovariate(1.5), 3),
+        }
+        if media_type == "movie":
+            item.update(title=self.title_for(entity_id), release_date=date)
+        else:
+            item.update(name=self.title_for(entity_id), first_air_date=date)
+        return item
+
+
+def _paginate(items: List[Any], page: int) -> Tuple[List[Any], int]:
+    total_pages = max(1, math.ceil(len(items) / PAGE_SIZE))
+    start = (page - 1) * PAGE_SIZE
+    return items[start : start + PAGE_SIZE], total_pages
+
+
+def create_app(config: Optional[FakeTMDBConfig] = None) -> FastAPI:
+    """Build the fake TMDB ASGI app; routes live under ``/3`` like the real API."""
+    config = config or FakeTMDBConfig()
+    catalog = SyntheticCatalog(config)
+    fault_rng = random.Random(config.seed)
+    stats = {"requests": 0, "rate_limited": 0, "errors": 0}
+
+    app = FastAPI(title="Fake TMDB")
+    app.state.config = config
+    app.state.catalog = catalog
+    app.state.stats = stats
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if not request.url.path.startswith("/3/"):
+            return await call_next(request)
+
+        stats["requests"] += 1
+        delay = config.sample_latency(fault_rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if "api_key" not in request.query_params:
+            return JSONResponse(
+                {"status_code": 7, "status_message": "Invalid API key"}, status_code=401
+            )
+        roll = fault_rng.random()
+        if roll < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                {"status_code": 25, "status_message": "Request count over limit"},
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after_seconds)},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse(
+                {"status_code": 11, "status_message": "Internal error"}, status_code=500
+            )
+        return await call_next(request)
+
+    router = APIRouter(prefix="/3")
+
+    def not_found() -> JSONResponse:
+        return JSONResponse(
+            {"status_code": 34, "status_message": "The resource could not be found."},
+            status_code=404,
+        )
+
+    @router.get("/configuration")
+    async def configuration():
+        return {
+            "images": {
+                "base_url": "http://image.tmdb.org/t/p/",
+                "secure_base_url": "https://image.tmdb.org/t/p/",
+                "poster_sizes": ["w92", "w154", "w185", "w342", "w500", "original"],
+                "profile_sizes": ["w45", "w185", "h632", "original"],
+            },
+            "change_keys": [],
+        }
+
+    @router.get("/search/multi")
+    async def search_multi(query: str = "", page: int = 1):
+        matches = catalog.search(query)
+        page_items, total_pages = _paginate(matches, page)
+        return {
+            "page": page,
+            "results": [catalog.summary(kind, entity_id) for kind, entity_id in page_items],
+            "total_pages": total_pages,
+            "total_results": len(matches),
+        }
+
+    @router.get("/movie/{movie_id}")
+    async def movie(movie_id: int):
+        if not 1 <= movie_id <= config.num_movies:
+            return not_found()
+        return catalog.movie(movie_id)
+
+    @router.get("/movie/{movie_id}/credits")
+    async def movie_credits(movie_id: int):
+        if not 1 <= movie_id <= config.num_movies:
+            return not_found()
+        return catalog.credits("movie", movie_id)
+
+    @router.get("/movie/{movie_id}/keywords")
+    async def movie_keywords(movie_id: int):
+        if not 1 <= movie_id <= config.num_movies:
+            return not_found()
+        return catalog.keywords("movie", movie_id)
+
+    @router.get("/tv/{tv_id}")
+    async def tv(tv_id: int):
+        if not 1 <= tv_id <= config.num_shows:
+            return not_found()
+        return catalog.show(tv_id)
+
+    @router.get("/tv/{tv_id}/credits")
+    async def tv_credits(tv_id: int):
+        if not 1 <= tv_id <= config.num_shows:
+            return not_found()
+        return catalog.credits("tv", tv_id)
+
+    @router.get("/tv/{tv_id}/keywords")
+    async def tv_keywords(tv_id: int):
+        if not 1 <= tv_id <= config.num_shows:
+            return not_found()
+        return catalog.keywords("tv", tv_id)
+
+    @router.get("/tv/{tv_id}/season/{season_number}")
+    async def tv_season(tv_id: int, season_number: int):
+        if not 1 <= tv_id <= config.num_shows:
+            return not_found()
+        season = catalog.season(tv_id, season_number)
+        return season if season is not None else not_found()
+
+    @router.get("/person/{person_id}")
+    async def person(person_id: int):
+        if not 1 <= person_id <= config.num_people:
+            return not_found()
+        return catalog.person(person_id)
+
+    @router.get("/person/{person_id}/combined_credits")
+    async def person_credits(person_id: int):
+        if not 1 <= person_id <= config.num_people:
+            return not_found()
+        return catalog.combined_credits(person_id)
+
+    @router.get("/genre/{media_type}/list")
+    async def genres(media_type: str):
+        if media_type not in ["movie", "tv"]:
+            return not_found()
+        return {"genres": MOVIE_GENRES if media_type == "movie" else TV_GENRES}
+
+    @router.get("/discover/{media_type}")
+    async def discover(media_type: str, page: int = 1):
+        if media_type not in ["movie", "tv"]:
+            return not_found()
+        limit = config.num_movies if media_type == "movie" else config.num_shows
+        total_pages = min(500, math.ceil(limit / PAGE_SIZE))
+        start = (page - 1) * PAGE_SIZE + 1
+        ids = range(start, min(start + PAGE_SIZE, limit + 1))
+        return {
+            "page": page,
+            "results": [catalog.summary(media_type, entity_id) for entity_id in ids],
+            "total_pages": total_pages,
+            "total_results": min(limit, total_pages * PAGE_SIZE),
+        }
+
+    app.include_router(router)
+
+    @app.get("/stats")
+    async def fake_stats():
+        """Counters for requests served and faults injected."""
+        return stats
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serve the fake TMDB API with uvicorn."""
+    import uvicorn
+
+    defaults = FakeTMDBConfig.from_env()
+    parser = argparse.ArgumentParser(description="Synthetic TMDB server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    for field in fields(FakeTMDBConfig):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=field.type,
+            default=getattr(defaults, field.name),
+        )
+    args = parser.parse_args(argv)
+
+    config = FakeTMDBConfig(**{f.name: getattr(args, f.name) for f in fields(FakeTMDBConfig)})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""First-scan and rescan times of the library scanner on a synthetic tree.
+
+Builds a TV-library-shaped tree of empty files (shows / seasons / episodes
+plus a subtitle per episode) and reports the first scan, an unchanged
+rescan and a rescan after renaming files in a few seasons::
+
+    python -m benchmarks.library_scan --files 200000
+    python -m benchmarks.library_scan --root /mnt/nas/bench --keep
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.library_scanner import LibraryIndex, LibraryScanner
+
+EPISODES_PER_SEASON = 10
+SEASONS_PER_SHOW = 5
+
+
+def build_tree(root: str, files: int) -> int:
+    """Create about ``files`` files (half media, half subtitles); returns seasons."""
+    seasons = max(1, files // (EPISODES_PER_SEASON * 2))
+    for number in range(seasons):
+        season = os.path.join(
+            root,
+            f"Show {number // SEASONS_PER_SHOW:05d}",
+            f"Season {number % SEASONS_PER_SHOW + 1:02d}",
+        )
+        os.makedirs(season)
+        for episode in range(1, EPISODES_PER_SEASON + 1):
+            for extension in (".mkv", ".en.srt"):
+                open(os.path.join(season, f"E{episode:02d}{extension}"), "wb").close()
+    return seasons
+
+
+def _timed_scan(index: LibraryIndex, root: str, workers: int) -> Dict[str, Any]:
+    summary = LibraryScanner(index, root, workers=workers).run()
+    return {
+        key: summary[key]
+        for key in ("duration_ms", "directories", "unchanged_directories", "files_indexed", "media")
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Library scanner benchmark")
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--root", help="build the tree here instead of a temporary folder")
+    parser.add_argument("--keep", action="store_true", help="leave the tree and index behind")
+    args = parser.parse_args(argv)
+
+    root = args.root or tempfile.mkdtemp(prefix="library-bench-")
+    try:
+        started = time.perf_counter()
+        seasons = build_tree(os.path.join(root, "library"), args.files)
+        report: Dict[str, Any] = {
+            "files": seasons * EPISODES_PER_SEASON * 2,
+            "build_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        index = LibraryIndex(os.path.join(root, "index.sqlite3"))
+        library = os.path.join(root, "library")
+        report["first_scan"] = _timed_scan(index, library, args.workers)
+        report["unchanged_rescan"] = _timed_scan(index, library, args.workers)
+
+        # Rename an episode in every 100th season
+        for number in range(0, seasons, 100):
+            season = os.path.join(
+                library,
+                f"Show {number // SEASONS_PER_SHOW:05d}",
+                f"Season {number % SEASONS_PER_SHOW + 1:02d}",
+            )
+            os.rename(os.path.join(season, "E01.mkv"), os.path.join(season, "S01E01.mkv"))
+        report["rescan_after_renames"] = _timed_scan(index, library, args.workers)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Throughput of the release name parser on a synthetic corpus.
+
+Generates a mix of scene episode, multi-episode, anime, date-based and movie
+names and reports names parsed per second on one core::
+
+    python -m benchmarks.release_parser --names 200000
+
+Measured results are 60,000-120,000 names per second depending on the
+machine. That is below the target of several hundred thousand per second.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.release_parser import parse_many
+
+TITLES = ["Show Name", "The Office US", "One Piece", "Blade Runner 2049", "Spider-Man", "Arrival"]
+QUALITY = ["1080p.WEB-DL.x264", "720p.HDTV.x264", "2160p.UHD.BluRay.x265", "1080p.AMZN.WEB-DL.DDP5.1.H.264"]
+GROUPS = ["GRP", "TERMiNAL", "NTb", "FLUX"]
+
+
+def build_names(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        title = rng.choice(TITLES)
+        dotted = title.replace(" ", ".")
+        season, episode = rng.randint(1, 12), rng.randint(1, 24)
+        style = rng.randrange(6)
+        if style == 0:
+            name = f"{dotted}.S{season:02d}E{episode:02d}.{rng.choice(QUALITY)}-{rng.choice(GROUPS)}.mkv"
+        elif style == 1:
+            name = f"{title} - S{season:02d}E{episode:02d}-E{episode + 1:02d} - Episode Title [720p].mkv"
+        elif style == 2:
+            name = f"[{rng.choice(GROUPS)}] {title} - {rng.randint(1, 1100)} (1080p) [ABCD1234].mkv"
+        elif style == 3:
+            name = f"{dotted}.20{rng.randint(10, 24)}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}.720p.HDTV.mkv"
+        elif style == 4:
+            name = f"{dotted}.{rng.randint(1950, 2024)}.{rng.choice(QUALITY)}-{rng.choice(GROUPS)}.mkv"
+        else:
+            name = f"{title} ({rng.randint(1950, 2024)}) [2160p].mkv"
+        names.append(name)
+    return names
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Release name parser benchmark")
+    parser.add_argument("--names", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    names = build_names(args.names)
+    timings = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        results = parse_many(names)
+        timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    kinds: Dict[str, int] = {}
+    for result in results:
+        kinds[result["kind"]] = kinds.get(result["kind"], 0) + 1
+    report: Dict[str, Any] = {
+        "names": len(names),
+        "best_seconds": round(best, 3),
+        "names_per_second": round(len(names) / best),
+        "microseconds_per_name": round(best / len(names) * 1e6, 2),
+        "kinds": kinds,
+    }
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Replay a captured traffic trace against a fresh backend.
+
+Capture a trace by starting the backend with ``TRACE_FILE=trace.jsonl``, use
+the app normally, then replay it::
+
+    python -m benchmarks.replay trace.jsonl --speed 1     # real time
+    python -m benchmarks.replay trace.jsonl --speed 10    # ten times faster
+    python -m benchmarks.replay trace.jsonl --speed 0     # as fast as possible
+
+By default the replay serves the recorded TMDB responses on a local port,
+imports a fresh ``app.main`` pointed at it and drives it in-process. Use
+``--target`` to drive an already running backend instead (start that backend
+with ``TMDB_BASE_URL`` pointing at ``--upstream-port``).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.services.trace import normalize_route, upstream_key
+from app.services.utils import percentile
+
+REPLAY_API_KEY = "replay-api-key"
+
+
+@dataclass
+class Trace:
+    """Requests and upstream responses loaded from a capture file."""
+
+    requests: List[Dict[str, Any]] = field(default_factory=list)
+    upstream: Dict[str, List[Tuple[int, str]]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        trace = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event["kind"] == "request":
+                    trace.requests.append(event)
+                elif event["kind"] == "upstream":
+                    trace.upstream.setdefault(event["key"], []).append(
+                        (event["status"], event["body"])
+                    )
+        trace.requests.sort(key=lambda e: e["t"])
+        return trace
+
+
+def create_upstream_app(trace: Trace) -> FastAPI:
+    """Serve recorded TMDB responses, cycling through repeats of the same key."""
+    app = FastAPI(title="Recorded TMDB")
+    cursors: Dict[str, int] = defaultdict(int)
+    app.state.misses = 0
+
+    @app.get("/3/{endpoint:path}")
+    async def recorded(endpoint: str, request: Request):
+        params = dict(request.query_params)
+        key = upstream_key(f"/{endpoint}", params)
+        responses = trace.upstream.get(key)
+        if not responses:
+            app.state.misses += 1
+            return JSONResponse(
+                {"status_code": 34, "status_message": f"Not in trace: {key}"},
+                status_code=404,
+            )
+        status, body = responses[cursors[key] % len(responses)]
+        cursors[key] += 1
+        return Response(body, status_code=status, media_type="application/json")
+
+    return app
+
+
+def summarize(results: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """Per-route latency percentiles and error counts for a replay run."""
+    by_route: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for result in results:
+        by_route[result["route"]].append(result)
+
+    routes = {}
+    for route, items in sorted(by_route.items()):
+        durations = [r["duration_ms"] for r in items]
+        routes[route] = {
+            "count": len(items),
+            "errors": sum(1 for r in items if r["status"] >= 500 or r["status"] == 0),
+            "status_mismatches": sum(1 for r in items if r["status"] != r["recorded_status"]),
+            "mean_ms": round(statistics.fmean(durations), 2),
+            "p50_ms": round(percentile(durations, 50), 2),
+            "p95_ms": round(percentile(durations, 95), 2),
+            "p99_ms": round(percentile(durations, 99), 2),
+            "max_ms": round(max(durations), 2),
+        }
+    return {
+        "requests": len(results),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(len(results) / wall_seconds, 2) if wall_seconds else 0.0,
+        "routes": routes,
+    }
+
+
+async def drive(
+    client: Any, trace: Trace, speed: float, concurrency: int
+) -> Dict[str, Any]:
+    """Issue the trace's requests on the recorded schedule divided by ``speed``."""
+    semaphore = asyncio.Semaphore(concurrency)
+    results: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+
+    async def issue(event: Dict[str, Any]) -> None:
+        if speed > 0:
+            delay = event["t"] / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        headers = {"X-API-Key": REPLAY_API_KEY} if event.get("has_api_key") else {}
+        url = event["path"] + (f"?{event['query']}" if event.get("query") else "")
+        async with semaphore:
+            began = time.perf_counter()
+            try:
+                response = await client.request(
+                    event["method"], url, json=event.get("body"), headers=headers
+                )
+                status = response.status_code
+            except Exception:
+                status = 0
+            results.append(
+                {
+                    "route": f"{event['method']} {normalize_route(event['path'])}",
+                    "status": status,
+                    "recorded_status": event["status"],
+                    "duration_ms": (time.perf_counter() - began) * 1000,
+                }
+            )
+
+    await asyncio.gather(*(issue(event) for event in trace.requests))
+    return summarize(results, time.perf_counter() - start)
+
+
+async def replay(
+    trace_path: str,
+    speed: float = 1.0,
+    concurrency: int = 64,
+    target: Optional[str] = None,
+    upstream_port: int = 8002,
+) -> Dict[str, Any]:
+    """Serve the recorded upstream and drive a backend with the recorded requests."""
+    import httpx
+    import uvicorn
+
+    trace = Trace.load(trace_path)
+    upstream_app = create_upstream_app(trace)
+    server = uvicorn.Server(
+        uvicorn.Config(upstream_app, host="127.0.0.1", port=upstream_port, log_level="warning")
+    )
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    try:
+        if target:
+            async with httpx.AsyncClient(base_url=target, timeout=60.0) as client:
+                summary = await drive(client, trace, speed, concurrency)
+        else:
+            # Configure before the first import so the fresh app picks it up
+            os.environ["TMDB_BASE_URL"] = f"http://127.0.0.1:{upstream_port}/3"
+            os.environ.setdefault("TMDB_API_KEY", REPLAY_API_KEY)
+            os.environ.pop("TRACE_FILE", None)
+            # Warm-up requests are not in the trace and would count as misses
+            os.environ.setdefault("WARMUP_ENABLED", "false")
+            from app.main import app
+
+            transport = httpx.ASGITransport(app=app)
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(
+                    transport=transport, base_url="http://backend", timeout=60.0
+                ) as client:
+                    summary = await drive(client, trace, speed, concurrency)
+    finally:
+        server.should_exit = True
+        await serve_task
+
+    summary["speed"] = speed
+    summary["upstream_misses"] = upstream_app.state.misses
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a captured backend trace")
+    parser.add_argument("trace", help="JSONL trace written with TRACE_FILE")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="time scale; 0 replays as fast as possible"
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--target", help="base URL of a running backend to drive")
+    parser.add_argument("--upstream-port", type=int, default=8002)
+    parser.add_argument("--output", help="write the JSON summary to this file")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(
+        replay(args.trace, args.speed, args.concurrency, args.target, args.upstream_port)
+    )
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
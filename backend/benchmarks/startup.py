@@ -0,0 +1,194 @@
+"""Import-time and cold-start budget for the backend.
+
+The Electron app spawns the backend on launch, so two numbers matter:
+
+* how long ``import app.main`` takes, measured with ``python -X importtime``
+  in fresh interpreters (median of ``--runs``), with the slowest modules;
+* time from spawning uvicorn until ``/api/server-key-status`` answers.
+
+Both are checked against budgets; the exit status is 1 when one is exceeded,
+so the script can gate CI::
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --import-budget-ms 900 --first-response-budget-ms 2500
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET_MS = 1000.0
+FIRST_RESPONSE_BUDGET_MS = 3000.0
+
+# Must stay out of the import of app.main; loaded on first use instead
+DEFERRED_MODULES = ("httpx", "app.services.tmdb", "app.services.enhanced_example")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` output into {module, self_us, cumulative_us} rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        rows.append(
+            {
+                "module": fields[2].strip(),
+                "self_us": int(fields[0]),
+                "cumulative_us": int(fields[1]),
+            }
+        )
+    return rows
+
+
+def _child_env(**extra: str) -> Dict[str, str]:
+    env = {**os.environ, **extra}
+    env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def measure_import(module: str = "app.main", runs: int = 5, top_n: int = 15) -> Dict[str, Any]:
+    """Median import time of ``module`` in fresh interpreters plus its heaviest imports."""
+    totals = []
+    rows: List[Dict[str, Any]] = []
+    for _ in range(runs):
+        probe = (
+            f"import sys, json, {module}; "
+            f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", probe],
+            cwd=BACKEND_DIR,
+            env=_child_env(WARMUP_ENABLED="false"),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        rows = parse_importtime(result.stderr)
+        total = next(r["cumulative_us"] for r in reversed(rows) if r["module"] == module)
+        totals.append(total / 1000)
+        eager = json.loads(result.stdout.strip().splitlines()[-1])
+
+    by_self = sorted(rows, key=lambda r: r["self_us"], reverse=True)
+    app_modules = [r for r in rows if r["module"].startswith("app.")]
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "eagerly_imported_deferred_modules": eager,
+        "slowest_modules": [
+            {"module": r["module"], "self_ms": round(r["self_us"] / 1000, 1)}
+            for r in by_self[:top_n]
+        ],
+        "app_modules": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 1)}
+            for r in sorted(app_modules, key=lambda r: r["cumulative_us"], reverse=True)
+        ],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(
+    path: str = "/api/server-key-status", runs: int = 3, timeout: float = 30.0
+) -> Dict[str, Any]:
+    """Time from spawning uvicorn until ``path`` first returns 200."""
+    samples = []
+    for _ in range(runs):
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}{path}"
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+             "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=_child_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while True:
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError(f"{url} did not answer within {timeout}s")
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with {process.returncode}")
+                try:
+                    with urllib.request.urlopen(url, timeout=1) as response:
+                        if response.status == 200:
+                            break
+                except (urllib.error.URLError, ConnectionError, OSError):
+                    time.sleep(0.005)
+            samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    return {
+        "path": path,
+        "runs": runs,
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backend import-time and cold-start budget")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument(
+        "--first-response-budget-ms", type=float, default=FIRST_RESPONSE_BUDGET_MS
+    )
+    parser.add_argument(
+        "--skip-server", action="store_true", help="only measure the import of app.main"
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {"import": measure_import(runs=args.runs)}
+    failures = []
+    if report["import"]["median_ms"] > args.import_budget_ms:
+        failures.append(
+            f"import app.main {report['import']['median_ms']}ms > {args.import_budget_ms}ms"
+        )
+    if report["import"]["eagerly_imported_deferred_modules"]:
+        failures.append(
+            "imported at startup: "
+            + ", ".join(report["import"]["eagerly_imported_deferred_modules"])
+        )
+    if not args.skip_server:
+        report["first_response"] = measure_first_response(runs=max(1, args.runs // 2))
+        if report["first_response"]["median_ms"] > args.first_response_budget_ms:
+            failures.append(
+                f"first response {report['first_response']['median_ms']}ms"
+                f" > {args.first_response_budget_ms}ms"
+            )
+    report["budget_exceeded"] = failures
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    sys.stdout.write(text + "\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
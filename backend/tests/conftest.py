@@ -1,5 +1,17 @@
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
+
+# Keep app startup offline; warm-up is exercised directly in test_warmup.py
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("RENAME_JOURNAL_DIR", tempfile.mkdtemp(prefix="rename-journal-"))
+os.environ.setdefault(
+    "LIBRARY_INDEX_FILE", os.path.join(tempfile.mkdtemp(prefix="library-"), "library.sqlite3")
+)
+os.environ.setdefault("JOBS_FILE", os.path.join(tempfile.mkdtemp(prefix="jobs-"), "jobs.sqlite3"))
+
 from app.main import app
 
 
@@ -7,3 +19,26 @@ from app.main import app
 def client():
     with TestClient(app) as client:
         yield client
+
+
+@pytest.fixture
+def fake_tmdb_app():
+    """Synthetic TMDB API with a small deterministic catalog."""
+    from benchmarks.fake_tmdb import FakeTMDBConfig, create_app
+
+    return create_app(
+        FakeTMDBConfig(seed=7, num_movies=50_000, num_shows=5_000, num_people=20_000)
+    )
+
+
+@pytest.fixture
+def fake_tmdb_service(fake_tmdb_app):
+    """TMDBService wired to the fake TMDB app in-process, without any network."""
+    import httpx
+    from app.services.tmdb import TMDBService
+
+    return TMDBService(
+        api_key="test-key",
+        base_url="http://fake-tmdb/3",
+        transport=httpx.ASGITransport(app=fake_tmdb_app),
+    )
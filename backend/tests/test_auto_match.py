@@ -0,0 +1,134 @@
+"""Tests for the deduplicating TMDB auto-matcher."""
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.auto_match import (
+    AutoMatcher,
+    _SeriesIndex,
+    normalize_title,
+    score_candidate,
+)
+from app.services.episodes import EpisodeMap
+from app.services.release_parser import parse_many
+
+
+def _dotted(title):
+    return title.replace(" ", ".")
+
+
+def test_normalize_and_score():
+    """Test titles compare by words and candidates are scored by type and year."""
+    assert normalize_title("Marvel's Agents.of S.H.I.E.L.D.") == normalize_title(
+        "marvel s agents of s h i e l d"
+    )
+    assert normalize_title("Law & Order") == "law and order"
+
+    show = {"media_type": "tv", "title": "Electric River", "year": 1960}
+    assert score_candidate("electric river", None, "tv", show) == 1.0
+    assert score_candidate("electric river", None, "movie", show) == 0.75
+    assert score_candidate("electric river", 1975, "tv", show) == 0.85
+    assert score_candidate("electric rivers", None, "tv", show) < 1.0
+
+
+def test_keys_dedupe_by_normalised_title():
+    """Test dotted, spaced and differently cased names share one key."""
+    keys = [
+        AutoMatcher.key_of(parsed)
+        for parsed in parse_many(
+            [
+                "Electric.River.S01E01.720p.mkv",
+                "electric river - S01E02 - Title.mkv",
+                "Electric River S01E03.mkv",
+                "Electric River (2010) [1080p].mkv",
+                "...mkv",
+            ]
+        )
+    ]
+    assert keys[0] == keys[1] == keys[2] == ("episode", "electric river", None)
+    assert keys[3] == ("movie", "electric river", 2010)
+    assert keys[4] is None
+
+
+def test_series_index_absolute_and_air_date():
+    """Test absolute numbers skip specials and air dates map back to episodes."""
+    episode_map = EpisodeMap(
+        1,
+        "Show",
+        {
+            0: {1: {"title": "Special", "air_date": "2019-12-24"}},
+            1: {1: {"title": "A", "air_date": "2020-01-01"}, 2: {"title": "B", "air_date": "2020-01-08"}},
+            2: {1: {"title": "C", "air_date": "2021-01-01"}},
+        },
+    )
+    index = _SeriesIndex(episode_map)
+    absolute, dated, beyond = parse_many(
+        ["[Grp] Show - 3 [1080p].mkv", "Show.2020.01.08.mkv", "[Grp] Show - 9.mkv"]
+    )
+    assert index.resolve(absolute) == [(2, 1)]
+    assert index.resolve(dated) == [(1, 2)]
+    assert index.resolve(beyond) == []
+
+
+async def test_one_search_per_show(fake_tmdb_app, fake_tmdb_service):
+    """Test upstream calls scale with shows, not files, and episodes resolve."""
+    catalog = fake_tmdb_app.state.catalog
+    names = []
+    seasons = 0
+    for tv_id in (12, 77, 300):
+        show = catalog.show(tv_id)
+        seasons += len(show["seasons"])
+        for season in show["seasons"]:
+            if season["season_number"] == 0:
+                continue
+            for episode in range(1, season["episode_count"] + 1):
+                names.append(
+                    f"{_dotted(show['name'])}.S{season['season_number']:02d}E{episode:02d}.1080p.WEB-DL.mkv"
+                )
+    movie = catalog.movie(500)
+    names.append(f"{movie['title']} ({movie['release_date'][:4]}) [2160p].mkv")
+    names.append(f"{_dotted(catalog.show(12)['name'])}.S01E99.mkv")
+    names.append("holiday.mkv")
+
+    summary = await AutoMatcher(fake_tmdb_service).match(names)
+
+    assert summary["files"] == len(names) > 400
+    assert summary["groups"] == summary["searches"] == 5  # 3 shows, 1 movie, 1 junk
+    assert summary["episode_maps"] == 3
+    # 5 searches, plus one details call and one call per season for each show
+    assert fake_tmdb_app.state.stats["requests"] == 5 + 3 + seasons
+
+    results = summary["results"]
+    first = results[0]
+    assert first["status"] == "matched"
+    assert (first["tmdb_id"], first["media_type"], first["confidence"]) == (12, "tv", 1.0)
+    expected = catalog.season(12, 1)["episodes"][0]
+    assert first["episodes"] == [
+        {"season": 1, "episode": 1, "title": expected["name"], "air_date": expected["air_date"]}
+    ]
+    assert results[-3]["status"] == "matched"
+    assert (results[-3]["tmdb_id"], results[-3]["media_type"]) == (500, "movie")
+    assert results[-2]["status"] == "episode_not_found"
+    assert results[-1]["status"] == "unmatched"
+    assert summary["matched"] == len(names) - 2
+
+
+def test_match_route(fake_tmdb_service, monkeypatch):
+    """Test POST /api/match returns per-file matches and rejects bad requests."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/match",
+            json={"names": ["Electric.River.S02E03.mkv", "Electric River S02E04.mkv"]},
+            headers={"X-API-Key": "k"},
+        )
+        both = client.post(
+            "/api/match", json={"names": [], "root": "/tmp"}, headers={"X-API-Key": "k"}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["searches"] == 1
+    assert [r["episodes"][0]["episode"] for r in data["results"]] == [3, 4]
+    assert both.status_code == 400
@@ -0,0 +1,67 @@
+"""Tests for batch lookups and upstream request coalescing."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.models.batch_models import BatchOperation
+from app.services.batch import execute_batch
+
+
+class TestExecuteBatch:
+    """Test batch execution against the fake TMDB server."""
+
+    async def test_results_in_request_order_with_dedup(self, fake_tmdb_service):
+        """Test identical operations run once and all receive the result."""
+        operations = [
+            BatchOperation(op="seasons", params={"id": 3}, id="first"),
+            BatchOperation(op="details", params={"id": 3, "type": "tv"}),
+            BatchOperation(op="seasons", params={"id": 3}, id="again"),
+        ]
+
+        response = await execute_batch(fake_tmdb_service, operations, concurrency=2)
+
+        assert response.unique_operations == 2
+        assert [r.id for r in response.results] == ["first", None, "again"]
+        assert all(r.success for r in response.results)
+        assert response.results[0].result == response.results[2].result
+
+    async def test_errors_are_reported_per_item(self, fake_tmdb_service):
+        """Test invalid or failing items do not fail the whole batch."""
+        operations = [
+            BatchOperation(op="details", params={"id": 1}),
+            BatchOperation(op="episodes", params={"id": 1, "season_number": 999}),
+            BatchOperation(op="search", params={"query": "Golden Harbor"}),
+        ]
+
+        response = await execute_batch(fake_tmdb_service, operations)
+
+        assert response.results[0].error == "Missing parameter: type"
+        assert not response.results[1].success
+        assert response.results[2].success
+
+
+async def test_concurrent_identical_requests_are_coalesced(fake_tmdb_app, fake_tmdb_service):
+    """Test waiters on the same upstream key share one request."""
+    await asyncio.gather(*(fake_tmdb_service.get_tv_seasons(5) for _ in range(10)))
+
+    assert fake_tmdb_app.state.stats["requests"] == 1
+    assert fake_tmdb_service.coalesced_requests == 9
+
+
+def test_batch_route(fake_tmdb_service, monkeypatch):
+    """Test the batch route runs operations through the shared service."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/batch",
+            json={"operations": [{"op": "filmography", "params": {"person_id": 12}}]},
+            headers={"X-API-Key": "test-key"},
+        )
+
+    assert response.status_code == 200
+    item = response.json()["results"][0]
+    assert item["success"] is True
+    assert item["result"]["person"]["id"] == 12
@@ -0,0 +1,146 @@
+"""Tests for batch renames."""
+
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import batch_rename
+from app.services.batch_rename import BatchRenamer
+
+
+def _files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"file{i}.mkv"
+        path.write_text(str(i))
+        paths.append(path)
+    return paths
+
+
+async def test_best_effort_renames_valid_items(tmp_path):
+    """Test valid items are renamed and invalid ones reported."""
+    a, b, c = _files(tmp_path, 3)
+    items = [
+        {"original_path": str(a), "new_name": "A.mkv"},
+        {"original_path": str(b), "new_name": "bad|name.mkv"},
+        {"original_path": str(c), "new_name": "C.mkv"},
+    ]
+    events = []
+    summary = await BatchRenamer(items).run(events.append)
+
+    assert summary["renamed"] == 2
+    assert summary["results"][1]["error"] == "INVALID_FILENAME"
+    assert (tmp_path / "A.mkv").read_text() == "0"
+    assert (tmp_path / "C.mkv").exists() and b.exists()
+    assert events[0] == {"type": "validated", "total": 3, "invalid": 1}
+    assert sum(1 for e in events if e["type"] == "progress") == 3
+
+
+async def test_duplicate_targets_fail_validation(tmp_path):
+    """Test all_or_nothing touches nothing when two files target one name."""
+    a, b = _files(tmp_path, 2)
+    items = [
+        {"original_path": str(a), "new_name": "Same.mkv"},
+        {"original_path": str(b), "new_name": "Same.mkv"},
+    ]
+    summary = await BatchRenamer(items, mode="all_or_nothing").run()
+
+    assert summary["renamed"] == 0
+    assert [r["error"] for r in summary["results"]] == ["NOT_ATTEMPTED", "DUPLICATE_TARGET"]
+    assert a.exists() and b.exists()
+
+
+async def test_all_or_nothing_rolls_back_on_failure(tmp_path, monkeypatch):
+    """Test a failing rename reverts the ones that already succeeded."""
+    paths = _files(tmp_path, 5)
+    items = [{"original_path": str(p), "new_name": f"New{i}.mkv"} for i, p in enumerate(paths)]
+    real_rename = os.rename
+
+    def flaky_rename(source, target):
+        if str(target).endswith("New3.mkv"):
+            raise PermissionError(13, "Permission denied", source)
+        real_rename(source, target)
+
+    monkeypatch.setattr(batch_rename.os, "rename", flaky_rename)
+    summary = await BatchRenamer(items, mode="all_or_nothing", max_workers=2).run()
+
+    assert summary["rolled_back"]
+    assert summary["renamed"] == 0
+    assert summary["results"][3]["error"] == "PERMISSION_DENIED"
+    assert all(p.exists() for p in paths)
+    assert not any((tmp_path / f"New{i}.mkv").exists() for i in range(5))
+
+
+async def test_occupied_target_fails_validation(tmp_path):
+    """Test an existing file at a target is caught before anything runs."""
+    a, b = _files(tmp_path, 2)
+    (tmp_path / "taken.mkv").write_text("existing")
+    items = [
+        {"original_path": str(a), "new_name": "New.mkv"},
+        {"original_path": str(b), "new_name": "taken.mkv"},
+    ]
+    summary = await BatchRenamer(items, mode="all_or_nothing").run()
+
+    assert [r["error"] for r in summary["results"]] == ["NOT_ATTEMPTED", "FILE_EXISTS"]
+    assert (tmp_path / "taken.mkv").read_text() == "existing"
+
+
+async def test_swaps_and_chains_are_applied(tmp_path):
+    """Test a swap and a shift both land, verified afterwards."""
+    paths = _files(tmp_path, 4)
+    items = [
+        {"original_path": str(paths[0]), "new_name": "file1.mkv"},
+        {"original_path": str(paths[1]), "new_name": "file0.mkv"},
+        {"original_path": str(paths[2]), "new_name": "file3.mkv"},
+        {"original_path": str(paths[3]), "new_name": "file4.mkv"},
+    ]
+    summary = await BatchRenamer(items).run()
+
+    assert summary["success"], summary["results"]
+    assert [p.name for p in sorted(tmp_path.iterdir())] == [
+        "file0.mkv", "file1.mkv", "file3.mkv", "file4.mkv"
+    ]
+    assert (tmp_path / "file0.mkv").read_text() == "1"
+    assert (tmp_path / "file1.mkv").read_text() == "0"
+    assert (tmp_path / "file3.mkv").read_text() == "2"
+    assert (tmp_path / "file4.mkv").read_text() == "3"
+
+
+async def test_failed_cycle_is_restored_in_best_effort(tmp_path, monkeypatch):
+    """Test a cycle that fails half way does not strand a temporary file."""
+    a, b = _files(tmp_path, 2)
+    items = [
+        {"original_path": str(a), "new_name": b.name},
+        {"original_path": str(b), "new_name": a.name},
+    ]
+    real_rename = os.rename
+
+    def flaky_rename(source, target):
+        if str(source) == str(b):
+            raise OSError(5, "I/O error", source)
+        real_rename(source, target)
+
+    monkeypatch.setattr(batch_rename.os, "rename", flaky_rename)
+    summary = await BatchRenamer(items).run()
+
+    assert summary["renamed"] == 0
+    assert [r["error"] for r in summary["results"]] == ["NOT_ATTEMPTED", "OS_ERROR"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["file0.mkv", "file1.mkv"]
+    assert a.read_text() == "0"
+
+
+def test_rename_batch_route_streams_progress(tmp_path):
+    """Test the NDJSON stream ends with the summary."""
+    paths = _files(tmp_path, 3)
+    body = {"items": [{"original_path": str(p), "new_name": f"Ep{i}.mkv"} for i, p in enumerate(paths)]}
+    with TestClient(app) as client:
+        response = client.post("/api/files/rename-batch?stream=true", json=body)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        plain = client.post("/api/files/rename-batch", json=body)
+
+    assert lines[0]["type"] == "validated"
+    assert lines[-1]["type"] == "done" and lines[-1]["renamed"] == 3
+    assert plain.json()["failed"] == 3  # the originals are gone now
+    assert plain.json()["results"][0]["error"] == "FILE_NOT_FOUND"
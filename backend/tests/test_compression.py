@@ -0,0 +1,144 @@
+"""Tests for response compression."""
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.compression import CompressionMiddleware, negotiate_encoding
+from app.services.response_cache import ResponseCache
+
+
+def test_negotiate_encoding_honours_q_values():
+    """Test Accept-Encoding parsing and q=0 exclusion."""
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("*") in ("br", "gzip")
+
+
+def _make_app(store=None):
+    small_app = FastAPI()
+
+    @small_app.get("/small")
+    async def small():
+        return Response(b"{}", media_type="application/json")
+
+    @small_app.get("/large")
+    async def large():
+        return Response(
+            b'{"x":"' + b"a" * 5000 + b'"}',
+            media_type="application/json",
+            headers={"ETag": '"large"'},
+        )
+
+    small_app.add_middleware(CompressionMiddleware, minimum_size=1024, variant_store=store)
+    return small_app
+
+
+def test_threshold_and_variant_reuse():
+    """Test small bodies stay identity and large ones reuse the stored variant."""
+
+    class Store:
+        def __init__(self):
+            self.variants = {}
+            self.gets = 0
+
+        def get_variant(self, etag, encoding):
+            self.gets += 1
+            return self.variants.get((etag, encoding))
+
+        def add_variant(self, etag, encoding, body):
+            self.variants[(etag, encoding)] = body
+
+    store = Store()
+    client = TestClient(_make_app(store))
+    headers = {"Accept-Encoding": "gzip"}
+
+    small = client.get("/small", headers=headers)
+    first = client.get("/large", headers=headers)
+    second = client.get("/large", headers=headers)
+
+    assert "content-encoding" not in small.headers
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"] == '"large-gzip"'
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.json() == second.json()
+    assert list(store.variants) == [('"large"', "gzip")]
+    assert store.gets == 2
+
+
+def test_vary_and_etag_on_every_negotiated_response():
+    """Test identity responses vary too and keep the uncompressed ETag."""
+    client = TestClient(_make_app())
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == '"large"'
+    assert identity.headers["vary"] == "Accept-Encoding"
+
+
+def test_encoded_etag_revalidates(fake_tmdb_service, monkeypatch):
+    """Test If-None-Match with a gzip ETag gets a 304 with Vary."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    headers = {"X-API-Key": "compression-etag-test"}
+    with TestClient(app) as client:
+        first = client.get(
+            "/api/person/3000/filmography", headers={**headers, "Accept-Encoding": "gzip"}
+        )
+        identity = client.get(
+            "/api/person/3000/filmography", headers={**headers, "Accept-Encoding": "identity"}
+        )
+        etag = first.headers["ETag"]
+        gzip_304 = client.get(
+            "/api/person/3000/filmography",
+            headers={**headers, "Accept-Encoding": "gzip", "If-None-Match": etag},
+        )
+        identity_304 = client.get(
+            "/api/person/3000/filmography",
+            headers={**headers, "Accept-Encoding": "identity", "If-None-Match": etag},
+        )
+
+    assert etag == identity.headers["ETag"][:-1] + '-gzip"'
+    assert gzip_304.status_code == 304
+    assert gzip_304.headers["ETag"] == etag
+    assert "Accept-Encoding" in gzip_304.headers["vary"]
+    assert identity_304.status_code == 304
+    assert identity_304.headers["ETag"] == identity.headers["ETag"]
+
+
+def test_cached_route_is_precompressed_once(fake_tmdb_service, monkeypatch):
+    """Test a response cache entry keeps its gzip variant across hits."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    headers = {"X-API-Key": "compression-test", "Accept-Encoding": "gzip"}
+    with TestClient(app) as client:
+        first = client.get("/api/person/3000/filmography", headers=headers)
+        second = client.get("/api/person/3000/filmography", headers=headers)
+        identity = client.get(
+            "/api/person/3000/filmography",
+            headers={"X-API-Key": "compression-test", "Accept-Encoding": "identity"},
+        )
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert second.headers["X-Cache"] == "HIT"
+    assert first.content == second.content == identity.content
+    assert routes.response_cache.get_stats()["compressed_bytes"] > 0
+
+
+def test_entries_include_variants():
+    """Test memory accounting sees compressed copies."""
+    cache = ResponseCache()
+    entry = cache.set("/details:a", b"{}" * 1000)
+    cache.add_variant(entry.etag, "gzip", gzip.compress(entry.body))
+
+    (_, parts), = cache.entries()
+    assert len(parts) == 2
+    assert cache.get_variant(entry.etag, "gzip") == parts[1]
@@ -0,0 +1,77 @@
+"""Tests for cancelling request handling on client disconnect."""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.services.disconnect import DisconnectCancellationMiddleware, DisconnectStats
+from app.services.tmdb import TMDBService
+from benchmarks.fake_tmdb import FakeTMDBConfig, create_app
+
+
+def _slow_service():
+    fake = create_app(
+        FakeTMDBConfig(seed=7, num_movies=50_000, num_shows=5_000, num_people=20_000,
+                       latency="fixed", latency_ms=300)
+    )
+    return TMDBService(
+        api_key="test-key",
+        base_url="http://fake-tmdb/3",
+        transport=httpx.ASGITransport(app=fake),
+    )
+
+
+def _app(service, stats):
+    inner = FastAPI()
+
+    @inner.get("/details")
+    async def details():
+        return await service._make_request("/movie/7", {})
+
+    return DisconnectCancellationMiddleware(inner, stats=stats)
+
+
+async def _call(app, disconnect_after):
+    sent = []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/details", "raw_path": b"/details",
+        "query_string": b"", "root_path": "", "headers": [], "server": ("test", 80),
+        "client": ("test", 1),
+    }
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+async def test_disconnect_cancels_upstream_work():
+    """Test a disconnect mid-request cancels the handler and its fetch."""
+    service, stats = _slow_service(), DisconnectStats()
+    sent = await _call(_app(service, stats), disconnect_after=0.05)
+
+    assert sent == []
+    assert stats.cancelled_requests == 1
+    assert stats.get_stats()["cancelled_by_route"] == {"/details": 1}
+    assert service.cancelled_requests == 1
+    assert service._inflight == {}
+
+
+async def test_completed_request_is_not_cancelled():
+    """Test a client that stays connected gets the full response."""
+    service, stats = _slow_service(), DisconnectStats()
+    sent = await _call(_app(service, stats), disconnect_after=5)
+
+    assert sent[0]["status"] == 200
+    assert stats.cancelled_requests == 0
+    assert service.cancelled_requests == 0
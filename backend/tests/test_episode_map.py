@@ -0,0 +1,57 @@
+"""Tests for the whole-series episode map."""
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.episodes import EpisodeMap
+
+
+class TestEpisodeMap:
+    """Test the lookup table itself."""
+
+    def test_lookup_and_round_trip(self):
+        """Test O(1) lookups survive conversion to JSON form and back."""
+        episode_map = EpisodeMap.from_season_payloads(
+            1,
+            "Show",
+            [{"season_number": 2, "episodes": [
+                {"episode_number": 5, "name": "Five", "air_date": "2020-01-05"}
+            ]}],
+        )
+        restored = EpisodeMap.from_dict(episode_map.to_dict())
+
+        assert restored.lookup(2, 5) == {"title": "Five", "air_date": "2020-01-05"}
+        assert restored.title(2, 6) is None
+        assert restored.lookup(9, 1) is None
+        assert episode_map.to_dict()["seasons"]["2"]["5"]["title"] == "Five"
+
+
+async def test_all_seasons_fetched_once_and_cached(fake_tmdb_app, fake_tmdb_service):
+    """Test the map covers every season and a second call is served from cache."""
+    show = fake_tmdb_app.state.catalog.show(77)
+
+    episode_map = await fake_tmdb_service.get_episode_map(77)
+    requests_after_first = fake_tmdb_app.state.stats["requests"]
+    again = await fake_tmdb_service.get_episode_map(77)
+
+    assert requests_after_first == 1 + len(show["seasons"])
+    assert fake_tmdb_app.state.stats["requests"] == requests_after_first
+    assert again is episode_map
+    assert episode_map.episode_count == show["number_of_episodes"]
+    last = show["seasons"][-1]
+    assert episode_map.lookup(last["season_number"], last["episode_count"]) is not None
+
+
+def test_episode_map_route(fake_tmdb_service, monkeypatch):
+    """Test the route returns the compact season/episode map."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    with TestClient(app) as client:
+        response = client.get(
+            "/api/tv/12/episode-map?include_specials=false", headers={"X-API-Key": "k"}
+        )
+
+    data = response.json()
+    assert response.status_code == 200
+    assert "0" not in data["seasons"]
+    assert data["seasons"]["1"]["1"]["title"]
@@ -0,0 +1,87 @@
+"""Tests for the synthetic TMDB server and TMDBService running against it."""
+
+import httpx
+
+from benchmarks.fake_tmdb import FakeTMDBConfig, SyntheticCatalog, create_app
+from app.services.tmdb import TMDBService
+
+
+class TestSyntheticCatalog:
+    """Test the deterministic catalog generator."""
+
+    def test_entities_are_deterministic_per_seed(self):
+        """Test the same seed always yields the same entity."""
+        first = SyntheticCatalog(FakeTMDBConfig(seed=1))
+        second = SyntheticCatalog(FakeTMDBConfig(seed=1))
+        other = SyntheticCatalog(FakeTMDBConfig(seed=2))
+
+        assert first.show(123) == second.show(123)
+        assert first.movie(1_999_999) == second.movie(1_999_999)
+        assert first.movie(55) != other.movie(55)
+
+    def test_search_inverts_generated_titles(self):
+        """Test searching a generated title finds the entity carrying it."""
+        catalog = SyntheticCatalog(FakeTMDBConfig())
+        title = catalog.title_for(987_654)
+
+        matches = catalog.search(title)
+        assert ("movie", 987_654) in matches
+        for media_type, entity_id in matches:
+            assert catalog.title_for(entity_id) == title
+
+    def test_prolific_people_have_thousands_of_credits(self):
+        """Test every Nth person has a huge credit list."""
+        config = FakeTMDBConfig(max_person_credits=3000)
+        catalog = SyntheticCatalog(config)
+        credits = catalog.combined_credits(config.prolific_person_every)
+
+        assert len(credits["cast"]) + len(credits["crew"]) >= 1500
+
+
+class TestFakeTMDBServer:
+    """Test TMDBService end to end against the fake server."""
+
+    async def test_service_shapes_fake_responses(self, fake_tmdb_service):
+        """Test details, seasons and episodes work through the real service."""
+        details = await fake_tmdb_service.get_details(42, "tv")
+        seasons = await fake_tmdb_service.get_tv_seasons(42)
+        episodes = await fake_tmdb_service.get_tv_episodes(42, seasons[0]["season_number"])
+
+        assert details["title"] == SyntheticCatalog(FakeTMDBConfig()).title_for(42)
+        assert all(s["season_number"] > 0 for s in seasons)
+        assert len(episodes) == seasons[0]["episode_count"]
+
+    async def test_search_multi_returns_mixed_results(self, fake_tmdb_service):
+        """Test search returns both movies and shows for a generated title."""
+        results = await fake_tmdb_service.search_multi("Silent River")
+
+        media_types = {r["media_type"] for r in results}
+        assert {"movie", "tv"} <= media_types
+        assert all(r["title"].startswith("Silent River") for r in results)
+
+    async def test_error_injection(self):
+        """Test the configured error rate surfaces as TMDB API errors."""
+        app = create_app(FakeTMDBConfig(num_movies=100, error_rate=1.0))
+        service = TMDBService(
+            api_key="test-key",
+            base_url="http://fake-tmdb/3",
+            transport=httpx.ASGITransport(app=app),
+        )
+
+        try:
+            await service.get_genres("movie")
+            raise AssertionError("Expected injected error")
+        except Exception as e:
+            assert "500" in str(e)
+        assert app.state.stats["errors"] >= 1
+
+    async def test_rate_limit_injection(self):
+        """Test 429 responses carry a Retry-After header."""
+        app = create_app(FakeTMDBConfig(rate_limit_rate=1.0))
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://fake-tmdb"
+        ) as client:
+            response = await client.get("/3/configuration", params={"api_key": "k"})
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
@@ -0,0 +1,113 @@
+"""Tests for off-loop file system calls with per-mount limits."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services import file_io
+from app.services.file_io import FileIO, FileIOTimeout, read_mount_points
+from app.services.file_service import FileService
+
+
+def _with_mounts(io, mounts):
+    io._mounts = sorted(mounts, key=len, reverse=True)
+    io._mounts_read_at = time.monotonic()
+    return io
+
+
+def test_mount_table_is_parsed(tmp_path):
+    """Test mount points are read and unescaped, longest first."""
+    table = tmp_path / "mounts"
+    table.write_text(
+        "/dev/sda1 / ext4 rw 0 0\n"
+        "//nas/media /mnt/My\\040Media cifs rw 0 0\n"
+        "nas:/tv /mnt/tv nfs rw 0 0\n"
+    )
+
+    assert read_mount_points(str(table)) == ["/mnt/My Media", "/mnt/tv", "/"]
+    assert read_mount_points(str(tmp_path / "missing")) is None
+
+
+def test_mount_of_uses_longest_prefix():
+    """Test paths map to their mount without touching the disk."""
+    io = _with_mounts(FileIO(), ["/", "/mnt/tv", "/mnt/tv2"])
+
+    assert io.mount_of("/mnt/tv/Show/ep1.mkv") == "/mnt/tv"
+    assert io.mount_of("/mnt/tv2/ep1.mkv") == "/mnt/tv2"
+    assert io.mount_of("/home/user/ep1.mkv") == "/"
+
+
+async def test_hung_mount_is_isolated():
+    """Test a hung share times out and fills only its own slots."""
+    io = _with_mounts(FileIO(max_workers=4, per_mount_limit=2, timeout=0.2), ["/", "/mnt/nas"])
+    hung = threading.Event()
+    try:
+        stuck = await asyncio.gather(
+            *(io.run("/mnt/nas/a.mkv", hung.wait) for _ in range(2)), return_exceptions=True
+        )
+        assert all(isinstance(e, FileIOTimeout) for e in stuck)
+
+        # Both slots are still held by the stuck calls: the next one is turned
+        # away, while the local disk is unaffected
+        with pytest.raises(FileIOTimeout, match="not responding"):
+            await io.run("/mnt/nas/b.mkv", lambda: "never")
+        assert await io.run("/home/user/c.mkv", lambda: "ok") == "ok"
+
+        stats = io.get_stats()["mounts"]
+        assert stats["/mnt/nas"] == {"in_flight": 2, "completed": 0, "timeouts": 2, "rejected": 1}
+        assert stats["/"]["completed"] == 1
+    finally:
+        hung.set()
+        io.shutdown()
+
+
+async def test_rename_file_async_reports_timeouts(tmp_path, monkeypatch):
+    """Test a rename that never returns becomes a TIMEOUT result."""
+    (tmp_path / "a.mkv").write_text("a")
+    result = await FileService.rename_file_async(str(tmp_path / "a.mkv"), "b.mkv")
+    assert result["success"] and (tmp_path / "b.mkv").exists()
+
+    hung = threading.Event()
+    io = FileIO(max_workers=2, per_mount_limit=1, timeout=0.1)
+    monkeypatch.setattr(file_io, "_file_io", io)
+    monkeypatch.setattr(FileService, "rename_file", staticmethod(lambda *args: hung.wait()))
+    try:
+        result = await FileService.rename_file_async(str(tmp_path / "b.mkv"), "c.mkv")
+    finally:
+        hung.set()
+        io.shutdown()
+
+    assert result["error"] == "TIMEOUT"
+
+
+async def test_late_rename_is_still_recorded(tmp_path, monkeypatch):
+    """Test a rename finishing after its timeout still reaches on_renamed."""
+    (tmp_path / "a.mkv").write_text("a")
+    slow = threading.Event()
+    recorded = []
+    rename = FileService.rename_file
+
+    def slow_rename(original_path, new_name):
+        slow.wait()
+        return rename(original_path, new_name)
+
+    io = FileIO(max_workers=2, per_mount_limit=1, timeout=0.1)
+    monkeypatch.setattr(file_io, "_file_io", io)
+    monkeypatch.setattr(FileService, "rename_file", staticmethod(slow_rename))
+    try:
+        result = await FileService.rename_file_async(
+            str(tmp_path / "a.mkv"), "b.mkv", on_renamed=lambda *paths: recorded.append(paths)
+        )
+        slow.set()
+        deadline = time.monotonic() + 5
+        while not recorded:
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.01)
+    finally:
+        slow.set()
+        io.shutdown()
+
+    assert result["error"] == "TIMEOUT"
+    assert recorded == [(str(tmp_path / "a.mkv"), str(tmp_path / "b.mkv"))]
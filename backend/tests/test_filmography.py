@@ -0,0 +1,101 @@
+"""Tests for filtered, paginated and streamed filmography."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.filmography import (
+    FilmographyFilters,
+    FilmographyIndex,
+    InvalidCursorError,
+    decode_cursor,
+)
+
+
+def make_index(count: int = 10) -> FilmographyIndex:
+    cast = [
+        {"id": i, "media_type": "movie" if i % 2 else "tv", "year": 2000 + i, "role_type": "cast"}
+        for i in range(count)
+    ]
+    crew = [
+        {"id": 100 + i, "media_type": "movie", "year": 2000 + i, "role_type": "crew",
+         "department": "Directing", "job": "Director"}
+        for i in range(0, count, 3)
+    ]
+    return FilmographyIndex({"id": 1, "name": "Someone"}, cast, crew)
+
+
+class TestFilmographyIndex:
+    """Test the presorted index."""
+
+    def test_credits_are_presorted_newest_first(self):
+        """Test merged credits are ordered by year descending."""
+        years = [c["year"] for c in make_index().credits]
+        assert years == sorted(years, reverse=True)
+
+    def test_pages_cover_all_matches_once(self):
+        """Test following cursors returns every match exactly once."""
+        index = make_index(25)
+        filters = FilmographyFilters(media_type="movie")
+
+        seen, cursor = [], None
+        while True:
+            items, cursor = index.page(filters, cursor, limit=4)
+            seen.extend(items)
+            if cursor is None:
+                break
+
+        expected = [c for c in index.credits if c["media_type"] == "movie"]
+        assert seen == expected
+
+    def test_filters_combine(self):
+        """Test role, job and year filters apply together."""
+        index = make_index(10)
+        data = index.to_dict(FilmographyFilters(job="director", year_from=2003, year_to=2006))
+
+        assert data["cast"] == []
+        assert [c["year"] for c in data["crew"]] == [2006, 2003]
+
+    def test_invalid_cursor(self):
+        """Test garbage cursors raise a dedicated error."""
+        try:
+            decode_cursor("not-a-cursor")
+            raise AssertionError("Expected InvalidCursorError")
+        except InvalidCursorError:
+            pass
+
+
+async def test_index_is_built_once(fake_tmdb_app, fake_tmdb_service):
+    """Test repeated filmography calls reuse the cached index without re-sorting."""
+    first = await fake_tmdb_service.get_filmography_index(3000)
+    second = await fake_tmdb_service.get_filmography_index(3000)
+    legacy = await fake_tmdb_service.get_person_filmography(3000)
+
+    assert first is second
+    assert legacy["cast"] is first.cast
+    assert fake_tmdb_app.state.stats["requests"] == 2
+
+
+def test_filmography_route_modes(fake_tmdb_service, monkeypatch):
+    """Test paginated and NDJSON modes of the filmography route."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    headers = {"X-API-Key": "k"}
+    with TestClient(app) as client:
+        page = client.get("/api/person/2000/filmography?limit=5&role_type=cast", headers=headers)
+        streamed = client.get("/api/person/2000/filmography?stream=true&limit=100", headers=headers)
+        bad = client.get("/api/person/2000/filmography?cursor=zzz", headers=headers)
+
+    body = page.json()
+    assert len(body["credits"]) == 5
+    assert all(c["role_type"] == "cast" for c in body["credits"])
+    assert body["next_cursor"]
+
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert lines[0]["type"] == "person"
+    assert lines[-1]["type"] == "end"
+    assert lines[-1]["count"] == sum(len(l["credits"]) for l in lines[1:-1])
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+
+    assert bad.status_code == 400
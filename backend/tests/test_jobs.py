@@ -0,0 +1,196 @@
+"""Tests for durable background jobs and their routes."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.jobs import JobManager, JobStore
+from app.services.rename_journal import RenameJournal
+
+
+class _Gate:
+    """Runner that reports progress, then waits until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.running = 0
+        self.most_running = 0
+        self.contexts = []
+
+    async def __call__(self, context):
+        self.contexts.append(context)
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        try:
+            context.report({"step": 1})
+            await self.release.wait()
+            return {"value": context.params["value"]}
+        finally:
+            self.running -= 1
+
+
+async def _settle(manager, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while manager.get(job_id)["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline, manager.get(job_id)
+        await asyncio.sleep(0.01)
+    return manager.get(job_id)
+
+
+async def test_limit_per_type_and_cancel(tmp_path):
+    """Test jobs past a type's limit wait, and queued or running jobs cancel."""
+    manager = JobManager(str(tmp_path / "jobs.sqlite3"), progress_interval=0)
+    gate = _Gate()
+    manager.register("slow", gate, limit=1, needs_api_key=False)
+
+    jobs = [manager.submit("slow", {"value": n}, None) for n in range(3)]
+    await asyncio.sleep(0.05)
+    assert [manager.get(job["id"])["status"] for job in jobs] == ["running", "queued", "queued"]
+    assert manager.get(jobs[0]["id"])["progress"] == {"step": 1}
+    assert manager.stats()["running"] == {"slow": 1}
+
+    manager.cancel(jobs[1]["id"])
+    gate.release.set()
+    done = [await _settle(manager, job["id"]) for job in jobs]
+
+    assert [job["status"] for job in done] == ["completed", "cancelled", "completed"]
+    assert done[2]["result"] == {"value": 2}
+    assert gate.most_running == 1
+    # Finished jobs are read back from SQLite
+    assert JobStore(str(tmp_path / "jobs.sqlite3")).get(jobs[0]["id"])["result"] == {"value": 0}
+    await manager.shutdown()
+
+
+async def test_failures_are_recorded(tmp_path):
+    """Test a runner's exception fails the job with its message."""
+    async def broken(context):
+        raise ValueError("no such folder")
+
+    manager = JobManager(str(tmp_path / "jobs.sqlite3"))
+    manager.register("broken", broken, limit=1, needs_api_key=False)
+    job = await _settle(manager, manager.submit("broken", {}, None)["id"])
+
+    assert (job["status"], job["error"], job["attempts"]) == ("failed", "no such folder", 1)
+    await manager.shutdown()
+
+
+async def test_resume_after_restart(tmp_path):
+    """Test unfinished jobs run again in a new manager on the same file."""
+    path = str(tmp_path / "jobs.sqlite3")
+    first = JobManager(path)
+    first.register("slow", _Gate(), limit=1, needs_api_key=False)
+    first.register("tmdb", _Gate(), limit=1, needs_api_key=True)
+    running = first.submit("slow", {"value": 1}, None)
+    queued = first.submit("slow", {"value": 2}, None)
+    keyed = first.submit("tmdb", {"value": 3}, "client-key")
+    await asyncio.sleep(0.05)
+    await first.shutdown()
+
+    second = JobManager(path)
+    gate = _Gate()
+    gate.release.set()
+    second.register("slow", gate, limit=1, needs_api_key=False)
+    second.register("tmdb", gate, limit=1, needs_api_key=True)
+    assert second.resume(server_api_key=None) == 2
+
+    resumed = await _settle(second, running["id"])
+    assert (resumed["status"], resumed["attempts"], resumed["result"]) == (
+        "completed", 2, {"value": 1}
+    )
+    assert (await _settle(second, queued["id"]))["status"] == "completed"
+    assert gate.contexts[0].resumed
+    # Client keys are never stored, so this one cannot continue
+    failed = second.get(keyed["id"])
+    assert failed["status"] == "failed"
+    assert "submit it again" in failed["error"]
+    await second.shutdown()
+
+
+async def test_resumed_organize_skips_renamed_files(
+    tmp_path, fake_tmdb_app, fake_tmdb_service, monkeypatch
+):
+    """Test a resumed organize reports files it already renamed as unchanged."""
+    show = fake_tmdb_app.state.catalog.show(12)
+    library = tmp_path / "library"
+    library.mkdir()
+    for number in (1, 2):
+        (library / f"{show['name'].replace(' ', '.')}.S01E{number:02d}.mkv").write_bytes(b"")
+    journal = RenameJournal(str(tmp_path / "journal"))
+
+    async def rename_journal():
+        return journal
+
+    monkeypatch.setattr(routes, "_rename_journal", rename_journal)
+    monkeypatch.setattr(routes, "get_job_tmdb_service", lambda api_key: fake_tmdb_service)
+    context = SimpleNamespace(
+        params={"root": str(library), "dry_run": False},
+        api_key="k",
+        created_at=time.time(),
+        resumed=False,
+        report=lambda progress: None,
+    )
+
+    first = await routes._organize_job(context)
+    context.resumed = True
+    second = await routes._organize_job(context)
+    journal.close()
+
+    assert first["counts"] == {"renamed": 2}
+    assert second["counts"] == {"unchanged": 2}
+    assert second["searches"] == 0
+
+
+def test_job_routes(tmp_path, fake_tmdb_app, fake_tmdb_service, monkeypatch):
+    """Test submitting, polling, listing and streaming jobs over HTTP."""
+    show = fake_tmdb_app.state.catalog.show(12)
+    for number in (1, 2):
+        (tmp_path / f"{show['name'].replace(' ', '.')}.S01E{number:02d}.mkv").write_bytes(b"")
+    monkeypatch.setattr(routes, "get_job_tmdb_service", lambda api_key: fake_tmdb_service)
+
+    with TestClient(app) as client:
+        submitted = client.post(
+            "/api/jobs",
+            json={"type": "organize", "params": {"root": str(tmp_path)}},
+            headers={"X-API-Key": "k"},
+        )
+        assert submitted.status_code == 202
+        job_id = submitted.json()["id"]
+
+        with client.stream("GET", f"/api/jobs/{job_id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+        job = client.get(f"/api/jobs/{job_id}").json()
+        listed = client.get("/api/jobs", params={"type": "organize"}).json()["jobs"]
+        cancelled = client.post(f"/api/jobs/{job_id}/cancel")
+        scan_id = client.post(
+            "/api/jobs", json={"type": "library_scan", "params": {"root": str(tmp_path)}}
+        ).json()["id"]
+        deadline = time.monotonic() + 5
+        while (scan := client.get(f"/api/jobs/{scan_id}").json())["status"] != "completed":
+            assert time.monotonic() < deadline, scan
+            time.sleep(0.02)
+        missing = client.get("/api/jobs/nope")
+        invalid = client.post("/api/jobs", json={"type": "match", "params": {"names": "x"}})
+        unknown = client.post("/api/jobs", json={"type": "rename", "params": {}})
+        no_key = client.post("/api/jobs", json={"type": "match", "params": {"names": []}})
+        stats = client.get("/api/diagnostics/jobs").json()
+
+    events = [block.split("\n") for block in body.strip().split("\n\n")]
+    assert events[-1][0] == "event: completed"
+    assert json.loads(events[-1][1][len("data: "):])["id"] == job_id
+    assert job["status"] == "completed"
+    assert job["result"]["counts"] == {"planned": 2}
+    assert job["params"] == {"root": str(tmp_path), "dry_run": True}
+    assert listed[0]["id"] == job_id and listed[0]["result"] is None
+    assert cancelled.json()["status"] == "completed"
+    assert scan["result"]["media"] == 2
+    assert missing.status_code == 404
+    assert invalid.status_code == 422
+    assert unknown.status_code == 422
+    assert no_key.status_code in (202, 400)
+    assert stats["limits"]["organize"] == 1  # 202 only when the server has its own key
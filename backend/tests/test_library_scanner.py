@@ -0,0 +1,109 @@
+"""Tests for the library scanner and its file index."""
+
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import library_scanner
+from app.services.library_scanner import LibraryIndex, LibraryScanner, classify
+
+
+def _library(root, shows=3, episodes=4):
+    for show in range(shows):
+        season = root / f"Show {show}" / "Season 01"
+        season.mkdir(parents=True)
+        for episode in range(episodes):
+            (season / f"e{episode}.mkv").write_bytes(b"x" * episode)
+            (season / f"e{episode}.en.srt").write_text("1")
+        (season / "folder.jpg").write_bytes(b"")
+    (root / ".trash").mkdir()
+    (root / ".trash" / "old.mkv").write_bytes(b"")
+
+
+def _scan(index, root, **kwargs):
+    return LibraryScanner(index, str(root), workers=4, **kwargs).run()
+
+
+def test_classify():
+    """Test media and sidecar extensions are recognised case-insensitively."""
+    assert classify("Movie.MKV") == "media"
+    assert classify("Movie.en.srt") == "sidecar"
+    assert classify("movie.nfo") == "sidecar"
+    assert classify("poster.jpg") is None
+
+
+def test_scan_indexes_media_and_sidecars(tmp_path):
+    """Test a first scan records every media and sidecar file."""
+    root = tmp_path / "tv"
+    _library(root)
+    index = LibraryIndex(str(tmp_path / "index.sqlite3"))
+
+    summary = _scan(index, root)
+
+    assert summary["media"] == 12 and summary["sidecar"] == 12
+    assert summary["directories"] == 7  # root, 3 shows, 3 seasons; .trash skipped
+    (entry,) = index.files(root=str(root / "Show 1"), kind="media", limit=1, offset=2)
+    assert entry["name"] == "e2.mkv" and entry["size"] == 2
+    assert entry["inode"] == os.stat(root / "Show 1" / "Season 01" / "e2.mkv").st_ino
+
+
+def test_non_utf8_names_are_skipped_and_counted(tmp_path):
+    """Test a file or folder name that is not UTF-8 does not abort the scan."""
+    root = tmp_path / "tv"
+    _library(root, shows=1, episodes=2)
+    folder = os.fsencode(str(root / "Show 0" / "Season 01"))
+    with open(os.path.join(folder, b"Episode \xff.mkv"), "wb"):
+        pass
+    os.mkdir(os.path.join(os.fsencode(str(root)), b"Extras \xfe"))
+    index = LibraryIndex(str(tmp_path / "index.sqlite3"))
+
+    summary = _scan(index, root)
+
+    assert summary["skipped_names"] == 2
+    assert summary["media"] == 2 and summary["errors"] == 0
+
+
+def test_rescan_only_lists_changed_directories(tmp_path, monkeypatch):
+    """Test an unchanged rescan lists nothing, and changes are picked up."""
+    root = tmp_path / "tv"
+    _library(root)
+    index = LibraryIndex(str(tmp_path / "index.sqlite3"))
+    _scan(index, root)
+
+    listed = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(
+        library_scanner.os, "scandir", lambda path: listed.append(path) or real_scandir(path)
+    )
+    summary = _scan(index, root)
+    assert listed == []
+    assert summary["unchanged_directories"] == 7 and summary["media"] == 12
+
+    season = root / "Show 2" / "Season 01"
+    (season / "e0.mkv").rename(season / "S01E01.mkv")
+    os.rename(root / "Show 0", tmp_path / "moved-away")
+    summary = _scan(index, root)
+
+    assert sorted(listed) == [str(root), str(season)]
+    assert summary["removed_directories"] == 2
+    assert summary["media"] == 8
+    names = [f["name"] for f in index.files(root=str(season), kind="media")]
+    assert names == ["S01E01.mkv", "e1.mkv", "e2.mkv", "e3.mkv"]
+
+
+def test_scan_route_streams_progress(tmp_path):
+    """Test the NDJSON stream ends with the summary and files can be listed."""
+    root = tmp_path / "tv"
+    _library(root, shows=2, episodes=2)
+    with TestClient(app) as client:
+        response = client.post("/api/library/scan?stream=true", json={"root": str(root)})
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        files = client.get("/api/library/files", params={"root": str(root), "kind": "media"})
+        missing = client.post("/api/library/scan", json={"root": str(tmp_path / "nope")})
+
+    assert lines[0]["type"] == "progress"
+    assert lines[-1]["type"] == "done" and lines[-1]["media"] == 4
+    assert len(files.json()["files"]) == 4
+    assert missing.status_code == 400
@@ -0,0 +1,65 @@
+"""Tests for the event-loop lag monitor."""
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.loop_monitor import LoopLagMonitor
+
+
+def blocking_handler(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class TestLoopLagMonitor:
+    """Test lag measurement and slow-callback capture."""
+
+    async def test_blocking_call_is_flagged_with_stack(self):
+        """Test a blocking callback is reported with the offending frame."""
+        monitor = LoopLagMonitor(interval_ms=10, slow_callback_ms=50)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            blocking_handler(0.2)
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["slow_callbacks"] >= 1
+        assert stats["lag_max_ms"] >= 150
+        event = stats["recent_slow_callbacks"][-1]
+        assert any("blocking_handler" in line for line in event["stack"])
+
+    async def test_idle_loop_has_low_lag(self):
+        """Test an idle loop records samples without slow callbacks."""
+        monitor = LoopLagMonitor(interval_ms=5, slow_callback_ms=200)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["samples"] > 5
+        assert stats["slow_callbacks"] == 0
+        assert not stats["running"]
+
+    def test_percentiles_from_recorded_lag(self):
+        """Test lag percentiles are published in milliseconds."""
+        monitor = LoopLagMonitor(slow_callback_ms=1000)
+        for lag in [0.001] * 98 + [0.05, 0.5]:
+            monitor.record_lag(lag)
+
+        stats = monitor.get_stats()
+        assert stats["lag_p50_ms"] == 1.0
+        assert stats["lag_max_ms"] == 500.0
+
+
+def test_loop_stats_endpoint():
+    """Test the lifespan starts the monitor and the endpoint reports it."""
+    with TestClient(app) as client:
+        stats = client.get("/api/diagnostics/loop").json()
+
+    assert stats["running"] is True
+    assert "lag_p99_ms" in stats
@@ -0,0 +1,61 @@
+"""Tests for memory footprint introspection."""
+
+import sys
+import tracemalloc
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.memory import build_memory_report, deep_sizeof, endpoint_class
+
+
+class TestDeepSize:
+    """Test deep-size accounting helpers."""
+
+    def test_deep_sizeof_counts_nested_values(self):
+        """Test nested containers are included in the total."""
+        payload = {"results": [{"title": str(i) * 1000} for i in range(10)]}
+        assert deep_sizeof(payload) > 10 * sys.getsizeof("x" * 1000)
+
+    def test_shared_objects_counted_once(self):
+        """Test objects reachable twice are not double counted."""
+        shared = ["y" * 5000]
+        assert deep_sizeof([shared, shared]) < 2 * deep_sizeof(shared)
+
+    def test_endpoint_class(self):
+        """Test cache keys group by endpoint with IDs collapsed."""
+        assert endpoint_class("/person/31/combined_credits:-123") == (
+            "/person/{id}/combined_credits"
+        )
+
+
+async def test_report_groups_cached_payloads_by_endpoint(fake_tmdb_service):
+    """Test cache tiers report per-endpoint totals and the largest payloads."""
+    await fake_tmdb_service.get_person_filmography(1000)
+    await fake_tmdb_service.get_genres("tv")
+
+    report = build_memory_report(top_n=3)
+    tier = report["cache_tiers"]["tmdb_responses"]
+
+    assert "/person/{id}/combined_credits" in tier["by_endpoint"]
+    assert "/genre/tv/list" in tier["by_endpoint"]
+    largest = tier["largest_entries"][0]
+    assert largest["key"].startswith("/person/1000/combined_credits")
+    assert tier["bytes"] >= largest["bytes"]
+
+
+def test_memory_endpoint_starts_tracemalloc():
+    """Test the endpoint reports process memory and can enable tracemalloc."""
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        with TestClient(app) as client:
+            first = client.get("/api/diagnostics/memory?trace=true").json()
+            second = client.get("/api/diagnostics/memory").json()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    assert first["tracemalloc"]["tracing"] is True
+    assert "growth_since_last_report" in second["tracemalloc"]
+    assert first["inflight_requests"]["count"] >= 1
+    assert "rss_bytes" in first["process"]
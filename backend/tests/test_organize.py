@@ -0,0 +1,160 @@
+"""Tests for the streaming organize pipeline."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.organize import OrganizeCancelled, OrganizePipeline, render_name
+from app.services.release_parser import parse
+
+
+def _library(root, catalog, episodes=6):
+    """One show's first season in dotted scene names, a movie and a stray file."""
+    show = catalog.show(12)
+    season = root / "Show" / "Season 1"
+    season.mkdir(parents=True)
+    for number in range(1, episodes + 1):
+        (season / f"Electric.River.S01E{number:02d}.1080p.WEB-DL.mkv").write_bytes(b"")
+    (season / "Electric.River.S01E01.en.srt").write_text("1")
+    movie = catalog.movie(500)
+    (root / f"{movie['title']} ({movie['release_date'][:4]}).mkv").write_bytes(b"")
+    (root / "holiday.mkv").write_bytes(b"")
+    (root / ".trash").mkdir()
+    (root / ".trash" / "Electric.River.S01E09.mkv").write_bytes(b"")
+    return show, movie
+
+
+def test_render_name():
+    """Test episodes and movies are named like the rest of the app."""
+    episode = {
+        "media_type": "tv",
+        "episodes": [
+            {"season": 1, "episode": 1, "title": "Pilot: Part 1"},
+            {"season": 1, "episode": 2, "title": "Pilot: Part 2"},
+        ],
+    }
+    assert render_name(parse("show.s01e01e02.720p.mkv"), episode) == "S01E01-E02 - Pilot- Part 1 (720p).mkv"
+    movie = {"media_type": "movie", "title": "Movie", "year": 2010, "episodes": []}
+    assert render_name(parse("movie.2010.2160p.mkv"), movie) == "Movie [2010](2160p).mkv"
+    assert render_name(parse("show.s01e01.mkv"), {"media_type": "tv", "episodes": []}) is None
+
+
+async def test_dry_run_plans_names(tmp_path, fake_tmdb_app, fake_tmdb_service):
+    """Test every media file gets an outcome and nothing is renamed."""
+    show, movie = _library(tmp_path, fake_tmdb_app.state.catalog)
+    events = []
+    pipeline = OrganizePipeline(fake_tmdb_service, str(tmp_path), emit=events.append)
+
+    summary = await pipeline.run()
+
+    files = {event["path"].rsplit("/", 1)[-1]: event for event in events if event["type"] == "file"}
+    assert summary["files"] == len(files) == 8
+    assert summary["counts"] == {"planned": 7, "unmatched": 1}
+    assert summary["searches"] == 3  # show, movie and the stray file
+    assert summary["episode_maps"] == 1
+    first = fake_tmdb_app.state.catalog.season(12, 1)["episodes"][0]["name"]
+    assert files["Electric.River.S01E01.1080p.WEB-DL.mkv"]["new_name"] == f"S01E01 - {first} (1080p).mkv"
+    assert files[f"{movie['title']} ({movie['release_date'][:4]}).mkv"]["new_name"] == (
+        f"{movie['title']} [{movie['release_date'][:4]}].mkv"
+    )
+    assert files["holiday.mkv"]["status"] == "unmatched"
+    assert (tmp_path / "holiday.mkv").exists()
+
+    stages = {stage["name"]: stage for stage in summary["stages"]}
+    assert stages["scan"]["passed"] == stages["parse"]["received"] == 8
+    assert stages["match"]["finished"] == 1
+    assert stages["rename"]["finished"] == 7
+    assert all(stage["queue_depth"] == 0 for stage in summary["stages"])
+
+
+async def test_renames_files(tmp_path, fake_tmdb_app, fake_tmdb_service):
+    """Test a real run renames files in place and reports each one."""
+    _library(tmp_path, fake_tmdb_app.state.catalog, episodes=3)
+    pipeline = OrganizePipeline(
+        fake_tmdb_service, str(tmp_path), dry_run=False, rename_batch_size=2
+    )
+
+    summary = await pipeline.run()
+
+    assert summary["counts"]["renamed"] == 4
+    names = sorted(path.name for path in (tmp_path / "Show" / "Season 1").iterdir())
+    assert [name[:9] for name in names if name.endswith(".mkv")] == [
+        "S01E01 - ", "S01E02 - ", "S01E03 - "
+    ]
+
+
+async def test_rename_batches_of_one(tmp_path, fake_tmdb_app, fake_tmdb_service):
+    """Test a batch size of one still hands the rename stage a list."""
+    _library(tmp_path, fake_tmdb_app.state.catalog, episodes=2)
+    pipeline = OrganizePipeline(
+        fake_tmdb_service, str(tmp_path), dry_run=False, rename_batch_size=1
+    )
+
+    summary = await pipeline.run()
+
+    assert summary["counts"] == {"renamed": 3, "unmatched": 1}
+
+
+async def test_backpressure_bounds_queues(tmp_path, fake_tmdb_app, fake_tmdb_service):
+    """Test a slow consumer holds every queue at its capacity and loses nothing."""
+    _library(tmp_path, fake_tmdb_app.state.catalog, episodes=40)
+    depths = []
+    pipeline = None
+
+    async def slow_emit(event):
+        depths.append(max(stage["queue_depth"] for stage in pipeline.metrics()))
+        await asyncio.sleep(0.001)
+
+    pipeline = OrganizePipeline(
+        fake_tmdb_service, str(tmp_path), queue_size=3, rename_batch_size=2, emit=slow_emit
+    )
+    summary = await pipeline.run(metrics_interval=0.01)
+
+    assert summary["files"] == 42
+    assert max(depths) <= 3
+    stages = {stage["name"]: stage for stage in summary["stages"]}
+    assert stages["scan"]["blocked_seconds"] > 0
+
+
+async def test_cancel_stops_queued_renames(tmp_path, fake_tmdb_app, fake_tmdb_service):
+    """Test files queued behind the scan are not renamed after a cancel."""
+    _library(tmp_path, fake_tmdb_app.state.catalog, episodes=40)
+    originals = list(tmp_path.rglob("*.mkv"))
+    pipeline = None
+
+    def emit(event):
+        if event.get("status") == "renamed":
+            pipeline.cancel()
+
+    pipeline = OrganizePipeline(
+        fake_tmdb_service, str(tmp_path), dry_run=False, rename_batch_size=1, emit=emit
+    )
+    with pytest.raises(OrganizeCancelled):
+        await pipeline.run()
+
+    moved = [path for path in originals if not path.exists()]
+    assert len(moved) == pipeline.counts["renamed"] == 1
+
+
+def test_organize_route_streams(tmp_path, fake_tmdb_app, fake_tmdb_service, monkeypatch):
+    """Test POST /api/organize?stream=true sends file events then the summary."""
+    _library(tmp_path, fake_tmdb_app.state.catalog, episodes=2)
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/organize?stream=true", json={"root": str(tmp_path)}, headers={"X-API-Key": "k"}
+        )
+        missing = client.post(
+            "/api/organize", json={"root": str(tmp_path / "nope")}, headers={"X-API-Key": "k"}
+        )
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert sum(1 for event in events if event["type"] == "file") == 4
+    assert events[-1]["type"] == "done"
+    assert events[-1]["counts"]["planned"] == 3
+    assert missing.status_code == 400
@@ -0,0 +1,111 @@
+"""Tests for parallel multi-page search and discover."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+
+
+async def test_discover_fetches_requested_pages(fake_tmdb_app, fake_tmdb_service):
+    """Test several pages are aggregated in page order."""
+    results = await fake_tmdb_service.discover_media("movie", pages=3)
+
+    assert [r["id"] for r in results] == list(range(1, 61))
+    assert fake_tmdb_app.state.stats["requests"] == 3
+
+
+async def test_limit_avoids_unneeded_pages(fake_tmdb_app, fake_tmdb_service):
+    """Test the limit truncates results and skips pages it does not need."""
+    results = await fake_tmdb_service.discover_media("tv", pages=10, limit=25)
+
+    assert len(results) == 25
+    assert fake_tmdb_app.state.stats["requests"] == 2
+
+
+async def test_limit_keeps_page_order_when_pages_arrive_out_of_order(
+    fake_tmdb_service, monkeypatch
+):
+    """Test a later page answering first does not take an earlier page's place."""
+    real_request = fake_tmdb_service._make_request
+
+    async def make_request(endpoint, params, *args, **kwargs):
+        if params.get("page") == 2:
+            await asyncio.sleep(0.05)
+        return await real_request(endpoint, params, *args, **kwargs)
+
+    monkeypatch.setattr(fake_tmdb_service, "_make_request", make_request)
+    results = await fake_tmdb_service.discover_media("movie", pages=3, limit=50)
+
+    assert [r["id"] for r in results] == list(range(1, 51))
+
+
+async def test_pages_are_cached_independently(fake_tmdb_app, fake_tmdb_service):
+    """Test deeper browsing reuses pages fetched earlier."""
+    await fake_tmdb_service.discover_media("movie", pages=2)
+    await fake_tmdb_service.discover_media("movie", pages=4)
+
+    assert fake_tmdb_app.state.stats["requests"] == 4
+
+
+def _fail_page(service, monkeypatch, failing_page):
+    real_request = service._make_request
+
+    async def make_request(endpoint, params, *args, **kwargs):
+        if params.get("page") == failing_page:
+            raise Exception("upstream timed out")
+        return await real_request(endpoint, params, *args, **kwargs)
+
+    monkeypatch.setattr(service, "_make_request", make_request)
+    return real_request
+
+
+async def test_failed_page_is_an_error(fake_tmdb_service, monkeypatch):
+    """Test a page that fails is reported, not silently left out."""
+    _fail_page(fake_tmdb_service, monkeypatch, 2)
+
+    with pytest.raises(Exception, match="page 2"):
+        await fake_tmdb_service.discover_media("movie", pages=3)
+
+
+def test_partial_search_is_not_cached(fake_tmdb_service, monkeypatch):
+    """Test a search with a failed page returns an error and caches nothing."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    real_request = _fail_page(fake_tmdb_service, monkeypatch, 3)
+    url = "/api/search?query=Electric Garden&pages=3"
+    with TestClient(app) as client:
+        failed = client.get(url, headers={"X-API-Key": "k"})
+        streamed = client.get(url + "&stream=true", headers={"X-API-Key": "k"})
+        monkeypatch.setattr(fake_tmdb_service, "_make_request", real_request)
+        retried = client.get(url, headers={"X-API-Key": "k"})
+        complete = client.get(url + "&stream=true", headers={"X-API-Key": "k"})
+
+    assert failed.status_code == 500
+    assert json.loads(streamed.text.splitlines()[-1])["type"] == "error"
+    lines = [json.loads(line) for line in complete.text.splitlines()]
+    assert sorted(line["page"] for line in lines if line["type"] == "page") == [1, 2, 3]
+    assert retried.status_code == 200 and len(retried.json()) == lines[-1]["count"]
+
+
+async def test_search_single_page_is_unchanged(fake_tmdb_service):
+    """Test the default still returns only the first page."""
+    results = await fake_tmdb_service.search_multi("Silent River")
+    assert len(results) == 20
+
+
+def test_streamed_search(fake_tmdb_service, monkeypatch):
+    """Test stream mode emits one NDJSON line per page and an end line."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    with TestClient(app) as client:
+        response = client.get(
+            "/api/search?query=Silent River&pages=3&limit=50&stream=true",
+            headers={"X-API-Key": "k"},
+        )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    pages = [line for line in lines if line["type"] == "page"]
+    assert sorted(p["page"] for p in pages) == [1, 2, 3]
+    assert lines[-1] == {"type": "end", "count": 50}
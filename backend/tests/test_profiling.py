@@ -0,0 +1,69 @@
+"""Tests for the opt-in per-request profiler."""
+
+import pstats
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services.profiling import RequestProfiler
+
+
+class TestRequestProfiler:
+    """Test profile selection and output files."""
+
+    def test_disabled_profiler_never_profiles(self):
+        """Test the debug header is ignored unless the server enables profiling."""
+        profiler = RequestProfiler(enabled=False, sample_rate=1.0)
+        assert not profiler.should_profile("/api/search", {"x-debug-profile": "1"})
+
+    def test_sampling_rule_matches_path(self):
+        """Test the path pattern limits which requests are sampled."""
+        profiler = RequestProfiler(enabled=True, sample_rate=1.0, path_pattern="filmography")
+        assert profiler.should_profile("/api/person/1/filmography", {})
+        assert not profiler.should_profile("/api/search", {})
+
+    def test_sampling_mode_writes_folded_stacks(self, tmp_path):
+        """Test sampled stacks are written in flamegraph folded format."""
+        profiler = RequestProfiler(enabled=True, output_dir=str(tmp_path), interval_ms=0.5)
+
+        with profiler.profile("req-1") as session:
+            total = 0
+            for i in range(300_000):
+                total += i * i
+
+        lines = (tmp_path / "req-1.folded").read_text().splitlines()
+        assert session.samples > 0
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert "test_sampling_mode_writes_folded_stacks" in stack
+        assert int(count) > 0
+
+    def test_deterministic_mode_writes_pstats(self, tmp_path):
+        """Test cProfile output is readable by pstats."""
+        profiler = RequestProfiler(enabled=True, mode="deterministic", output_dir=str(tmp_path))
+
+        with profiler.profile("req/2"):
+            sorted(range(1000), reverse=True)
+
+        stats = pstats.Stats(str(tmp_path / "req_2.prof"))
+        assert stats.total_calls > 0
+
+
+def test_debug_header_profiles_request(tmp_path, monkeypatch):
+    """Test the middleware profiles a request carrying the debug header."""
+    monkeypatch.setattr(
+        main, "profiler", RequestProfiler(enabled=True, output_dir=str(tmp_path))
+    )
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/api/files/validate-filename",
+            json={"filename": "a.mkv"},
+            headers={"X-Debug-Profile": "1", "X-Request-ID": "abc123"},
+        )
+        plain = client.get("/api/server-key-status")
+
+    assert response.headers["X-Request-ID"] == "abc123"
+    assert response.headers["X-Profile-File"].endswith("abc123.folded")
+    assert (tmp_path / "abc123.folded").exists()
+    assert "X-Profile-File" not in plain.headers
+    assert plain.headers["X-Request-ID"]
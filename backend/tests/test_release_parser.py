@@ -0,0 +1,60 @@
+"""Tests for the release name parser against the fixture corpus."""
+
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.release_parser import parse, parse_many
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "release_names.json")
+
+with open(FIXTURES, encoding="utf-8") as f:
+    CORPUS = json.load(f)
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["name"] for case in CORPUS])
+def test_corpus(case):
+    """Test every fixture name parses to its expected fields."""
+    result = parse(case["name"])
+    for field, expected in case["expected"].items():
+        assert result[field] == expected, field
+    # Fields not listed in the fixture must be empty
+    for field, value in result.items():
+        if field not in case["expected"] and field != "name":
+            assert value in (None, [], "unknown"), field
+
+
+def test_parse_many_keeps_order():
+    """Test the batch API returns one result per name, in order."""
+    names = [case["name"] for case in CORPUS] * 3
+    results = parse_many(names)
+    assert [result["name"] for result in results] == names
+
+
+def test_unparseable_names():
+    """Test names without numbering or quality are not classified."""
+    assert parse("")["kind"] == "unknown"
+    assert parse("...")["title"] is None
+    result = parse("holiday video.mkv")
+    assert result["kind"] == "unknown"
+    assert result["title"] == "holiday video"
+
+
+def test_parse_endpoint():
+    """Test POST /api/parse/names parses a batch and rejects oversized ones."""
+    client = TestClient(app)
+    response = client.post(
+        "/api/parse/names",
+        json={"names": ["Show.Name.S01E02.1080p.mkv", "Movie (2010) [2160p].mkv"]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["kind"] for r in results] == ["episode", "movie"]
+    assert results[0]["episodes"] == [2]
+    assert results[1]["year"] == 2010
+
+    response = client.post("/api/parse/names", json={"names": ["x"] * 50_001})
+    assert response.status_code == 400
@@ -0,0 +1,252 @@
+"""Tests for the rename journal, crash recovery and undo/redo."""
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import rename_journal
+from app.services.batch_rename import BatchRenamer
+from app.services.rename_journal import INDEX_FILE, LOG_FILE, RenameJournal
+from app.services.rename_plan import compile_plan
+
+
+def _files(folder, count):
+    folder.mkdir(exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = folder / f"file{i}.mkv"
+        path.write_text(str(i))
+        paths.append(path)
+    return paths
+
+
+async def test_batch_is_journaled_with_one_fsync_per_write(tmp_path, monkeypatch):
+    """Test a 50-file batch costs two fsyncs (plan and outcome) and is indexed."""
+    journal = RenameJournal(str(tmp_path / "journal"))
+    paths = _files(tmp_path / "media", 50)
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(rename_journal.os, "fsync", lambda fd: fsyncs.append(fd) or real_fsync(fd))
+
+    items = [{"original_path": str(p), "new_name": f"Ep{i}.mkv"} for i, p in enumerate(paths)]
+    summary = await BatchRenamer(items, journal=journal).run()
+
+    assert len(fsyncs) == 2
+    (batch,) = journal.history()
+    assert batch["batch_id"] == summary["batch_id"]
+    assert batch["status"] == "committed" and batch["renamed"] == 50
+    assert batch["operations"][3] == {
+        "original_path": str(paths[3]), "new_path": str(tmp_path / "media" / "Ep3.mkv")
+    }
+    assert journal.history(directory=str(tmp_path / "elsewhere")) == []
+    journal.close()
+
+
+async def test_undo_and_redo(tmp_path):
+    """Test undo puts files back and redo re-applies, including a swap."""
+    journal = RenameJournal(str(tmp_path / "journal"))
+    a, b, c = _files(tmp_path / "media", 3)
+    items = [
+        {"original_path": str(a), "new_name": b.name},
+        {"original_path": str(b), "new_name": a.name},
+        {"original_path": str(c), "new_name": "Renamed.mkv"},
+    ]
+    first = await BatchRenamer(items, journal=journal).run()
+    assert a.read_text() == "1"
+
+    undo = await BatchRenamer(
+        journal.inverse_items(journal.undo_candidate()), mode="all_or_nothing",
+        journal=journal, kind="undo", reverts=first["batch_id"],
+    ).run()
+    assert undo["success"]
+    assert [p.read_text() for p in (a, b, c)] == ["0", "1", "2"]
+    assert journal.undo_candidate() is None
+    assert journal.redo_candidate() == undo["batch_id"]
+
+    redo = await BatchRenamer(
+        journal.inverse_items(undo["batch_id"]), mode="all_or_nothing",
+        journal=journal, kind="redo", reverts=undo["batch_id"],
+    ).run()
+    assert redo["success"]
+    assert (tmp_path / "media" / "Renamed.mkv").read_text() == "2"
+    assert [batch["status"] for batch in journal.history()] == ["committed", "redone", "undone"]
+    assert journal.undo_candidate() == redo["batch_id"]
+    journal.close()
+
+
+def _crash_mid_batch(tmp_path, mode):
+    """Journal a shift a→b→c→d (run from the free end) and apply only its first step."""
+    directory = str(tmp_path / "journal")
+    journal = RenameJournal(directory)
+    paths = _files(tmp_path / "media", 3)
+    items = [
+        {"original_path": str(paths[0]), "new_name": "file1.mkv"},
+        {"original_path": str(paths[1]), "new_name": "file2.mkv"},
+        {"original_path": str(paths[2]), "new_name": "file3.mkv"},
+    ]
+    plan = compile_plan(items)
+    batch_id = journal.begin(plan, mode)
+    (chain,) = plan.chains
+    os.rename(chain[0].source, chain[0].target)
+    journal.close()
+    return RenameJournal(directory), batch_id
+
+
+def test_crash_recovery_rolls_back_all_or_nothing(tmp_path):
+    """Test an interrupted all_or_nothing batch is reverted on the next start."""
+    journal, batch_id = _crash_mid_batch(tmp_path, "all_or_nothing")
+
+    (outcome,) = journal.recover()
+
+    assert outcome == {"batch_id": batch_id, "action": "rolled_back", "renamed": 0, "errors": []}
+    media = tmp_path / "media"
+    assert sorted(p.name for p in media.iterdir()) == ["file0.mkv", "file1.mkv", "file2.mkv"]
+    assert (media / "file2.mkv").read_text() == "2"
+    assert journal.history()[0]["status"] == "rolled_back"
+    assert journal.recover() == []
+
+
+def test_crash_recovery_finishes_best_effort(tmp_path):
+    """Test an interrupted best_effort batch is replayed to the end."""
+    journal, _ = _crash_mid_batch(tmp_path, "best_effort")
+
+    (outcome,) = journal.recover()
+
+    assert outcome["action"] == "completed" and outcome["renamed"] == 3
+    media = tmp_path / "media"
+    assert [(media / f"file{i}.mkv").read_text() for i in (1, 2, 3)] == ["0", "1", "2"]
+    assert journal.history()[0]["renamed"] == 3
+
+
+def _crash_mid_cycle(tmp_path, mode, applied, marked=None, unwound=False):
+    """Journal a three-file rotation and crash after its first ``applied`` steps.
+
+    Markers are written as BatchRenamer writes them: before the step that
+    removes the temporary file (``marked`` overrides whether that happened),
+    and, with ``unwound``, before rolling the whole cycle back again.
+    """
+    directory = str(tmp_path / "journal")
+    journal = RenameJournal(directory)
+    a, b, c = _files(tmp_path / "media", 3)
+    plan = compile_plan(
+        [
+            {"original_path": str(a), "new_name": b.name},
+            {"original_path": str(b), "new_name": c.name},
+            {"original_path": str(c), "new_name": a.name},
+        ]
+    )
+    batch_id = journal.begin(plan, mode)
+    (chain,) = plan.chains
+    assert not chain[0].final
+    last = len(chain) - 1
+    for step in chain[:applied]:
+        if step is chain[last]:
+            journal.mark_cycle(batch_id, step.source, len(chain))
+        os.rename(step.source, step.target)
+    if marked and applied == last:
+        journal.mark_cycle(batch_id, chain[last].source, len(chain))
+    if unwound:
+        for step in reversed(chain):
+            if not step.final:
+                journal.mark_cycle(batch_id, step.target, 0)
+            os.rename(step.target, step.source)
+    journal.close()
+    return RenameJournal(directory)
+
+
+def _contents(tmp_path):
+    return [(tmp_path / "media" / f"file{i}.mkv").read_text() for i in range(3)]
+
+
+CYCLE_CRASHES = [(applied, False, False) for applied in range(5)] + [
+    (3, True, False),  # marked as finishing, but the last rename never ran
+    (4, True, True),  # finished, then rolled back by the batch before the crash
+]
+
+
+@pytest.mark.parametrize("applied,marked,unwound", CYCLE_CRASHES)
+def test_crash_in_cycle_rolls_back_all_or_nothing(tmp_path, applied, marked, unwound):
+    """Test a rotation interrupted at any step is put back exactly as it was."""
+    journal = _crash_mid_cycle(tmp_path, "all_or_nothing", applied, marked, unwound)
+
+    (outcome,) = journal.recover()
+
+    assert outcome["action"] == "rolled_back" and outcome["errors"] == []
+    assert _contents(tmp_path) == ["0", "1", "2"]
+    assert sorted(p.name for p in (tmp_path / "media").iterdir()) == [
+        "file0.mkv", "file1.mkv", "file2.mkv"
+    ]
+    assert journal.history()[0]["status"] == "rolled_back"
+
+
+@pytest.mark.parametrize("applied,marked,unwound", CYCLE_CRASHES)
+def test_crash_in_cycle_finishes_best_effort(tmp_path, applied, marked, unwound):
+    """Test a rotation interrupted at any step is finished and can be undone."""
+    journal = _crash_mid_cycle(tmp_path, "best_effort", applied, marked, unwound)
+
+    (outcome,) = journal.recover()
+
+    assert outcome["action"] == "completed" and outcome["errors"] == []
+    assert outcome["renamed"] == 3
+    assert _contents(tmp_path) == ["2", "0", "1"]
+    (batch,) = journal.history()
+    assert batch["status"] == "committed" and len(batch["operations"]) == 3
+    assert journal.recover() == []
+
+
+async def test_index_is_rebuilt_from_the_log(tmp_path):
+    """Test a torn final record is dropped and a lost index is rebuilt."""
+    directory = tmp_path / "journal"
+    journal = RenameJournal(str(directory))
+    paths = _files(tmp_path / "media", 2)
+    await BatchRenamer(
+        [{"original_path": str(p), "new_name": f"x{i}.mkv"} for i, p in enumerate(paths)],
+        journal=journal,
+    ).run()
+    journal.close()
+    log_size = (directory / LOG_FILE).stat().st_size
+    with open(directory / LOG_FILE, "ab") as f:
+        f.write(b'{"type":"begin","bat')
+    for name in os.listdir(directory):
+        if name.startswith(INDEX_FILE):
+            os.remove(directory / name)
+
+    journal = RenameJournal(str(directory))
+
+    assert (directory / LOG_FILE).stat().st_size == log_size
+    assert journal.history()[0]["renamed"] == 2
+    journal.close()
+
+
+def test_undo_route_reverts_the_last_batch(tmp_path):
+    """Test the HTTP undo/redo endpoints and the history filter."""
+    paths = _files(tmp_path, 2)
+    body = {"items": [{"original_path": str(p), "new_name": f"New{i}.mkv"} for i, p in enumerate(paths)]}
+    with TestClient(app) as client:
+        batch = client.post("/api/files/rename-batch", json=body).json()
+        history = client.get("/api/files/history", params={"directory": str(tmp_path)}).json()
+        undo = client.post("/api/files/undo").json()
+        redo = client.post("/api/files/redo").json()
+
+    assert history["batches"][0]["batch_id"] == batch["batch_id"]
+    assert len(history["batches"][0]["operations"]) == 2
+    assert undo["success"] and undo["renamed"] == 2
+    assert redo["success"]
+    assert (tmp_path / "New1.mkv").read_text() == "1"
+
+
+def test_single_rename_route_is_journaled(tmp_path):
+    """Test POST /api/files/rename shows up in the history."""
+    (path,) = _files(tmp_path, 1)
+    with TestClient(app) as client:
+        renamed = client.post(
+            "/api/files/rename", json={"original_path": str(path), "new_name": "Single.mkv"}
+        ).json()
+        history = client.get("/api/files/history", params={"directory": str(tmp_path)}).json()
+
+    assert renamed["success"]
+    assert history["batches"][0]["operations"] == [
+        {"original_path": str(path), "new_path": str(tmp_path / "Single.mkv")}
+    ]
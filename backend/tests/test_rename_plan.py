@@ -0,0 +1,143 @@
+"""Tests for the rename plan compiler."""
+
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import rename_plan
+from app.services.rename_plan import compile_plan
+
+
+def _files(tmp_path, *names):
+    for name in names:
+        (tmp_path / name).write_text(name)
+    return [str(tmp_path / name) for name in names]
+
+
+def _item(path, new_name):
+    return {"original_path": path, "new_name": new_name}
+
+
+def test_chain_runs_from_the_free_end(tmp_path):
+    """Test a→b, b→c is ordered so b moves out before a moves in."""
+    a, b = _files(tmp_path, "a.mkv", "b.mkv")
+    plan = compile_plan([_item(a, "b.mkv"), _item(b, "c.mkv")])
+
+    assert plan.errors == []
+    assert [[step.index for step in chain] for chain in plan.chains] == [[1, 0]]
+
+
+def test_swap_is_broken_with_a_temporary_name(tmp_path):
+    """Test a→b, b→a parks one file under a temp name first."""
+    a, b = _files(tmp_path, "a.mkv", "b.mkv")
+    plan = compile_plan([_item(a, "b.mkv"), _item(b, "a.mkv")])
+
+    (chain,) = plan.chains
+    assert [(step.index, step.final) for step in chain] == [(0, False), (1, True), (0, True)]
+    assert chain[0].target == chain[2].source
+    assert os.path.basename(chain[0].target).startswith(".a.mkv.")
+    assert plan.diff()["cycles"] == 1
+    assert plan.ops[0].via_temp and not plan.ops[1].via_temp
+
+
+def test_conflicts_are_reported_per_item(tmp_path):
+    """Test duplicates, missing files and occupied names fail individually."""
+    a, b, c, d, _ = _files(tmp_path, "a.mkv", "b.mkv", "c.mkv", "d.mkv", "taken.mkv")
+    plan = compile_plan(
+        [
+            _item(a, "x.mkv"),
+            _item(b, "x.mkv"),
+            _item(c, "taken.mkv"),
+            _item(d, "c.mkv"),  # waits on c, which cannot move
+            _item(str(tmp_path / "gone.mkv"), "y.mkv"),
+            _item(a, "z.mkv"),
+        ]
+    )
+
+    assert [op.error for op in plan.ops] == [
+        None, "DUPLICATE_TARGET", "FILE_EXISTS", "TARGET_BLOCKED", "FILE_NOT_FOUND",
+        "DUPLICATE_SOURCE",
+    ]
+    assert len(plan.chains) == 1
+
+
+def test_case_variants_on_a_case_insensitive_volume(tmp_path, monkeypatch):
+    """Test a target matching an existing file except for case is refused there."""
+    show, other, lower = _files(tmp_path, "Show.mkv", "other.mkv", "lower.mkv")
+
+    def lexists(path):
+        # Behave like APFS or an SMB share: names match regardless of case
+        directory, name = os.path.split(path)
+        return any(entry.casefold() == name.casefold() for entry in os.listdir(directory))
+
+    monkeypatch.setattr(rename_plan.os.path, "lexists", lexists)
+    plan = compile_plan(
+        [
+            _item(other, "show.mkv"),
+            _item(lower, "LOWER.mkv"),  # its own entry: a case-only rename
+        ]
+    )
+
+    assert [op.error for op in plan.ops] == ["FILE_EXISTS", None]
+    assert "'Show.mkv' already exists" in plan.ops[0].message
+
+
+def test_case_variants_on_a_case_sensitive_volume(tmp_path):
+    """Test names differing by case stay distinct where the disk says so."""
+    _, other, a, b = _files(tmp_path, "Show.mkv", "other.mkv", "a.mkv", "b.mkv")
+    plan = compile_plan(
+        [_item(other, "show.mkv"), _item(a, "new.mkv"), _item(b, "NEW.mkv")]
+    )
+
+    # Two targets differing only by case are refused wherever the batch runs
+    assert [op.error for op in plan.ops] == [None, None, "DUPLICATE_TARGET"]
+
+
+def test_dry_run_diff_and_single_scan_per_directory(tmp_path, monkeypatch):
+    """Test thousands of files in two folders are planned with two listings."""
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(
+        rename_plan.os, "scandir", lambda path: scanned.append(path) or real_scandir(path)
+    )
+    items = []
+    for folder in ("one", "two"):
+        (tmp_path / folder).mkdir()
+        for i in range(2000):
+            path = tmp_path / folder / f"{i}.mkv"
+            path.touch()
+            # Rotate names within each folder: one big cycle per folder
+            items.append(_item(str(path), f"{(i + 1) % 2000}.mkv"))
+    items.append(_item(items[0]["original_path"], "0.mkv"))  # duplicate source
+
+    diff = compile_plan(items).diff()
+
+    assert len(scanned) == 2
+    assert diff["renames"] == 4000 and diff["errors"] == 1
+    assert diff["chains"] == diff["cycles"] == 2
+    assert diff["entries"][1]["new_path"] == str(tmp_path / "one" / "2.mkv")
+
+
+def test_verify_reports_files_not_where_expected(tmp_path):
+    """Test verify compares completed ops with a fresh listing."""
+    a, b = _files(tmp_path, "a.mkv", "b.mkv")
+    plan = compile_plan([_item(a, "c.mkv"), _item(b, "d.mkv")])
+    os.rename(a, tmp_path / "c.mkv")
+
+    assert plan.verify([0, 1]) == [1]
+
+
+def test_rename_plan_route_touches_nothing(tmp_path):
+    """Test the dry-run endpoint returns the diff without renaming."""
+    a, b = _files(tmp_path, "a.mkv", "b.mkv")
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/files/rename-plan",
+            json={"items": [_item(a, "b.mkv"), _item(b, "a.mkv")]},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["cycles"] == 1
+    assert [e["action"] for e in response.json()["entries"]] == ["rename", "rename"]
+    assert (tmp_path / "a.mkv").read_text() == "a.mkv"
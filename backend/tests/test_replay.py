@@ -0,0 +1,130 @@
+"""Tests for traffic capture and the replay harness."""
+
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import trace
+from app.services.tmdb import TMDBService
+from benchmarks.replay import Trace, create_upstream_app, drive
+
+
+class TestTraceCapture:
+    """Test recording requests and upstream responses."""
+
+    async def test_upstream_responses_are_recorded(self, tmp_path, fake_tmdb_service):
+        """Test TMDBService writes upstream events while capture is on."""
+        path = tmp_path / "trace.jsonl"
+        trace.start_recording(str(path))
+        try:
+            await fake_tmdb_service.get_genres("movie")
+        finally:
+            trace.stop_recording()
+
+        events = [json.loads(line) for line in path.read_text().splitlines()]
+        upstream = [e for e in events if e["kind"] == "upstream"]
+        assert len(upstream) == 1
+        assert upstream[0]["endpoint"] == "/genre/movie/list"
+        assert "api_key" not in upstream[0]["key"]
+
+    def test_incoming_requests_are_recorded(self, tmp_path):
+        """Test the capture middleware records API requests with timing."""
+        path = tmp_path / "trace.jsonl"
+        trace.start_recording(str(path))
+        try:
+            with TestClient(app) as client:
+                client.get("/api/server-key-status")
+                client.post("/api/files/validate-filename", json={"filename": "a.mkv"})
+        finally:
+            trace.stop_recording()
+
+        requests = [
+            e
+            for e in map(json.loads, path.read_text().splitlines())
+            if e["kind"] == "request"
+        ]
+        assert [r["path"] for r in requests] == [
+            "/api/server-key-status",
+            "/api/files/validate-filename",
+        ]
+        assert requests[1]["body"] == {"filename": "a.mkv"}
+        assert requests[0]["t"] <= requests[1]["t"]
+
+    def test_api_keys_are_not_recorded(self, tmp_path, monkeypatch):
+        """Test keys in query strings and bodies are redacted from the trace."""
+        async def accept(self):
+            return True
+
+        monkeypatch.setattr(TMDBService, "test_api_key", accept)
+        path = tmp_path / "trace.jsonl"
+        trace.start_recording(str(path))
+        try:
+            with TestClient(app) as client:
+                client.get("/api/validate-key", params={"api_key": "secret-tmdb-key"})
+                client.post(
+                    "/api/files/validate-filename",
+                    json={"filename": "a.mkv", "options": {"token": "secret-token"}},
+                )
+        finally:
+            trace.stop_recording()
+
+        text = path.read_text()
+        assert "secret-tmdb-key" not in text and "secret-token" not in text
+        requests = [e for e in map(json.loads, text.splitlines()) if e["kind"] == "request"]
+        assert requests[0]["query"] == "api_key=REDACTED"
+        assert requests[1]["body"] == {"filename": "a.mkv", "options": {"token": "REDACTED"}}
+        assert trace.redact_query("query=Heat&page=2") == "query=Heat&page=2"
+
+    def test_normalize_route(self):
+        """Test numeric path segments are grouped."""
+        assert trace.normalize_route("/api/person/31/filmography") == (
+            "/api/person/{id}/filmography"
+        )
+
+
+class TestReplay:
+    """Test serving a recorded upstream and driving a backend."""
+
+    async def test_recorded_upstream_reproduces_responses(
+        self, tmp_path, fake_tmdb_service
+    ):
+        """Test a service against the recorded upstream sees identical data."""
+        path = tmp_path / "trace.jsonl"
+        trace.start_recording(str(path))
+        try:
+            expected = await fake_tmdb_service.get_details(7, "movie")
+        finally:
+            trace.stop_recording()
+
+        upstream = create_upstream_app(Trace.load(str(path)))
+        replayed = TMDBService(
+            api_key="other-key",
+            base_url="http://recorded/3",
+            transport=httpx.ASGITransport(app=upstream),
+        )
+
+        assert await replayed.get_details(7, "movie") == expected
+        assert upstream.state.misses == 0
+
+    async def test_drive_summarizes_per_route(self):
+        """Test the driver reports per-route latency and status mismatches."""
+        recorded = Trace(
+            requests=[
+                {"t": 0.0, "method": "GET", "path": "/api/server-key-status",
+                 "query": "", "status": 200},
+                {"t": 0.01, "method": "POST", "path": "/api/files/validate-filename",
+                 "query": "", "body": {"filename": "a.mkv"}, "status": 200},
+            ]
+        )
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://backend"
+        ) as client:
+            summary = await drive(client, recorded, speed=0, concurrency=4)
+
+        assert summary["requests"] == 2
+        assert summary["routes"]["GET /api/server-key-status"]["count"] == 1
+        route = summary["routes"]["POST /api/files/validate-filename"]
+        assert route["status_mismatches"] == 0
+        assert "p95_ms" in route
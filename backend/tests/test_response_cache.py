@@ -0,0 +1,111 @@
+"""Tests for the encoded response cache."""
+
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.response_cache import (
+    ResponseCache,
+    collect_dependencies,
+    encode_json,
+    record_dependency,
+)
+
+
+class TestResponseCache:
+    """Test storage, expiry and dependency invalidation."""
+
+    def test_hit_returns_stored_bytes(self):
+        """Test the stored body is returned unchanged."""
+        cache = ResponseCache(max_size=10)
+        key = cache.make_key("/details", {"id": 1}, "key")
+        cache.set(key, b'{"a":1}')
+
+        assert cache.get(key).body == b'{"a":1}'
+        assert cache.get_stats()["hits"] == 1
+
+    def test_keys_differ_per_api_key(self):
+        """Test responses fetched with one API key are not served to another."""
+        assert ResponseCache.make_key("/details", {"id": 1}, "a") != (
+            ResponseCache.make_key("/details", {"id": 1}, "b")
+        )
+
+    def test_upstream_invalidation_drops_dependents(self):
+        """Test invalidating an upstream key removes responses built from it."""
+        cache = ResponseCache()
+        with collect_dependencies() as deps:
+            record_dependency("/tv/1:x", time.time() + 60)
+        cache.set("/seasons:a", b"[]", deps)
+        cache.set("/genres/tv:b", b"[]", {})
+
+        cache.invalidate_upstream("/tv/1:x")
+
+        assert cache.get("/seasons:a") is None
+        assert cache.get("/genres/tv:b") is not None
+        assert cache.get_stats()["invalidations"] == 1
+
+    def test_expiry_follows_earliest_dependency(self):
+        """Test an entry never outlives the upstream data it was built from."""
+        cache = ResponseCache(ttl_minutes=60)
+        entry = cache.set("/details:a", b"{}", {"/movie/1:x": time.time() - 1})
+
+        assert entry.expires_at < time.time()
+        assert cache.get("/details:a") is None
+
+    def test_encode_json_is_compact(self):
+        """Test encoded bodies round-trip and carry no padding whitespace."""
+        body = encode_json({"a": [1, 2], "b": None})
+        assert json.loads(body) == {"a": [1, 2], "b": None}
+        assert b" " not in body
+
+
+def test_route_serves_hits_and_refreshes_after_upstream_clear(fake_tmdb_service, monkeypatch):
+    """Test a second call is a cache hit until the upstream cache is cleared."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    headers = {"X-API-Key": "response-cache-test"}
+    with TestClient(app) as client:
+        first = client.get("/api/seasons?id=4321", headers=headers)
+        second = client.get("/api/seasons?id=4321", headers=headers)
+        fake_tmdb_service.cache.clear()
+        third = client.get("/api/seasons?id=4321", headers=headers)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert third.headers["X-Cache"] == "MISS"
+    assert first.content == second.content == third.content
+
+
+def test_etag_revalidation_returns_304(fake_tmdb_service, monkeypatch):
+    """Test If-None-Match with the current ETag gets a bodyless 304."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    headers = {"X-API-Key": "etag-test"}
+    with TestClient(app) as client:
+        first = client.get("/api/genres/movie", headers=headers)
+        etag = first.headers["ETag"]
+        revalidated = client.get(
+            "/api/genres/movie", headers={**headers, "If-None-Match": f"W/{etag}, \"other\""}
+        )
+        stale = client.get("/api/genres/movie", headers={**headers, "If-None-Match": '"other"'})
+
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"].startswith("private, max-age=")
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+    assert "X-Request-ID" in revalidated.headers
+    assert stale.status_code == 200
+    assert stale.content == first.content
+
+
+def test_cache_control_varies_by_route():
+    """Test route lifetimes and the cap at the server copy's expiry."""
+    genres = routes._validator_headers("/genres/tv", '"a"', None)
+    search = routes._validator_headers("/search", '"a"', None)
+    expiring = routes._validator_headers("/details", '"a"', time.time() + 30)
+
+    assert genres["Cache-Control"] == "private, max-age=86400"
+    assert search["Cache-Control"] == "private, max-age=300"
+    assert int(expiring["Cache-Control"].rsplit("=", 1)[1]) <= 30
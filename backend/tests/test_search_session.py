@@ -0,0 +1,118 @@
+"""Tests for the search index and search-as-you-type sessions."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.search_index import SearchIndex
+from app.services.search_session import SearchSession
+from app.services.tmdb import TMDBService
+from benchmarks.fake_tmdb import FakeTMDBConfig, create_app
+
+
+class TestSearchIndex:
+    """Test word-prefix matching and eviction."""
+
+    def test_every_word_must_prefix_a_title_word(self):
+        """Test partial words match and unrelated titles do not."""
+        index = SearchIndex()
+        index.add(
+            [
+                {"id": 1, "media_type": "movie", "title": "The Dark Knight"},
+                {"id": 2, "media_type": "movie", "title": "Dark City"},
+                {"id": 3, "media_type": "person", "name": "Kristen Knight"},
+            ]
+        )
+
+        assert [r["id"] for r in index.search("dark kni")] == [1]
+        assert {r["id"] for r in index.search("knig")} == {1, 3}
+        assert index.search("   ") == []
+
+    def test_eviction_drops_oldest_entries(self):
+        """Test the index stays bounded and forgets evicted words."""
+        index = SearchIndex(max_entries=2)
+        index.add({"id": i, "media_type": "movie", "title": f"Title{i}"} for i in range(3))
+
+        assert len(index) == 2
+        assert index.search("title0") == []
+        assert index.search("title2")[0]["id"] == 2
+
+
+@pytest.fixture
+def slow_service():
+    """Service whose upstream takes long enough to be superseded."""
+    fake = create_app(
+        FakeTMDBConfig(seed=7, num_movies=50_000, num_shows=5_000, num_people=20_000,
+                       latency="fixed", latency_ms=300)
+    )
+    service = TMDBService(
+        api_key="test-key",
+        base_url="http://fake-tmdb/3",
+        transport=httpx.ASGITransport(app=fake),
+        search_index=SearchIndex(),
+    )
+    return service
+
+
+async def test_cancelled_caller_cancels_upstream_fetch(slow_service):
+    """Test the fetch is cancelled once its only waiter goes away."""
+    caller = asyncio.ensure_future(slow_service._make_request("/movie/5", {}))
+    await asyncio.sleep(0.05)
+    caller.cancel()
+    await asyncio.wait([caller])
+
+    assert slow_service.cancelled_requests == 1
+    assert slow_service._inflight == {}
+
+
+async def test_shared_fetch_survives_one_cancelled_waiter(slow_service):
+    """Test a coalesced fetch keeps running while another caller still waits."""
+    first = asyncio.ensure_future(slow_service._make_request("/movie/6", {}))
+    second = asyncio.ensure_future(slow_service._make_request("/movie/6", {}))
+    await asyncio.sleep(0.05)
+    first.cancel()
+
+    assert (await second)["id"] == 6
+    assert slow_service.cancelled_requests == 0
+
+
+async def test_new_query_supersedes_running_one(slow_service):
+    """Test a superseded search stops and only the latest query completes."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    session = SearchSession(slow_service, send)
+    await session.submit(1, "first query")
+    await asyncio.sleep(0.05)
+    await session.submit(2, "second query")
+    await session.wait()
+
+    assert session.superseded == 1
+    assert slow_service.cancelled_requests == 1
+    assert [m["type"] for m in sent if m["id"] == 1] == ["local"]
+    assert [m["type"] for m in sent if m["id"] == 2] == ["local", "results", "done"]
+
+
+def test_websocket_sends_local_hits_before_tmdb(fake_tmdb_service, fake_tmdb_app, monkeypatch):
+    """Test a repeated query is answered from the local index first."""
+    monkeypatch.setattr(routes, "get_tmdb_service", lambda api_key, x_api_key: fake_tmdb_service)
+    fake_tmdb_service.search_index = SearchIndex()
+    title = fake_tmdb_app.state.catalog.movie(42)["title"]
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/ws/search?api_key=ws-test") as ws:
+            ws.send_json({"id": 1, "query": title})
+            first = [ws.receive_json() for _ in range(3)]
+            ws.send_json({"id": 2, "query": title})
+            local = ws.receive_json()
+
+    assert [m["type"] for m in first] == ["local", "results", "done"]
+    assert first[0]["results"] == []
+    assert local["type"] == "local"
+    assert any(r["id"] == 42 for r in local["results"])
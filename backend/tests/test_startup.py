@@ -0,0 +1,35 @@
+"""Tests for the startup benchmark and lazy loading."""
+
+import json
+import subprocess
+import sys
+
+from benchmarks.startup import BACKEND_DIR, DEFERRED_MODULES, parse_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   app.core
+import time:      3000 |       3120 | app.main
+"""
+
+
+def test_parse_importtime():
+    """Test importtime rows are parsed and the header is skipped."""
+    rows = parse_importtime(SAMPLE)
+
+    assert rows == [
+        {"module": "app.core", "self_us": 120, "cumulative_us": 120},
+        {"module": "app.main", "self_us": 3000, "cumulative_us": 3120},
+    ]
+
+
+def test_app_import_defers_heavy_modules():
+    """Test importing app.main leaves the TMDB client and httpx unloaded."""
+    probe = (
+        "import sys, json, app.main; "
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
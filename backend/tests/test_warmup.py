@@ -0,0 +1,96 @@
+"""Tests for startup warm-up, cache snapshots and readiness."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.episodes import EpisodeMap
+from app.services.tmdb import TMDBCache, TMDBService
+from app.services.warmup import WarmupState, warm_up
+
+
+async def test_warm_up_preloads_configuration_and_genres(fake_tmdb_service, fake_tmdb_app):
+    """Test warm-up fills the cache so the first genre lookup is local."""
+    state = WarmupState()
+    await warm_up(state, lambda: fake_tmdb_service, "http://fake-tmdb/3", prewarm_connections=0)
+
+    assert state.ready
+    assert state.steps["preload"]["ok"]
+    requests_after_warmup = fake_tmdb_app.state.stats["requests"]
+    await fake_tmdb_service.get_genres("movie")
+    assert fake_tmdb_app.state.stats["requests"] == requests_after_warmup
+
+
+async def test_warm_up_reports_failures_and_still_becomes_ready():
+    """Test a failing upstream does not keep the app unready."""
+    state = WarmupState()
+    service = TMDBService(api_key="k", base_url="http://127.0.0.1:9/3")
+    await warm_up(state, lambda: service, "http://127.0.0.1:9/3", prewarm_connections=0, timeout=0.5)
+
+    assert state.ready
+    assert not state.steps.get("preload", {"ok": False})["ok"]
+
+
+def test_snapshot_round_trip_keeps_hottest_entries(tmp_path):
+    """Test the most-hit entries survive a restart with their age intact."""
+    path = str(tmp_path / "snapshot.json")
+    cache = TMDBCache()
+    for i in range(5):
+        cache.set(f"/movie/{i}:x", {"id": i})
+    for _ in range(3):
+        cache.get("/movie/4:x")
+    cache.get("/movie/2:x")
+
+    assert cache.save_snapshot(path, max_entries=2) == 2
+
+    restored = TMDBCache()
+    assert restored.load_snapshot(path) == 2
+    assert restored.get("/movie/4:x") == {"id": 4}
+    assert restored.get("/movie/2:x") == {"id": 2}
+    assert restored.expires_at("/movie/4:x") == cache.expires_at("/movie/4:x")
+    assert TMDBCache().load_snapshot(str(tmp_path / "missing.json")) == 0
+
+
+async def test_snapshot_skips_derived_objects(tmp_path, fake_tmdb_service):
+    """Test an episode map in the cache does not stop raw payloads being saved."""
+    path = tmp_path / "snapshot.json"
+    await fake_tmdb_service.get_episode_map(12)
+    cached = fake_tmdb_service.cache.entries()
+    raw = [key for key, data in cached if not isinstance(data, EpisodeMap)]
+    assert len(raw) < len(cached)
+
+    assert fake_tmdb_service.cache.save_snapshot(str(path)) == len(raw) > 0
+
+    restored = TMDBCache()
+    assert restored.load_snapshot(str(path)) == len(raw)
+    assert sorted(key for key, _ in restored.entries()) == sorted(raw)
+    assert not (tmp_path / "snapshot.json.tmp").exists()
+
+
+def test_failed_snapshot_leaves_no_temp_file(tmp_path):
+    """Test a write that fails part way removes its temporary file."""
+    cache = TMDBCache()
+    cache.set("/movie/1:x", {"id": 1})
+    target = tmp_path / "snapshot.json"
+    target.mkdir()  # os.replace cannot put a file over a directory
+
+    with pytest.raises(OSError):
+        cache.save_snapshot(str(target))
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_cache_keys_are_stable_across_processes():
+    """Test cache keys do not depend on Python's per-process hash seed."""
+    service = TMDBService(api_key="k")
+    assert service._get_cache_key("/search/multi", {"query": "x", "page": 2}) == (
+        service._get_cache_key("/search/multi", {"page": 2, "query": "x", "api_key": "k"})
+    )
+    assert service._get_cache_key("/movie/1", {}) == "/movie/1:d751713988987e93"
+
+
+def test_ready_endpoint():
+    """Test readiness reflects the warm-up state."""
+    with TestClient(app) as client:
+        assert client.get("/api/ready").status_code == 200
+        app.state.warmup.ready = False
+        assert client.get("/api/ready").status_code == 503
@@ -296,6 +296,247 @@ export const renameFile = async (originalPath: string, newName: string): Promise
   }
 };
 
+export interface BatchRenameItemResult {
+  index: number;
+  success: boolean;
+  message: string;
+  original_path?: string;
+  new_path?: string;
+  error?: string;
+}
+
+export interface BatchRenameResponse {
+  success: boolean;
+  mode: 'best_effort' | 'all_or_nothing';
+  total: number;
+  renamed: number;
+  failed: number;
+  rolled_back: boolean;
+  batch_id?: string;
+  results: BatchRenameItemResult[];
+}
+
+export const renameFilesBatch = async (
+  items: { originalPath: string; newName: string }[],
+  mode: 'best_effort' | 'all_or_nothing' = 'best_effort'
+): Promise<BatchRenameResponse> => {
+  try {
+    const response = await api.post('/files/rename-batch', {
+      items: items.map(item => ({ original_path: item.originalPath, new_name: item.newName })),
+      mode,
+    });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while renaming the files.');
+    }
+    throw error;
+  }
+};
+
+export interface RenameHistoryBatch {
+  batch_id: string;
+  created_at: number;
+  finished_at?: number;
+  kind: 'rename' | 'undo' | 'redo';
+  mode: string;
+  reverts?: string;
+  status: 'committed' | 'rolled_back' | 'undone' | 'redone';
+  renamed: number;
+  operations: { original_path: string; new_path: string }[];
+}
+
+export const getRenameHistory = async (
+  directory?: string,
+  before?: string
+): Promise<RenameHistoryBatch[]> => {
+  try {
+    const response = await api.get('/files/history', { params: { directory, before } });
+    return response.data.batches;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while loading rename history.');
+    }
+    throw error;
+  }
+};
+
+export const undoLastRename = async (): Promise<BatchRenameResponse> => {
+  try {
+    const response = await api.post('/files/undo');
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while undoing the last rename.');
+    }
+    throw error;
+  }
+};
+
+export const redoLastRename = async (): Promise<BatchRenameResponse> => {
+  try {
+    const response = await api.post('/files/redo');
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while redoing the rename.');
+    }
+    throw error;
+  }
+};
+
+export interface AutoMatchResult {
+  name: string;
+  path?: string;
+  status: 'matched' | 'unmatched' | 'episode_not_found' | 'error';
+  confidence: number;
+  media_type?: 'movie' | 'tv';
+  tmdb_id?: number;
+  title?: string;
+  year?: number;
+  season?: number;
+  episodes: { season: number; episode: number; title?: string; air_date?: string }[];
+  message?: string;
+}
+
+export interface AutoMatchResponse {
+  results: AutoMatchResult[];
+  files: number;
+  groups: number;
+  searches: number;
+  episode_maps: number;
+  matched: number;
+  unmatched: number;
+  episode_not_found: number;
+  errors: number;
+  duration_ms: number;
+}
+
+export const autoMatchFiles = async (
+  request: { names?: string[]; root?: string; min_confidence?: number }
+): Promise<AutoMatchResponse> => {
+  try {
+    const response = await api.post('/match', request);
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while matching files.');
+    }
+    throw error;
+  }
+};
+
+export interface OrganizeStageMetrics {
+  name: 'scan' | 'parse' | 'match' | 'render' | 'rename';
+  concurrency: number;
+  queue_depth: number;
+  queue_capacity: number;
+  received: number;
+  passed: number;
+  finished: number;
+  failed: number;
+  in_flight: number;
+  throughput_per_second: number;
+  busy_seconds: number;
+  blocked_seconds: number;
+}
+
+export interface OrganizeSummary {
+  root: string;
+  dry_run: boolean;
+  files: number;
+  counts: Record<string, number>;
+  groups: number;
+  searches: number;
+  episode_maps: number;
+  stages: OrganizeStageMetrics[];
+  duration_ms: number;
+}
+
+export const organizeFolder = async (
+  root: string,
+  dryRun: boolean = true
+): Promise<OrganizeSummary> => {
+  try {
+    const response = await api.post('/organize', { root, dry_run: dryRun });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while organizing the folder.');
+    }
+    throw error;
+  }
+};
+
+export type JobType = 'library_scan' | 'match' | 'organize';
+export type JobStatus = 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
+
+export interface Job {
+  id: string;
+  type: JobType;
+  params: Record<string, unknown>;
+  status: JobStatus;
+  progress: Record<string, unknown> | null;
+  result: Record<string, unknown> | null;
+  error: string | null;
+  attempts: number;
+  created_at: number;
+  started_at: number | null;
+  finished_at: number | null;
+}
+
+export const submitJob = async (
+  type: JobType,
+  params: Record<string, unknown>
+): Promise<Job> => {
+  try {
+    const response = await api.post('/jobs', { type, params });
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while starting the job.');
+    }
+    throw error;
+  }
+};
+
+export const getJob = async (jobId: string): Promise<Job> => {
+  try {
+    const response = await api.get(`/jobs/${jobId}`);
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while fetching the job.');
+    }
+    throw error;
+  }
+};
+
+export const cancelJob = async (jobId: string): Promise<Job> => {
+  try {
+    const response = await api.post(`/jobs/${jobId}/cancel`);
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error)) {
+      throw new Error(error.response?.data?.detail || 'An error occurred while cancelling the job.');
+    }
+    throw error;
+  }
+};
+
+// Follows a job over server-sent events; returns a function that stops listening
+export const watchJob = (jobId: string, onChange: (job: Job) => void): (() => void) => {
+  const source = new EventSource(`${API_BASE_URL}/jobs/${jobId}/events`);
+  const statuses: JobStatus[] = ['queued', 'running', 'completed', 'failed', 'cancelled'];
+  statuses.forEach((status) =>
+    source.addEventListener(status, (event) => {
+      onChange(JSON.parse((event as MessageEvent).data));
+      if (status !== 'queued' && status !== 'running') source.close();
+    })
+  );
+  return () => source.close();
+};
+
 export interface Genre {
   id: number;
   name: string;
@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { renameFile as apiRenameFile } from '../api';
+import { renameFilesBatch } from '../api';
 import { electronFileService } from '../services/electronFileService';
 
 export interface SelectedFileInfo {
@@ -84,32 +84,42 @@ export function useFileRename() {
     const results = { success: 0, failed: 0, errors: [] as string[] };
 
     try {
-      for (const file of selectedFiles) {
-        try {
-          // Check if we have a detected path to work with
-          if (!file.detectedPath) {
-            console.log(`No file path detected for "${file.originalName}" - skipping`);
+      const withPath = selectedFiles.filter(file => {
+        if (!file.detectedPath) {
+          console.log(`No file path detected for "${file.originalName}" - skipping`);
+          results.failed++;
+          results.errors.push(`${file.originalName}: No file path detected`);
+          return false;
+        }
+        return true;
+      });
+
+      if (!electronFileService.isAvailable()) {
+        // One batch call; the backend validates the plan and renames in parallel
+        console.log('Using HTTP batch API');
+        const batch = await renameFilesBatch(
+          withPath.map(file => ({ originalPath: file.detectedPath!, newName: file.fullSuggestedName }))
+        );
+        batch.results.forEach(result => {
+          if (result.success) {
+            results.success++;
+          } else {
             results.failed++;
-            results.errors.push(`${file.originalName}: No file path detected`);
-            continue;
+            results.errors.push(`${withPath[result.index].originalName}: ${result.message}`);
           }
+        });
+        setIsRenaming(false);
+        return results;
+      }
 
+      for (const file of withPath) {
+        try {
           console.log(`Renaming ${file.context === 'directory' ? 'folder' : 'file'}: ${file.detectedPath} -> ${file.fullSuggestedName}`);
 
-          // Try Electron API first, fall back to HTTP API
-          let result;
-          if (electronFileService.isAvailable()) {
-            console.log('Using Electron file service');
-            if (file.context === 'directory') {
-              result = await electronFileService.renamePath(file.detectedPath, file.fullSuggestedName);
-            } else {
-              result = await electronFileService.renameFile(file.detectedPath, file.fullSuggestedName);
-            }
-          } else {
-            console.log('Using HTTP API');
-            // HTTP API likely only supports files; attempt anyway
-            result = await apiRenameFile(file.detectedPath, file.fullSuggestedName);
-          }
+          console.log('Using Electron file service');
+          const result = file.context === 'directory'
+            ? await electronFileService.renamePath(file.detectedPath!, file.fullSuggestedName)
+            : await electronFileService.renameFile(file.detectedPath!, file.fullSuggestedName);
 
           if (result.success) {
             console.log('File renamed successfully:', result.message);